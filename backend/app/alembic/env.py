@@ -7,6 +7,11 @@ from sqlalchemy import pool
 from alembic import context
 
 from app.core.config import settings
+from app.api.common.models import Base
+# Imported for their side effect of registering the tables on Base.metadata
+import app.api.user.models  # noqa: F401
+import app.api.institution.models  # noqa: F401
+import app.api.course.models  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -25,7 +30,7 @@ if url := settings.SYNC_POSTGRES_URL:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
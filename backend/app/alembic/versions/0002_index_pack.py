@@ -0,0 +1,80 @@
+"""indexes for foreign keys and hot filters
+
+Revision ID: 0002_index_pack
+Revises: 0001_initial
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_index_pack'
+down_revision: Union[str, Sequence[str], None] = '0001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns). Foreign keys first, Postgres does not index the
+# referencing side by itself, then the composites the repositories filter
+# and page on. Leading columns already covered by a unique constraint are
+# left out.
+INDEXES = [
+    ('ix_faculty_school_id', 'faculty', ['school_id']),
+    ('ix_department_faculty_id', 'department', ['faculty_id']),
+    ('ix_session_school_id', 'session', ['school_id']),
+    ('ix_semester_session_id', 'semester', ['session_id']),
+    ('ix_course_department_id', 'course', ['department_id']),
+    ('ix_user_department_id', 'user', ['department_id']),
+    ('ix_student_profile_admission_session_id', 'student_profile',
+     ['admission_session_id']),
+    ('ix_course_offering_semester_id', 'course_offering', ['semester_id']),
+    ('ix_course_lecturer_lecturer_id', 'course_lecturer', ['lecturer_id']),
+    ('ix_class_session_course_offering_id', 'class_session',
+     ['course_offering_id']),
+    ('ix_class_session_lecturer_id', 'class_session', ['lecturer_id']),
+    ('ix_attendance_student_id', 'attendance', ['student_id']),
+    ('ix_message_student_message_id', 'message_student', ['message_id']),
+    ('ix_task_student_student_id', 'task_student', ['student_id']),
+    ('ix_user_created_at_id', 'user', ['created_at', 'id']),
+    ('ix_course_offering_session_id_semester_id', 'course_offering',
+     ['session_id', 'semester_id']),
+    ('ix_course_student_student_id_course_offering_id', 'course_student',
+     ['student_id', 'course_offering_id']),
+    ('ix_attendance_class_session_id_student_id', 'attendance',
+     ['class_session_id', 'student_id']),
+    ('ix_message_lecturer_id_created_at_id', 'message',
+     ['lecturer_id', 'created_at', 'id']),
+    ('ix_message_course_offering_id_created_at_id', 'message',
+     ['course_offering_id', 'created_at', 'id']),
+    ('ix_task_lecturer_id_created_at_id', 'task',
+     ['lecturer_id', 'created_at', 'id']),
+    ('ix_task_course_offering_id_created_at_id', 'task',
+     ['course_offering_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while the indexes build, it
+    # cannot run inside a transaction. IF NOT EXISTS lets a failed run be
+    # retried, drop any index left INVALID by it first.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True
+            )
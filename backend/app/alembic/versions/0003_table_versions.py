@@ -0,0 +1,79 @@
+"""per table change counters for ETags
+
+Revision ID: 0003_table_versions
+Revises: 0002_index_pack
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_table_versions'
+down_revision: Union[str, Sequence[str], None] = '0002_index_pack'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Catalog tables served with ETags, see app.api.common.etag
+TABLES = [
+    'school', 'faculty', 'department', 'session', 'semester', 'course',
+    'course_offering',
+]
+
+# Counter rows per table. A write locks its shard until it commits, so
+# writers on different connections rarely wait on each other; the version
+# of a table is the sum of its shards.
+SHARDS = 16
+
+BUMP_FUNCTION = f"""
+CREATE FUNCTION bump_table_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO table_version (table_name, shard, version)
+    VALUES (TG_TABLE_NAME, pg_backend_pid() % {SHARDS}, 1)
+    ON CONFLICT (table_name, shard)
+    DO UPDATE SET version = table_version.version + 1;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'table_version',
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column(
+            'shard', sa.SmallInteger(), server_default=sa.text('0'),
+            nullable=False
+        ),
+        sa.Column(
+            'version', sa.BigInteger(), server_default=sa.text('0'),
+            nullable=False
+        ),
+        sa.PrimaryKeyConstraint('table_name', 'shard')
+    )
+    op.execute(BUMP_FUNCTION)
+    # Once per statement, not per row, a bulk write bumps the version once
+    for table in TABLES:
+        op.execute(sa.text(
+            "INSERT INTO table_version (table_name) VALUES (:table)"
+        ).bindparams(table=table))
+        op.execute(
+            f'CREATE TRIGGER bump_table_version '
+            f'AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "{table}" '
+            f'FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.execute(f'DROP TRIGGER bump_table_version ON "{table}"')
+    op.execute('DROP FUNCTION bump_table_version()')
+    op.drop_table('table_version')
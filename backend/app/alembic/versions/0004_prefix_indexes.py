@@ -0,0 +1,52 @@
+"""pattern indexes for the prefix filter
+
+Revision ID: 0004_prefix_indexes
+Revises: 0003_table_versions
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_prefix_indexes'
+down_revision: Union[str, Sequence[str], None] = '0003_table_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, column). The text fields the list endpoints let clients
+# filter with `prefix`. Outside the C collation a plain btree index cannot
+# serve LIKE 'x%', a text_pattern_ops one can.
+INDEXES = [
+    ('ix_user_email_pattern', 'user', 'email'),
+    ('ix_user_last_name_pattern', 'user', 'last_name'),
+    ('ix_course_code_pattern', 'course', 'code'),
+    ('ix_course_name_pattern', 'course', 'name'),
+    ('ix_session_name_pattern', 'session', 'name'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built CONCURRENTLY like 0002_index_pack, see there
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name, table, [column],
+                postgresql_ops={column: 'text_pattern_ops'},
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True
+            )
@@ -0,0 +1,75 @@
+from hashlib import blake2b
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+
+from app.api.common.dependencies import DbCon
+from app.api.common.models import TableVersion
+from app.core.db_con import read_only
+
+
+# Suffixes CompressionMiddleware appends to the ETag of an encoded body
+ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip().removeprefix("W/").strip('"')
+    for suffix in ENCODING_SUFFIXES:
+        tag = tag.removesuffix(suffix)
+    return tag
+
+
+def matching_tag(if_none_match: str, etag: str) -> str | None:
+    """
+    The tag of If-None-Match that matches `etag` by weak comparison, as
+    RFC 9110 asks, e.g. the compressed variant the client holds.
+    """
+    if if_none_match.strip() == "*":
+        return etag
+    for tag in if_none_match.split(","):
+        if _opaque(tag) == _opaque(etag):
+            return tag.strip()
+    return None
+
+
+def conditional_get(*tables: str):
+    """
+    Route dependency answering `If-None-Match` with a 304 before the route
+    runs any query, e.g. `headers: Annotated[dict, conditional_get("course")]`.
+    The strong ETag comes from the change counters of `tables`, everything
+    the response is read from, and the request URL. The dependency resolves
+    to the ETag and Cache-Control headers, already set on routes returning
+    data; routes returning a Response of their own pass them on.
+    """
+    tables = tuple(sorted(tables))
+
+    async def check(request: Request, response: Response, con: DbCon):
+        async with read_only(con):
+            versions = (await con.execute(
+                select(TableVersion.table_name, func.sum(TableVersion.version))
+                .where(TableVersion.table_name.in_(tables))
+                .group_by(TableVersion.table_name)
+                .order_by(TableVersion.table_name)
+            )).all()
+        key = repr((
+            request.app.version, request.url.path,
+            sorted(request.query_params.multi_items()),
+            [tuple(row) for row in versions],
+        ))
+        headers = {
+            "ETag": f'"{blake2b(key.encode(), digest_size=12).hexdigest()}"',
+            # Cached copies are revalidated on every use
+            "Cache-Control": "no-cache",
+        }
+        held = matching_tag(
+            request.headers.get("if-none-match", ""), headers["ETag"]
+        )
+        if held is not None:
+            raise HTTPException(
+                status.HTTP_304_NOT_MODIFIED,
+                headers={**headers, "ETag": held}
+            )
+        response.headers.update(headers)
+        return headers
+
+    return Depends(check)
@@ -0,0 +1,52 @@
+from typing import Any, Iterator
+
+import orjson
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+# NOTE: POSTGRESS_SPECIFIC
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` wrapper that keeps the statement's bind params"""
+    inherit_cache = False
+
+    def __init__(self, statement: Select, analyze: bool = False):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    options = "ANALYZE, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) " + compiler.process(element.statement, **kw)
+
+
+async def explain(
+    con: AsyncSession, statement: Select, analyze: bool = False
+) -> dict[str, Any]:
+    """Return the top level plan node of `statement`"""
+    result = await con.execute(Explain(statement, analyze))
+    plan = result.scalar_one()
+    if isinstance(plan, (str, bytes)):
+        plan = orjson.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def estimate_count(con: AsyncSession, statement: Select) -> int:
+    """
+    Row count the planner expects `statement` to return, read from table
+    statistics instead of scanning. Only as fresh as the last ANALYZE.
+    """
+    plan = await explain(
+        con, statement.limit(None).offset(None).order_by(None)
+    )
+    return int(plan["Plan Rows"])
+
+
+def plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    """`plan` and every node below it, depth first"""
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
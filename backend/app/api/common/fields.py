@@ -0,0 +1,89 @@
+from functools import lru_cache
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import load_only
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from app.exceptions import InvalidField
+from .models import Base
+from .pagination import CursorPage
+
+
+def parse_fields(
+    fields: str | None, schema: type[BaseModel]
+) -> tuple[str, ...] | None:
+    """
+    Split a `?fields=id,title` query parameter into field names, checked
+    against the endpoint's response `schema`. None means every field.
+    """
+    if not fields:
+        return None
+    names = tuple(dict.fromkeys(
+        name.strip() for name in fields.split(",") if name.strip()
+    ))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise InvalidField(f"Unknown field(s): {', '.join(unknown)}")
+    return names or None
+
+
+@lru_cache(maxsize=None)
+def projection_plan(
+    model: type[Base], fields: tuple[str, ...]
+) -> tuple[LoaderOption, ...]:
+    """
+    load_only the requested columns of `model`. Anything left out raises
+    on access instead of emitting a SELECT per row.
+    """
+    columns = inspect(model).column_attrs
+    unknown = [name for name in fields if name not in columns]
+    if unknown:
+        raise InvalidField(f"Unknown field(s): {', '.join(unknown)}")
+    return (
+        load_only(
+            *[getattr(model, name) for name in fields], raiseload=True
+        ),
+    )
+
+
+@lru_cache(maxsize=None)
+def sparse_schema(
+    schema: type[BaseModel], fields: tuple[str, ...]
+) -> type[BaseModel]:
+    """`schema` narrowed down to `fields`, built once per combination"""
+    return create_model(
+        f"{schema.__name__}Sparse",
+        **{
+            name: (
+                schema.model_fields[name].annotation,
+                schema.model_fields[name]
+            )
+            for name in fields
+        }
+    )
+
+
+def sparse_page(
+    page: CursorPage, schema: type[BaseModel],
+    fields: tuple[str, ...] | None,
+    headers: dict[str, str] | None = None
+):
+    """
+    Serialize only `fields` of each item when a projection was requested.
+    The narrowed page no longer matches the route's response model, so it
+    is returned as a ready response instead, carrying `headers`.
+    """
+    if fields is None:
+        return page
+    sparse = sparse_schema(schema, fields)
+    return ORJSONResponse({
+        "items": [
+            sparse.model_validate(item, from_attributes=True)
+            .model_dump(mode="json")
+            for item in page.items
+        ],
+        "next_cursor": page.next_cursor,
+        "total_items": page.total_items,
+    }, headers=headers)
@@ -0,0 +1,194 @@
+from enum import Enum
+from functools import lru_cache
+from typing import Annotated, Any, Sequence
+
+from fastapi import Query
+from pydantic import BaseModel, ConfigDict, ValidationError
+from sqlalchemy import PrimaryKeyConstraint, UniqueConstraint, inspect
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.exceptions import InvalidFilter
+from .models import Base
+from .validation import type_adapter
+
+
+# Repeatable `?filter=field:op:value` query parameter, see `parse_filter`
+FilterParam = Annotated[
+    list[str] | None,
+    Query(description="field:op:value, op is one of eq, in, gt, gte, lt, "
+                      "lte, isnull or prefix")
+]
+
+
+class FilterOp(str, Enum):
+    EQ = "eq"
+    IN = "in"
+    GT = "gt"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
+    IS_NULL = "isnull"
+    PREFIX = "prefix"
+
+
+class Condition(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    field: str
+    op: FilterOp = FilterOp.EQ
+    value: Any = None
+
+
+class FilterSpec(BaseModel):
+    """
+    Typed filter and ordering for BaseRepo reads. `order_by` holds field
+    names, prefixed with "-" for descending.
+    """
+    model_config = ConfigDict(frozen=True)
+
+    conditions: tuple[Condition, ...] = ()
+    order_by: tuple[str, ...] = ()
+
+    def where(
+        self, model: type[Base], fields: frozenset[str]
+    ) -> list[ColumnElement]:
+        """
+        Compile the conditions into WHERE clauses. They are sorted and every
+        value goes through a bind parameter (IN as a single expanding one),
+        so the statement's cache key only depends on which filters are used,
+        never on their values.
+        """
+        conditions = sorted(
+            self.conditions, key=lambda cond: (cond.field, cond.op.value)
+        )
+        return [
+            _compile_condition(model, fields, cond) for cond in conditions
+        ]
+
+    def ordering(
+        self, model: type[Base], fields: frozenset[str]
+    ) -> list[tuple[Any, bool]]:
+        """(column, descending) pairs for `order_by`"""
+        ordering = []
+        for name in self.order_by:
+            descending = name.startswith("-")
+            column = _column(model, fields, name.lstrip("-"))
+            if inspect(model).columns[column.key].nullable:
+                raise InvalidFilter(
+                    f"Cannot order on nullable field {column.key!r}"
+                )
+            ordering.append((column, descending))
+        return ordering
+
+
+@lru_cache(maxsize=None)
+def indexed_fields(model: type[Base]) -> frozenset[str]:
+    """
+    Attributes of `model` that lead an index: the primary key, unique and
+    indexed columns, and foreign keys, which are expected to be indexed.
+    """
+    mapper = inspect(model)
+    table = model.__table__
+    columns = {
+        column for column in table.columns
+        if column.primary_key or column.index or column.unique
+        or column.foreign_keys
+    }
+    columns.update(
+        list(index.columns)[0] for index in table.indexes
+    )
+    columns.update(
+        list(constraint.columns)[0] for constraint in table.constraints
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+        and constraint.columns
+    )
+    return frozenset(
+        mapper.get_property_by_column(column).key for column in columns
+    )
+
+
+def parse_filter(
+    filters: Sequence[str] | None = None, order_by: str | None = None
+) -> FilterSpec | None:
+    """
+    Build a FilterSpec from query parameters. Each filter is
+    `field:op:value`, e.g. `status:in:pending,done`, `deadline:gte:2025-01-01`
+    or `end_date:isnull:true`, and `order_by` is a comma separated list like
+    `-created_at,title`.
+    """
+    if not filters and not order_by:
+        return None
+
+    conditions = []
+    for item in filters or ():
+        parts = item.split(":", 2)
+        if len(parts) != 3:
+            raise InvalidFilter(
+                f"Filter {item!r} is not of the form field:op:value"
+            )
+        field, op, value = parts
+        try:
+            op = FilterOp(op)
+        except ValueError:
+            raise InvalidFilter(f"Unknown filter operator {op!r}")
+        if op is FilterOp.IN:
+            value = tuple(value.split(","))
+        conditions.append(Condition(field=field, op=op, value=value))
+
+    ordering = tuple(
+        name.strip() for name in (order_by or "").split(",") if name.strip()
+    )
+    return FilterSpec(conditions=tuple(conditions), order_by=ordering)
+
+
+def _column(model: type[Base], fields: frozenset[str], name: str):
+    if name not in fields:
+        raise InvalidFilter(f"Cannot filter or order on field {name!r}")
+    return getattr(model, name)
+
+
+def _coerce(column, value: Any) -> Any:
+    try:
+        return type_adapter(column.type.python_type).validate_python(value)
+    except (ValidationError, NotImplementedError) as e:
+        raise InvalidFilter(
+            f"Invalid value {value!r} for field {column.key!r}"
+        ) from e
+
+
+def _compile_condition(
+    model: type[Base], fields: frozenset[str], cond: Condition
+) -> ColumnElement:
+    column = _column(model, fields, cond.field)
+    match cond.op:
+        case FilterOp.IS_NULL:
+            try:
+                is_null = type_adapter(bool).validate_python(cond.value)
+            except ValidationError as e:
+                raise InvalidFilter(
+                    f"isnull on {column.key!r} takes true or false"
+                ) from e
+            return column.is_(None) if is_null else column.is_not(None)
+        case FilterOp.IN:
+            values = cond.value
+            if isinstance(values, str):
+                values = values.split(",")
+            return column.in_([_coerce(column, value) for value in values])
+        case FilterOp.PREFIX:
+            if column.type.python_type is not str:
+                raise InvalidFilter(
+                    f"prefix only applies to text fields, not {column.key!r}"
+                )
+            return column.startswith(str(cond.value), autoescape=True)
+
+    value = _coerce(column, cond.value)
+    match cond.op:
+        case FilterOp.GT:
+            return column > value
+        case FilterOp.GTE:
+            return column >= value
+        case FilterOp.LT:
+            return column < value
+        case FilterOp.LTE:
+            return column <= value
+    return column == value
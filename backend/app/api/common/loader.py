@@ -0,0 +1,77 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Iterable, Sequence, TypeVar
+from uuid import UUID
+
+
+T = TypeVar("T")
+
+
+class BatchLoader(Generic[T]):
+    """
+    Merges the id lookups pending in the same event loop tick, e.g.
+    gathered or from `load_many`, into one query and remembers every
+    answer, misses included, so looking the same id up again costs
+    nothing. Lookups awaited one after another still cost a query each.
+    Meant to live as long as one request's session.
+    """
+    def __init__(
+        self, fetch: Callable[[list[UUID]], Awaitable[Sequence[T]]]
+    ):
+        self._fetch = fetch
+        self._cache: dict[UUID, asyncio.Future] = {}
+        self._queue: list[tuple[UUID, asyncio.Future]] = []
+        self._tasks: set[asyncio.Task] = set()
+        # An AsyncSession runs one statement at a time
+        self._lock = asyncio.Lock()
+
+    async def load(self, id: UUID) -> T | None:
+        future = self._cache.get(id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._cache[id] = future
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append((id, future))
+        # Shielded so one cancelled caller doesn't fail everyone waiting
+        # on the same id
+        return await asyncio.shield(future)
+
+    async def load_many(self, ids: Iterable[UUID]) -> list[T | None]:
+        return list(await asyncio.gather(*(self.load(id) for id in ids)))
+
+    def prime(self, id: UUID, obj: T | None):
+        """Remember `obj` for `id` without a query, e.g. after creating it"""
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(obj)
+        self._cache[id] = future
+
+    def clear(self, id: UUID | None = None):
+        """Forget `id`, or everything when no id is given"""
+        if id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(id, None)
+
+    def _dispatch(self):
+        batch, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[UUID, asyncio.Future]]):
+        try:
+            async with self._lock:
+                objs = await self._fetch([id for id, _ in batch])
+        except Exception as e:
+            for id, future in batch:
+                if self._cache.get(id) is future:
+                    del self._cache[id]
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        found = {obj.id: obj for obj in objs}
+        for id, future in batch:
+            if not future.done():
+                future.set_result(found.get(id))
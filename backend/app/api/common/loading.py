@@ -0,0 +1,58 @@
+from functools import lru_cache
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
+
+from .models import Base
+
+
+# Loader options carry no per-query state, so the plans below are built once
+# per process and shared by every query that asks for the same shape.
+
+
+@lru_cache(maxsize=None)
+def selectin_plan(
+    model: type[Base], depth: int, visited: frozenset = frozenset()
+) -> tuple[LoaderOption, ...]:
+    """
+    selectinload every relationship of `model` down to `depth` levels,
+    without walking back into a model already on the current path.
+    """
+    if depth <= 0 or model in visited:
+        return ()
+
+    visited = visited | {model}
+    options = []
+    for rel in inspect(model).relationships:
+        loader = selectinload(getattr(model, rel.key))
+        if depth > 1:
+            nested = selectin_plan(rel.mapper.class_, depth - 1, visited)
+            if nested:
+                loader = loader.options(*nested)
+        options.append(loader)
+
+    return tuple(options)
+
+
+@lru_cache(maxsize=None)
+def profile_plan(
+    model: type[Base], paths: tuple[str, ...]
+) -> tuple[LoaderOption, ...]:
+    """
+    selectinload exactly the dotted relationship `paths` of an eager-load
+    profile, e.g. ("faculties.departments",).
+    """
+    options = []
+    for path in paths:
+        current, loader = model, None
+        for key in path.split("."):
+            attr = getattr(current, key)
+            loader = (
+                selectinload(attr) if loader is None
+                else loader.selectinload(attr)
+            )
+            current = attr.property.mapper.class_
+        options.append(loader)
+
+    return tuple(options)
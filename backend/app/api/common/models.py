@@ -1,8 +1,19 @@
 import re
 from typing import Any
 
+from sqlalchemy import BigInteger, SmallInteger, String, text
 from sqlalchemy.ext.asyncio import AsyncAttrs
-from sqlalchemy.orm import DeclarativeBase, declared_attr
+from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
+
+from app.core.config import settings
+
+
+# Strategy for every relationship a query did not eager load explicitly
+# (through a depth or a load profile). With STRICT_LOADING, in dev and
+# tests, an accidental lazy load raises so N+1 patterns fail there; in
+# production it still runs as a plain lazy load rather than failing the
+# request. Objects already in the identity map are used either way.
+LAZY_STRATEGY = "raise_on_sql" if settings.STRICT_LOADING else "select"
 
 
 class ReprMixin:
@@ -29,3 +40,20 @@ class Base(AsyncAttrs, DeclarativeBase, ReprMixin):
         s1 = re.sub(r'(.)([A-Z][a-z]+)', r'\1_\2', cls.__name__)
         # Handle cases like "HTTPResponse" → "http_response"
         return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+
+
+class TableVersion(Base):
+    """
+    Change counter of a table, bumped by a statement level trigger on every
+    write to it (see migration 0003_table_versions). A cheap version marker
+    for ETags of data read far more often than it changes. The counter is
+    split over shards so concurrent writers do not queue on one row lock,
+    the version of a table is the sum of its shards.
+    """
+    table_name: Mapped[str] = mapped_column(String(63), primary_key=True)
+    shard: Mapped[int] = mapped_column(
+        SmallInteger, primary_key=True, default=0, server_default=text("0")
+    )
+    version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0")
+    )
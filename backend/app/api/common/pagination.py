@@ -0,0 +1,173 @@
+import base64
+from decimal import Decimal
+from typing import Any, Generic, Sequence, TypeVar
+
+import orjson
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Row, Select, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.exceptions import InvalidCursor
+from .explain import estimate_count
+from .validation import type_adapter
+
+
+T = TypeVar("T")
+
+PAGE_SIZE = 45
+MAX_PAGE_SIZE = 200
+
+
+class CursorPage(BaseModel, Generic[T]):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    items: list[T]
+    next_cursor: str | None = None
+    # Only filled when an estimated total is asked for
+    total_items: int | None = None
+
+
+class PaginatedResult(BaseModel, Generic[T]):
+    model_config = ConfigDict(arbitrary_types_allowed = True)
+
+    page_number: int
+    page_size: int
+    total_items: int
+    total_pages: int
+    items: list[T]
+    # True when total_items comes from planner statistics, not a count
+    estimated: bool = False
+
+    @classmethod
+    def build(
+        cls, items: Sequence[T], total: int,
+        skip: int | None, limit: int, estimated: bool = False
+    ) -> "PaginatedResult[T]":
+        return cls(
+            page_number=(skip or 0) // limit + 1,
+            page_size=limit,
+            total_items=total,
+            total_pages=-(-total // limit),
+            items=list(items),
+            estimated=estimated,
+        )
+
+
+def clamp_limit(limit: int | None) -> int:
+    """Default a missing limit and cap it at the server-side maximum"""
+    if limit is None or limit <= 0:
+        return PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def _encode_default(value: Any) -> Any:
+    # orjson has no Decimal support, kept exact as a string
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot put {type(value).__name__} in a cursor")
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Turn the ordering key of the last row into an opaque cursor"""
+    return base64.urlsafe_b64encode(
+        orjson.dumps(list(values), default=_encode_default)
+    ).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, columns: Sequence[ColumnElement]
+) -> list[Any]:
+    """
+    Decode a cursor made by `encode_cursor` back into values typed like the
+    ordering columns, so they bind the same way the columns do.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = orjson.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match the ordering key")
+        return [
+            _coerce(value, column) for value, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, NotImplementedError) as e:
+        # ValidationError is a ValueError
+        raise InvalidCursor() from e
+
+
+def _coerce(value: Any, column: ColumnElement) -> Any:
+    # Parses the JSON forms orjson wrote: ISO dates, datetimes and times,
+    # UUID and Decimal strings, enum values
+    if value is None:
+        return None
+    return type_adapter(column.type.python_type).validate_python(value)
+
+
+def keyset_paginate(
+    query: Select, columns: Sequence[ColumnElement],
+    cursor: str | None, limit: int, descending: bool = False
+) -> Select:
+    """
+    Order `query` on `columns` and seek past `cursor` instead of using OFFSET.
+    One extra row is fetched so `to_cursor_page` can tell if there is a next page.
+    """
+    if descending:
+        query = query.order_by(*[column.desc() for column in columns])
+    else:
+        query = query.order_by(*columns)
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        seek = tuple_(
+            *[literal(value, column.type) for value, column in zip(values, columns)]
+        )
+        query = query.where(key < seek if descending else key > seek)
+    return query.limit(limit + 1)
+
+
+def to_cursor_page(
+    items: Sequence[T], keys: Sequence[str], limit: int
+) -> CursorPage[T]:
+    """
+    Trim the look-ahead row fetched by `keyset_paginate` and build the cursor
+    from the ordering attributes (`keys`) of the last returned item.
+    """
+    items = list(items)
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor([getattr(items[-1], key) for key in keys])
+    return CursorPage(items=items, next_cursor=next_cursor)
+
+
+async def paginate_query(
+    con: AsyncSession, query: Select,
+    skip: int | None, limit: int,
+    estimate_total: bool = False
+) -> tuple[list[Row], int]:
+    """
+    Run one OFFSET page of `query` and return its rows with the total.
+
+    The exact total rides along on every row as a `count(*) OVER ()` column,
+    so the page and its total come back in a single round trip. The extra
+    column is appended last, after the query's own columns. With
+    `estimate_total` the planner's row estimate is used instead, which
+    avoids counting every matching row on very large tables.
+    """
+    if estimate_total:
+        total = await estimate_count(con, query)
+        result = await con.execute(query.offset(skip).limit(limit))
+        return result.all(), total
+
+    counted = query.add_columns(func.count().over().label("total_count"))
+    result = await con.execute(counted.offset(skip).limit(limit))
+    rows = result.all()
+    if rows:
+        return rows, rows[0].total_count
+    if not skip:
+        return rows, 0
+    # Paged past the end, the window had no row to ride on
+    total = await con.scalar(
+        select(func.count()).select_from(query.order_by(None).subquery())
+    )
+    return rows, total
@@ -0,0 +1,111 @@
+import orjson
+from sqlalchemy import (
+    DateTime, Enum, Select, Text, case, cast, func, literal_column, or_,
+    select
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from .pagination import encode_cursor
+
+
+# NOTE: POSTGRESS_SPECIFIC
+def json_rows(query: Select) -> Select:
+    """
+    Wrap `query` so Postgres returns all of its rows as one JSON array,
+    each row through row_to_json keyed by its column labels. The result is
+    a single text value, nothing is decoded on the way to the client.
+    """
+    rows = query.subquery("item")
+    # json_agg keeps the order of a sorted subquery
+    return select(
+        cast(
+            func.coalesce(
+                func.json_agg(func.row_to_json(rows.table_valued())),
+                literal_column("'[]'::json")
+            ),
+            Text
+        )
+    )
+
+
+def json_page(query: Select, key: str, limit: int) -> Select:
+    """
+    `json_rows` for a `keyset_paginate` query ascending on the single
+    column labelled `key`. Returns the first `limit` rows as a JSON array
+    and, when the look-ahead row is there, the key of the last one kept.
+    """
+    rows = query.cte("item")
+    last = (
+        select(rows.c[key]).order_by(rows.c[key])
+        .offset(limit - 1).limit(1).scalar_subquery()
+    )
+    items = func.json_agg(
+        aggregate_order_by(func.row_to_json(rows.table_valued()), rows.c[key])
+    ).filter(or_(last.is_(None), rows.c[key] <= last))
+    return select(
+        cast(func.coalesce(items, literal_column("'[]'::json")), Text),
+        case((func.count() > limit, last)),
+    ).select_from(rows)
+
+
+def json_value(column: ColumnElement) -> ColumnElement:
+    """
+    `column` as the response models write it to JSON, for the values that
+    go through Postgres JSON functions. Timestamps come out in UTC as
+    2025-01-01T08:30:00.123450Z, with the fraction only when there is one,
+    instead of Postgres' +00:00 offset and trimmed fraction. Enums come out
+    as their values, Postgres stores the member names. Anything else is
+    returned as it is.
+    """
+    column_type = column.type
+    if isinstance(column_type, DateTime):
+        if column_type.timezone:
+            column = func.timezone(literal_column("'UTC'"), column)
+        text = func.regexp_replace(
+            func.to_char(column, 'YYYY-MM-DD"T"HH24:MI:SS.US'),
+            r"\.0{6}$", ""
+        )
+        if not column_type.timezone:
+            return text
+        # || keeps a NULL timestamp NULL
+        return text.op("||")(literal_column("'Z'"))
+    enum_class = getattr(column_type, "enum_class", None)
+    if isinstance(column_type, Enum) and enum_class is not None:
+        renamed = {
+            member.name: member.value for member in enum_class
+            if member.name != member.value
+        }
+        if renamed:
+            return case(
+                renamed, value=cast(column, Text), else_=cast(column, Text)
+            )
+    return column
+
+
+async def fetch_json(con: AsyncSession, query: Select) -> str:
+    """
+    Rows of `query` as a JSON array. The statement goes through the session
+    like any other, prepared and cached by asyncpg, so it keeps its
+    routing, read-only and budget settings. Values whose Postgres JSON
+    differs from the response model's go through `json_value`; the
+    contract is checked in tests/test_pg_json.py.
+    """
+    return await con.scalar(json_rows(query))
+
+
+async def fetch_json_page(
+    con: AsyncSession, query: Select, key: str, limit: int
+) -> str:
+    """
+    A `CursorPage` of `query` as JSON, see `json_page`. The items come from
+    Postgres as they are, only the envelope is written here.
+    """
+    items, last = (await con.execute(json_page(query, key, limit))).one()
+    next_cursor = None if last is None else encode_cursor([last])
+    return (
+        f'{{"items":{items},'
+        f'"next_cursor":{orjson.dumps(next_cursor).decode()},'
+        f'"total_items":null}}'
+    )
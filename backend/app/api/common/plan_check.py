@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import orjson
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from .explain import plan_nodes
+
+
+# Tables smaller than this are cheaper to scan than to probe an index, a
+# sequential scan on them is not a finding
+LARGE_TABLE_ROWS = 10_000
+
+
+@dataclass(frozen=True)
+class SeqScan:
+    statement: str
+    relation: str
+    table_rows: int
+
+    def __str__(self) -> str:
+        return (
+            f"Seq Scan on {self.relation} (~{self.table_rows} rows) in:\n"
+            f"    {self.statement}"
+        )
+
+
+class QueryRecorder:
+    """
+    Records every SELECT run on `conn` while active, with the parameters it
+    was sent with, so the exact statements a repository method issues can
+    be EXPLAINed afterwards.
+    """
+    def __init__(self, conn: AsyncConnection):
+        self._conn = conn.sync_connection
+        self.statements: list[tuple[str, Any]] = []
+
+    def __enter__(self) -> "QueryRecorder":
+        event.listen(self._conn, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self._conn, "before_cursor_execute", self._record)
+
+    def _record(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if executemany:
+            return
+        if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            self.statements.append((statement, parameters))
+
+
+async def table_rows(conn: AsyncConnection) -> dict[str, int]:
+    """Planner row estimate of every table, as of the last ANALYZE"""
+    result = await conn.execute(text(
+        "SELECT relname, reltuples::bigint FROM pg_class "
+        "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+    ))
+    return dict(result.all())
+
+
+async def find_seq_scans(
+    conn: AsyncConnection,
+    statements: Sequence[tuple[str, Any]],
+    min_rows: int = LARGE_TABLE_ROWS
+) -> list[SeqScan]:
+    """
+    EXPLAIN each recorded statement and report the sequential scans of
+    tables holding at least `min_rows` rows. Only meaningful against a
+    dataset of production-like size, on a few rows the planner rightly
+    scans everything.
+    """
+    sizes = await table_rows(conn)
+    # One plan per distinct statement text is enough
+    unique: dict[str, Any] = {}
+    for statement, parameters in statements:
+        unique.setdefault(statement, parameters)
+
+    found = []
+    for statement, parameters in unique.items():
+        result = await conn.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + statement, parameters
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, (str, bytes)):
+            plan = orjson.loads(plan)
+        for node in plan_nodes(plan[0]["Plan"]):
+            if node["Node Type"] != "Seq Scan":
+                continue
+            relation = node["Relation Name"]
+            if sizes.get(relation, 0) >= min_rows:
+                found.append(SeqScan(statement, relation, sizes[relation]))
+    return found
+
+
+def assert_no_seq_scans(scans: Sequence[SeqScan]):
+    """Fail, e.g. a pytest test, listing every offending statement"""
+    if scans:
+        raise AssertionError(
+            f"{len(scans)} sequential scan(s) on large tables:\n"
+            + "\n".join(str(scan) for scan in scans)
+        )
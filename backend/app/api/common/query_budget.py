@@ -0,0 +1,77 @@
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.timing import repeated_statements
+
+
+Target = Engine | Connection | AsyncEngine | AsyncConnection
+
+
+class QueryCounter:
+    """
+    Counts the statements `target`, an engine or a connection, runs while
+    it is active. The listener is attached to `target` alone, so queries
+    of other engines and of concurrent tests are not counted. Works across
+    threads, e.g. around TestClient calls whose requests run in another
+    thread than the test.
+    """
+    def __init__(self, target: Target):
+        if isinstance(target, AsyncEngine):
+            target = target.sync_engine
+        elif isinstance(target, AsyncConnection):
+            target = target.sync_connection
+        self._target = target
+        self.statements: Counter[str] = Counter()
+
+    @property
+    def count(self) -> int:
+        return sum(self.statements.values())
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements[statement] += 1
+
+    def __enter__(self) -> "QueryCounter":
+        event.listen(self._target, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *_):
+        event.remove(self._target, "before_cursor_execute", self._record)
+
+
+@contextmanager
+def query_budget(
+    target: Target, max_queries: int, allow_repeated: bool = False
+) -> Iterator[QueryCounter]:
+    """
+    Fail, e.g. a pytest test, when the block runs more than `max_queries`
+    statements on `target` or, unless `allow_repeated`, repeats one like
+    an N+1:
+
+        with query_budget(engine, 3):
+            await client.get("/course/offerings", params={"session_id": ...})
+    """
+    with QueryCounter(target) as counter:
+        yield counter
+    problems = []
+    if counter.count > max_queries:
+        problems.append(f"{counter.count} queries, budget is {max_queries}")
+    if not allow_repeated:
+        problems.extend(
+            f"{count}x {statement}"
+            for statement, count in repeated_statements(
+                counter.statements
+            ).items()
+        )
+    if problems:
+        raise AssertionError(
+            "Query budget exceeded:\n" + "\n".join(problems)
+            + "\nStatements:\n" + "\n".join(
+                f"{count}x {statement}"
+                for statement, count in counter.statements.most_common()
+            )
+        )
@@ -1,96 +1,175 @@
-from typing import Generic, TypeVar
+from typing import AsyncIterator, Generic, Iterable, Sequence, TypeVar
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
-from sqlalchemy import func, inspect, select
+from pydantic import BaseModel
+from sqlalchemy import (
+    Select, UniqueConstraint, any_, bindparam, column, delete, insert, select,
+    tuple_, update, values
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 
+from app.exceptions import InvalidFilter
+from .explain import estimate_count
+from .fields import projection_plan
+from .filters import FilterSpec, indexed_fields
+from .loader import BatchLoader
+from .loading import profile_plan, selectin_plan
 from .models import Base
+from .pagination import (
+    PAGE_SIZE, CursorPage, PaginatedResult, clamp_limit, keyset_paginate,
+    paginate_query, to_cursor_page
+)
 
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
-PAGE_SIZE = 45
+# Rows per multi-row INSERT, asyncpg allows at most 32767 bind parameters
+BULK_CHUNK_SIZE = 1000
 
-
-class PaginatedResult(BaseModel, Generic[ModelType]):
-    model_config = ConfigDict(arbitrary_types_allowed = True)
-
-    page_number: int
-    page_size: int
-    total_items: int
-    total_pages: int
-    items: list[ModelType]
+# Rows fetched per round trip when reading through a server side cursor
+STREAM_BATCH_SIZE = 500
 
 
 class BaseRepo(
     Generic[ModelType, CreateSchemaType, UpdateSchemaType]
 ):
+    # Named eager-load profiles, each a tuple of dotted relationship paths
+    # to selectinload, e.g. {"detail": ("faculties.departments",)}
+    load_profiles: dict[str, tuple[str, ...]] = {}
+    # Fields without an index of their own that clients may still filter
+    # and order on, on top of the indexed ones
+    filter_fields: tuple[str, ...] = ()
+
     def __init__(self, model: type[ModelType]):
         self.model = model
 
+    def filterable_fields(self) -> frozenset[str]:
+        return indexed_fields(self.model) | frozenset(self.filter_fields)
 
-    def build_selectin_options(
-        self, depth: int, model=None, visited=None
-    ):
+    def apply_filter(
+        self, query: Select, filter: dict | None = None,
+        spec: FilterSpec | None = None
+    ) -> Select:
+        """Add the `column == value` pairs of `filter` and `spec` conditions"""
+        if filter:
+            filter_clauses = [key == value for key, value in filter.items()]
+            query = query.where(*filter_clauses)
+        if spec is not None and spec.conditions:
+            query = query.where(
+                *spec.where(self.model, self.filterable_fields())
+            )
+        return query
+
+    def order_clauses(self, spec: FilterSpec | None = None) -> list:
+        """`spec` ordering, with the cursor columns as the tie breaker"""
+        ordering = (
+            spec.ordering(self.model, self.filterable_fields()) if spec else []
+        )
+        keys = {column.key for column, _ in ordering}
+        return [
+            column.desc() if descending else column
+            for column, descending in ordering
+        ] + [
+            column for column in self.cursor_columns() if column.key not in keys
+        ]
+
+    def keyset_columns(
+        self, spec: FilterSpec | None = None
+    ) -> tuple[list, bool]:
         """
-        Build a list of selectin options for eager loading.
-        This is a recursive function that builds a list of selectin options
+        Ordering key of a cursor page and whether it runs descending. The
+        seek is a single row comparison, so every `order_by` field must go
+        the same way.
         """
-        if depth <= 0:
-            return []
-
-        model = model or self.model
-        visited = visited or set()
-
-        if model in visited:
-            return []
-
-        visited.add(model)
-        mapper = inspect(model)
-        options = []
-
-        for rel in mapper.relationships:
-            # Skip backrefs that point to already visited models in this path
-            # This is the key fix
-            target_model = rel.mapper.class_
-            # if target_model in visited and rel.direction.name == "MANYTOONE":
-            #     # It's a backref to a parent already in the load chain → skip eager load
-            #     # because the instance is already attached
-            #     continue
-
-            attr = getattr(model, rel.key)
-            loader = selectinload(attr)
+        ordering = (
+            spec.ordering(self.model, self.filterable_fields()) if spec else []
+        )
+        directions = {descending for _, descending in ordering}
+        if len(directions) > 1:
+            raise InvalidFilter(
+                "Cursor pages need every order_by field in the same direction"
+            )
+        keys = {column.key for column, _ in ordering}
+        columns = [column for column, _ in ordering] + [
+            column for column in self.cursor_columns() if column.key not in keys
+        ]
+        return columns, directions == {True}
 
-            if depth > 1:
-                nested_options = self.build_selectin_options(
-                    depth - 1,
-                    target_model,
-                    visited.copy()
-                )
-                for nested in nested_options:
-                    loader = loader.options(nested)
+    def cursor_columns(self) -> list:
+        """
+        Index-backed ordering key used for deterministic and keyset paging:
+        (created_at, id) when the model tracks creation time, else the id.
+        """
+        if hasattr(self.model, "created_at"):
+            return [self.model.created_at, self.model.id]
+        return [self.model.id]
 
-            options.append(loader)
+    def build_selectin_options(
+        self, depth: int, model=None, visited=None,
+        profile: str | None = None
+    ):
+        """
+        Build a list of selectin options for eager loading, either the
+        declared `profile` or every relationship down to `depth`. The plan
+        is computed once per (model, depth) or profile and cached for the
+        life of the process.
+        """
+        if model is None:
+            return list(self.loader_options(depth, profile))
+        return list(selectin_plan(model, depth, frozenset(visited or ())))
 
-        return options
+    def loader_options(
+        self, depth: int = 0, profile: str | None = None
+    ) -> tuple:
+        """
+        Eager-load options for a query: the named `profile` from
+        `load_profiles` when given, otherwise every relationship to `depth`.
+        """
+        if profile is None:
+            return selectin_plan(self.model, depth)
+        if profile not in self.load_profiles:
+            raise ValueError(
+                f"{type(self).__name__} has no load profile {profile!r}"
+            )
+        return profile_plan(self.model, tuple(self.load_profiles[profile]))
 
+    def projection_options(
+        self, fields: Sequence[str] | None = None,
+        keep: Sequence[str] = ()
+    ) -> tuple:
+        """
+        load_only options for a sparse fieldset. The id, the cursor columns
+        and any `keep` fields are always loaded so ordering and paging
+        still work.
+        """
+        if not fields:
+            return ()
+        keep = {
+            *fields, *keep, "id",
+            *(column.key for column in self.cursor_columns())
+        }
+        # Sorted so the same set of fields hits the same cached plan
+        return projection_plan(self.model, tuple(sorted(keep)))
 
     async def get_all(
         self, con: AsyncSession, filter: dict | None = None, depth: int = 0,
-        skip: int | None = None, limit: int | None = None
+        skip: int | None = None, limit: int | None = None,
+        profile: str | None = None, fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
     ) -> list[ModelType]:
-        options = self.build_selectin_options(depth)
+        options = (
+            *self.loader_options(depth, profile),
+            *self.projection_options(fields)
+        )
         query = select(self.model).options(*options)
+        query = self.apply_filter(query, filter, spec)
 
-        if filter:
-            filter_clauses = [key == value for key, value in filter.items()]
-            query = query.where(*filter_clauses)
-
+        if skip is not None or limit is not None or spec and spec.order_by:
+            query = query.order_by(*self.order_clauses(spec))
 
         if skip is not None:
             query = query.offset(skip)
@@ -101,35 +180,103 @@ class BaseRepo(
         result = await con.execute(query)
         return result.scalars().all()
 
-    async def get_all_paginated(
+    async def stream_all(
         self, con: AsyncSession, filter: dict | None = None, depth: int = 0,
-        skip: int | None = None, limit: int  = PAGE_SIZE
-    ) -> PaginatedResult:
-        options = self.build_selectin_options(depth)
-        query = select(self.model.id).options(*options).limit(None).offset(None)
+        profile: str | None = None, fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None, batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[ModelType]:
+        """
+        Async iterator variant of `get_all` over a server side cursor,
+        only `batch_size` rows are held in memory at a time. `con` must
+        stay open, inside its transaction, until iteration is done.
+        """
+        options = (
+            *self.loader_options(depth, profile),
+            *self.projection_options(fields)
+        )
+        query = (
+            select(self.model)
+            .options(*options)
+            .order_by(*self.order_clauses(spec))
+            .execution_options(yield_per=batch_size)
+        )
+        query = self.apply_filter(query, filter, spec)
 
-        if filter:
-            filter_clauses = [key == value for key, value in filter.items()]
-            query = query.where(*filter_clauses)
-        count_query = query.with_only_columns(func.count()).order_by(None)
-        total = await con.scalar(count_query)
-        items = await self.get_all(con, filter, depth)
+        result = await con.stream_scalars(query)
+        async for obj in result:
+            yield obj
+
+    async def get_page(
+        self, con: AsyncSession, filter: dict | None = None, depth: int = 0,
+        cursor: str | None = None, limit: int | None = None,
+        estimate_total: bool = False, profile: str | None = None,
+        fields: Sequence[str] | None = None, spec: FilterSpec | None = None
+    ) -> CursorPage[ModelType]:
+        """
+        Keyset paginated variant of `get_all`, every page costs the same
+        no matter how deep it is. Pass the returned `next_cursor` back as
+        `cursor` to fetch the following page. `estimate_total` adds the
+        planner's estimate of the matching rows as `total_items`.
+        `fields` limits the columns loaded, see `projection_options`.
+        """
+        limit = clamp_limit(limit)
+        columns, descending = self.keyset_columns(spec)
+        options = (
+            *self.loader_options(depth, profile),
+            *self.projection_options(
+                fields, [column.key for column in columns]
+            )
+        )
+        query = select(self.model).options(*options)
+        query = self.apply_filter(query, filter, spec)
+
+        total = await estimate_count(con, query) if estimate_total else None
+        query = keyset_paginate(query, columns, cursor, limit, descending)
+        result = await con.execute(query)
+        page = to_cursor_page(
+            result.scalars().all(), [column.key for column in columns], limit
+        )
+        page.total_items = total
+        return page
+
+    async def get_all_paginated(
+        self, con: AsyncSession, filter: dict | None = None, depth: int = 0,
+        skip: int | None = None, limit: int  = PAGE_SIZE,
+        estimate_total: bool = False, profile: str | None = None,
+        fields: Sequence[str] | None = None, spec: FilterSpec | None = None
+    ) -> PaginatedResult[ModelType]:
+        """
+        OFFSET page of `get_all` with its total in the same round trip.
+        `estimate_total` swaps the exact count for the planner's estimate,
+        meant for very large tables like attendance or message_student.
+        """
+        limit = clamp_limit(limit)
+        options = (
+            *self.loader_options(depth, profile),
+            *self.projection_options(fields)
+        )
+        query = (
+            select(self.model)
+            .options(*options)
+            .order_by(*self.order_clauses(spec))
+        )
+        query = self.apply_filter(query, filter, spec)
 
-        return PaginatedResult[ModelType](
-            page_number=(skip // limit + 1 if skip is not None else 1) if total is not None else 0,
-            page_size=limit if limit is not None else 0,
-            total_items=total if total is not None else 0,
-            items=items,
-            total_pages=total // limit + 1 if total is not None else 0,
+        rows, total = await paginate_query(
+            con, query, skip, limit, estimate_total
+        )
+        return PaginatedResult[ModelType].build(
+            [row[0] for row in rows], total, skip, limit, estimate_total
         )
 
 
     async def get_by_id(
         self, con: AsyncSession, id: UUID, skip: int | None = None,
-        limit: int | None = None, depth: int = 0
+        limit: int | None = None, depth: int = 0,
+        profile: str | None = None
     ) -> list[ModelType]:
-        options = self.build_selectin_options(depth)
-        query = select(self.model.id, self.model).where(self.model.id == id).options(*options)
+        options = self.loader_options(depth, profile)
+        query = select(self.model).where(self.model.id == id).options(*options)
 
         if skip is not None:
             query = query.offset(skip)
@@ -144,26 +291,71 @@ class BaseRepo(
         self, con: AsyncSession, id: UUID, depth: int = 0,
         skip: int | None = None, limit: int = PAGE_SIZE
     ) -> PaginatedResult[ModelType]:
-        options = self.build_selectin_options(depth)
-        query = select(self.model.id).where(self.model.id == id).options(*options).limit(None).offset(None)
-        count_query = query.with_only_columns(func.count()).order_by(None)
-        total = await con.scalar(count_query)
-        items = await self.get_by_id(con, id, depth)
+        return await self.get_all_paginated(
+            con, {self.model.id: id}, depth, skip, limit
+        )
 
-        return PaginatedResult[ModelType](
-            page_number=(skip // limit + 1 if skip is not None else 1) if total is not None else 0,
-            page_size=limit if limit is not None else 0,
-            total_items=total if total is not None else 0,
-            items=items,
-            total_pages=total // limit + 1 if total is not None else 0,
+    async def get_many_by_ids(
+        self, con: AsyncSession, ids: Sequence[UUID], depth: int = 0,
+        profile: str | None = None
+    ) -> list[ModelType]:
+        """
+        Every row whose id is in `ids`, in no particular order. The ids go
+        in as one array parameter to `= ANY(...)`, so the statement is the
+        same whatever the number of ids.
+        """
+        options = self.loader_options(depth, profile)
+        ids_param = bindparam(
+            "ids", list(ids), type_=ARRAY(self.model.__table__.c.id.type)
         )
+        query = (
+            select(self.model)
+            .where(self.model.id == any_(ids_param))
+            .options(*options)
+        )
+        result = await con.execute(query)
+        return result.scalars().all()
+
+    def loader(self, con: AsyncSession) -> BatchLoader[ModelType]:
+        """
+        The batching loader of this model for `con`. It is kept on the
+        session, so it lives exactly as long as the request does.
+        """
+        loaders = con.info.setdefault("loaders", {})
+        loader = loaders.get(self.model)
+        if loader is None:
+            loader = BatchLoader(lambda ids: self.get_many_by_ids(con, ids))
+            loaders[self.model] = loader
+        return loader
+
+    def _known_loader(self, con: AsyncSession) -> BatchLoader | None:
+        return con.info.get("loaders", {}).get(self.model)
+
+    async def load(self, con: AsyncSession, id: UUID) -> ModelType | None:
+        """
+        Cached `get_one_by_id`, see `loader`. Only lookups that are pending
+        together share a query: gather them, or use `load_many`, rather
+        than awaiting one after the other.
+        """
+        return await self.loader(con).load(id)
+
+    async def load_many(
+        self, con: AsyncSession, ids: Iterable[UUID]
+    ) -> list[ModelType | None]:
+        """`load` for every id in one query, in the order of `ids`"""
+        return await self.loader(con).load_many(ids)
 
     async def get_one_by_id(
-        self, con: AsyncSession, id: UUID, depth: int = 0
+        self, con: AsyncSession, id: UUID, depth: int = 0,
+        profile: str | None = None, fields: Sequence[str] | None = None
     ) -> ModelType | None:
-        # rels = inspect(self.model).relationships
+        if not depth and profile is None and not fields:
+            return await self.load(con, id)
 
-        options = self.build_selectin_options(depth)
+        options = (
+            *self.loader_options(depth, profile),
+            *self.projection_options(fields)
+        )
         query = (
             select(self.model)
             .where(
@@ -177,43 +369,186 @@ class BaseRepo(
         return result.scalar_one_or_none()
 
     async def create_one(self, con: AsyncSession, create_obj: CreateSchemaType) -> ModelType:
-        print(create_obj, type(self.model))
-        obj = self.model(**create_obj.model_dump())
-        con.add(obj)
-        await con.flush()
-        await con.refresh(obj)
-        return obj
+        objs = await self.create_multiple(con, [create_obj])
+        return objs[0]
 
     async def create_multiple(
         self, con: AsyncSession, mul_create_obj: list[CreateSchemaType]
     ) -> list[ModelType]:
-        objs = [self.model(**obj.model_dump()) for obj in mul_create_obj]
-        con.add_all(objs)
-        await con.flush()
-        for obj in objs:
-            await con.refresh(obj)
+        """
+        Insert every object with a multi-row INSERT ... RETURNING and build
+        the models from the returned rows, instead of a flush plus one
+        refresh SELECT per object. Inputs larger than BULK_CHUNK_SIZE are
+        sent in chunks to stay under the driver's bind parameter limit.
+        """
+        rows = [obj.model_dump() for obj in mul_create_obj]
+        query = insert(self.model).returning(
+            self.model, sort_by_parameter_order=True
+        )
+        objs = []
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            result = await con.scalars(
+                query, rows[start:start + BULK_CHUNK_SIZE]
+            )
+            objs.extend(result.all())
+
+        loader = self._known_loader(con)
+        if loader is not None:
+            for obj in objs:
+                loader.prime(obj.id, obj)
         return objs
 
+    def unique_columns(self) -> list[str]:
+        """
+        Columns of the model's declared unique constraint, the default
+        conflict target of `upsert_many`.
+        """
+        constraints = [
+            constraint for constraint in self.model.__table__.constraints
+            if isinstance(constraint, UniqueConstraint)
+        ]
+        if len(constraints) != 1:
+            raise ValueError(
+                f"{self.model.__name__} needs exactly one unique constraint "
+                "to upsert on, pass index_elements explicitly"
+            )
+        return [column.name for column in constraints[0].columns]
+
     async def update(self, con: AsyncSession, id: UUID, update_obj: UpdateSchemaType) -> ModelType | None:
-        # Fetch existing record
-        db_obj = await self.get_one_by_id(con, id)
-        if not db_obj:
-            return None
+        update_data = update_obj.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.get_one_by_id(con, id)
+
+        query = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**update_data)
+            .returning(self.model)
+        )
+        result = await con.scalars(query)
+        obj = result.one_or_none()
+
+        loader = self._known_loader(con)
+        if loader is not None:
+            loader.prime(id, obj)
+        return obj
+
+    async def update_many(
+        self, con: AsyncSession, update_objs: dict[UUID, UpdateSchemaType]
+    ) -> list[ModelType]:
+        """
+        Apply a different update to each id with one
+        UPDATE ... FROM (VALUES ...) RETURNING per set of changed fields.
+        """
+        groups: dict[tuple[str, ...], list[dict]] = {}
+        for id, update_obj in update_objs.items():
+            update_data = update_obj.model_dump(exclude_unset=True)
+            if update_data:
+                groups.setdefault(tuple(update_data), []).append(
+                    {"id": id, **update_data}
+                )
 
-        update_data = update_obj.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
+        table = self.model.__table__
+        objs = []
+        for fields, rows in groups.items():
+            keys = ("id", *fields)
+            for start in range(0, len(rows), BULK_CHUNK_SIZE):
+                data = values(
+                    *[column(key, table.c[key].type) for key in keys],
+                    name="data"
+                ).data([
+                    tuple(row[key] for key in keys)
+                    for row in rows[start:start + BULK_CHUNK_SIZE]
+                ])
+                query = (
+                    update(self.model)
+                    .where(self.model.id == data.c.id)
+                    .values({key: data.c[key] for key in fields})
+                    .returning(self.model)
+                    .execution_options(synchronize_session="fetch")
+                )
+                result = await con.scalars(query)
+                objs.extend(result.all())
 
-        con.add(db_obj)
-        await con.flush()
-        await con.refresh(db_obj)
-        return db_obj
+        loader = self._known_loader(con)
+        if loader is not None:
+            for obj in objs:
+                loader.prime(obj.id, obj)
+        return objs
+
+    async def upsert_many(
+        self, con: AsyncSession, create_objs: list[CreateSchemaType],
+        index_elements: list[str] | None = None
+    ) -> list[ModelType]:
+        """
+        INSERT ... ON CONFLICT DO UPDATE on `index_elements`, the model's
+        declared unique constraint by default. Rows hitting the conflict
+        get every other given field overwritten; when no other field is
+        given they are left as they are (DO NOTHING). Every row matching
+        an input is returned, inserted, updated or already there, not in
+        input order. Inputs repeating a conflict key are collapsed, the
+        last one wins.
+        """
+        index_elements = index_elements or self.unique_columns()
+        # DO UPDATE cannot touch the same row twice in one statement
+        rows = list({
+            tuple(row[key] for key in index_elements): row
+            for row in (obj.model_dump() for obj in create_objs)
+        }.values())
+        objs = []
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            chunk = rows[start:start + BULK_CHUNK_SIZE]
+            stmt = pg_insert(self.model).values(chunk)
+            update_fields = [
+                key for key in chunk[0]
+                if key not in index_elements and key != "id"
+            ]
+            if update_fields:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=index_elements,
+                    set_={key: stmt.excluded[key] for key in update_fields}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(
+                    index_elements=index_elements
+                )
+            result = await con.scalars(
+                stmt.returning(self.model),
+                execution_options={"populate_existing": True}
+            )
+            touched = result.all()
+            if not update_fields and len(touched) < len(chunk):
+                # DO NOTHING returns only the rows it inserted, read the
+                # ones that were already there
+                keys = tuple_(*(
+                    self.model.__table__.c[key] for key in index_elements
+                ))
+                result = await con.scalars(
+                    select(self.model).where(keys.in_([
+                        tuple(row[key] for key in index_elements)
+                        for row in chunk
+                    ])),
+                    execution_options={"populate_existing": True}
+                )
+                touched = result.all()
+            objs.extend(touched)
+
+        loader = self._known_loader(con)
+        if loader is not None:
+            for obj in objs:
+                loader.prime(obj.id, obj)
+        return objs
 
     async def delete(self, con: AsyncSession, id: UUID) -> bool:
-        obj = await self.get_one_by_id(con, id)
-        if not obj:
-            return False
+        query = (
+            delete(self.model)
+            .where(self.model.id == id)
+            .returning(self.model.id)
+        )
+        result = await con.execute(query)
+        deleted = result.scalar_one_or_none() is not None
 
-        await con.delete(obj)
-        await con.flush()
-        return True
+        loader = self._known_loader(con)
+        if loader is not None:
+            loader.clear(id)
+        return deleted
@@ -0,0 +1,52 @@
+from contextlib import aclosing
+from typing import Any, AsyncIterator
+
+import anyio
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.types import Send
+
+from .validation import dump_json
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class _ClosingStreamingResponse(StreamingResponse):
+    """
+    Closes its body iterator once sending stops, finished or not. On a
+    client disconnect Starlette leaves the iterator suspended until it is
+    garbage collected, with whatever it holds, such as a pooled database
+    connection, still checked out.
+    """
+    async def stream_response(self, send: Send) -> None:
+        try:
+            await super().stream_response(send)
+        finally:
+            # Shielded, a disconnect arrives as a cancellation of this task
+            with anyio.CancelScope(shield=True):
+                await self.body_iterator.aclose()
+
+
+async def _ndjson_lines(
+    items: AsyncIterator[Any], schema: type[BaseModel]
+) -> AsyncIterator[bytes]:
+    async with aclosing(items):
+        async for item in items:
+            yield dump_json(
+                schema.model_validate(item, from_attributes=True)
+            ) + b"\n"
+
+
+def ndjson_response(
+    items: AsyncIterator[Any], schema: type[BaseModel]
+) -> StreamingResponse:
+    """
+    Stream `items` as newline delimited JSON, one `schema` object per line,
+    encoding each row as it arrives instead of building the whole list.
+    `items` is closed as soon as the response ends, so a generator reading
+    from its own session gives the connection back right away.
+    """
+    return _ClosingStreamingResponse(
+        _ndjson_lines(items, schema), media_type=NDJSON_MEDIA_TYPE
+    )
@@ -1,13 +1,13 @@
 from uuid import UUID as _UUID, uuid4
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, String, Integer, ForeignKey, Enum, UniqueConstraint
+from sqlalchemy import Boolean, DateTime, String, Integer, ForeignKey, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.api.course.schema import AttendanceStatus, ClassSessionStatus, EventStatus, TaskStudentStatus, TaskType
 
-from ..common.models import Base
+from ..common.models import LAZY_STRATEGY, Base
 
 
 class Course(Base):
@@ -21,11 +21,24 @@ class Course(Base):
 
     department_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("department.id")
+        ForeignKey("department.id"),
+        index=True
     )
 
-    course_offerings: Mapped[list["CourseOffering"]] = relationship("CourseOffering", back_populates="course")
-    department: Mapped["Department"] = relationship("Department", back_populates="courses")
+    course_offerings: Mapped[list["CourseOffering"]] = relationship("CourseOffering", back_populates="course", lazy=LAZY_STRATEGY)
+    department: Mapped["Department"] = relationship("Department", back_populates="courses", lazy=LAZY_STRATEGY)
+
+    __table_args__ = (
+        # For the prefix filter, see User
+        Index(
+            "ix_course_code_pattern", "code",
+            postgresql_ops={"code": "text_pattern_ops"}
+        ),
+        Index(
+            "ix_course_name_pattern", "name",
+            postgresql_ops={"name": "text_pattern_ops"}
+        ),
+    )
 
 
 class CourseOffering(Base):
@@ -38,7 +51,8 @@ class CourseOffering(Base):
 
     semester_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("semester.id")
+        ForeignKey("semester.id"),
+        index=True
     )
     session_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -47,21 +61,23 @@ class CourseOffering(Base):
     is_active: Mapped[bool] = mapped_column(default=True)
     class_completed: Mapped[int] = mapped_column(Integer, default=0)
 
-    course: Mapped["Course"] = relationship("Course", back_populates="course_offering")
-
     course_lecturers: Mapped[list["CourseLecturer"]] = relationship(
-        "CourseLecturer", back_populates="course_offering"
+        "CourseLecturer", back_populates="course_offering", lazy=LAZY_STRATEGY
     )
 
     course_students: Mapped[list["CourseStudent"]] = relationship(
-        "CourseStudent", back_populates="course_offering"
+        "CourseStudent", back_populates="course_offering", lazy=LAZY_STRATEGY
     )
-    semester: Mapped["Semester"] = relationship("Semester", back_populates="course_offerings")
-    session: Mapped["Session"] = relationship("Session", back_populates="course_offerings")
-    course: Mapped["Course"] = relationship("Course", back_populates="course_offerings")
+    semester: Mapped["Semester"] = relationship("Semester", back_populates="course_offerings", lazy=LAZY_STRATEGY)
+    session: Mapped["Session"] = relationship("Session", back_populates="course_offerings", lazy=LAZY_STRATEGY)
+    course: Mapped["Course"] = relationship("Course", back_populates="course_offerings", lazy=LAZY_STRATEGY)
 
     __table_args__ = (
         UniqueConstraint("course_id", "semester_id", "session_id"),
+        Index(
+            "ix_course_offering_session_id_semester_id",
+            "session_id", "semester_id"
+        ),
     )
 
 
@@ -70,7 +86,8 @@ class CourseLecturer(Base):
 
     lecturer_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("lecturer_profile.id")
+        ForeignKey("lecturer_profile.id"),
+        index=True
     )
 
     course_offering_id: Mapped[UUID] = mapped_column(
@@ -87,10 +104,10 @@ class CourseLecturer(Base):
     )
 
     lecturer: Mapped["LecturerProfile"] = relationship(
-        "LecturerProfile", back_populates="course_lecturers", lazy="noload"
+        "LecturerProfile", back_populates="course_lecturers", lazy=LAZY_STRATEGY
     )
     course_offering: Mapped["CourseOffering"] = relationship(
-        "CourseOffering", back_populates="course_lecturers", lazy="noload"
+        "CourseOffering", back_populates="course_lecturers", lazy=LAZY_STRATEGY
     )
 
     __table_args__ = (
@@ -117,14 +134,20 @@ class CourseStudent(Base):
     )
 
     student: Mapped["StudentProfile"] = relationship(
-        "StudentProfile", back_populates="course_students", lazy="noload"
+        "StudentProfile", back_populates="course_students", lazy=LAZY_STRATEGY
     )
     course_offering: Mapped["CourseOffering"] = relationship(
-        "CourseOffering", back_populates="course_students", lazy="noload"
+        "CourseOffering", back_populates="course_students", lazy=LAZY_STRATEGY
     )
 
     __table_args__ = (
         UniqueConstraint("course_offering_id", "student_id"),
+        # The unique constraint serves lookups by offering, this one a
+        # student's courses
+        Index(
+            "ix_course_student_student_id_course_offering_id",
+            "student_id", "course_offering_id"
+        ),
     )
 
 
@@ -132,11 +155,13 @@ class ClassSession(Base):
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     course_offering_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("course_offering.id")
+        ForeignKey("course_offering.id"),
+        index=True
     )
     lecturer_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("lecturer_profile.id")
+        ForeignKey("lecturer_profile.id"),
+        index=True
     )
     status: Mapped[ClassSessionStatus] = mapped_column(
         Enum(ClassSessionStatus, name="class_session_status", create_type=True),
@@ -150,7 +175,7 @@ class ClassSession(Base):
     )
 
     attendance: Mapped[list["Attendance"]] = relationship(
-        "Attendance", back_populates="class_session", lazy="noload"
+        "Attendance", back_populates="class_session", lazy=LAZY_STRATEGY
     )
 
 
@@ -167,7 +192,8 @@ class Attendance(Base):
     )
     student_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("student_profile.id")
+        ForeignKey("student_profile.id"),
+        index=True
     )
     # If no row is found, then it is assumed that the student has not attended
     # So basically no row and PENDING means that the student has not attended
@@ -179,7 +205,14 @@ class Attendance(Base):
     )
 
     class_session: Mapped["ClassSession"] = relationship(
-        "ClassSession", back_populates="attendance", lazy="noload"
+        "ClassSession", back_populates="attendance", lazy=LAZY_STRATEGY
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_attendance_class_session_id_student_id",
+            "class_session_id", "student_id"
+        ),
     )
 
 
@@ -206,7 +239,19 @@ class Message(Base):
     )
 
     message_students: Mapped[list["MessageStudent"]] = relationship(
-        "MessageStudent", back_populates="message", lazy="noload"
+        "MessageStudent", back_populates="message", lazy=LAZY_STRATEGY
+    )
+
+    __table_args__ = (
+        # Feeds are filtered on one of these and paged on (created_at, id)
+        Index(
+            "ix_message_lecturer_id_created_at_id",
+            "lecturer_id", "created_at", "id"
+        ),
+        Index(
+            "ix_message_course_offering_id_created_at_id",
+            "course_offering_id", "created_at", "id"
+        ),
     )
 
 
@@ -222,7 +267,8 @@ class MessageStudent(Base):
     )
     message_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("message.id")
+        ForeignKey("message.id"),
+        index=True
     )
     read: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -233,10 +279,10 @@ class MessageStudent(Base):
         onupdate=datetime.now(timezone.utc)
     )
     message: Mapped["Message"] = relationship(
-        "Message", back_populates="message_students", lazy="noload"
+        "Message", back_populates="message_students", lazy=LAZY_STRATEGY
     )
     student: Mapped["StudentProfile"] = relationship(
-        "StudentProfile", back_populates="message_students", lazy="noload"
+        "StudentProfile", back_populates="message_students", lazy=LAZY_STRATEGY
     )
 
     __table_args__ = (
@@ -278,7 +324,18 @@ class Task(Base):
     )
 
     task_students: Mapped[list["TaskStudent"]] = relationship(
-        "TaskStudent", back_populates="task"
+        "TaskStudent", back_populates="task", lazy=LAZY_STRATEGY
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_task_lecturer_id_created_at_id",
+            "lecturer_id", "created_at", "id"
+        ),
+        Index(
+            "ix_task_course_offering_id_created_at_id",
+            "course_offering_id", "created_at", "id"
+        ),
     )
 
 
@@ -293,7 +350,8 @@ class TaskStudent(Base):
     )
     student_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("student_profile.id")
+        ForeignKey("student_profile.id"),
+        index=True
     )
     status: Mapped[TaskStudentStatus] = mapped_column(
         Enum(
@@ -304,10 +362,10 @@ class TaskStudent(Base):
     grade: Mapped[int] = mapped_column(Integer, nullable=True)
 
     task: Mapped["Task"] = relationship(
-        "Task", back_populates="task_students", lazy="noload"
+        "Task", back_populates="task_students", lazy=LAZY_STRATEGY
     )
     student: Mapped["StudentProfile"] = relationship(
-        "StudentProfile", back_populates="task_students", lazy="noload"
+        "StudentProfile", back_populates="task_students", lazy=LAZY_STRATEGY
     )
 
     __table_args__ = (
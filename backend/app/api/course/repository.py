@@ -1,9 +1,15 @@
 from datetime import date
+from typing import Sequence
 from pydantic import UUID4
-from sqlalchemy import JSON, Boolean, String, alias, exists, func, select, case, and_, or_, cast, update
+from sqlalchemy import JSON, Boolean, Select, String, alias, exists, func, select, case, and_, or_, cast, update
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.common.explain import estimate_count
+from app.api.common.filters import FilterSpec
+from app.api.common.pg_json import fetch_json, fetch_json_page, json_value
+from app.api.common.pagination import CursorPage, clamp_limit, keyset_paginate, to_cursor_page
 from app.api.common.repo import BaseRepo
+from app.api.common.validation import validate_rows
 from app.api.course.models import Attendance, ClassSession, Course, CourseLecturer, CourseOffering, CourseStudent, Message, MessageStudent, Task, TaskStudent
 from app.api.course.schema import AttendanceCreate, AttendanceStatus, AttendanceUpdate, ClassSessionCreate, ClassSessionUpdate, CourseCreate, CourseLecturerCreate, CourseLecturerOut, CourseLecturerUpdate, CourseOfferingCreate, CourseOfferingOutLecturer, CourseOfferingOutMain, CourseOfferingOutStudent, CourseOfferingOutDetailed, CourseOfferingUpdate, CourseStudentCreate, CourseStudentUpdate, CourseUpdate, MessageCreate, MessageUpdate, StudentClassSessionStat, StudentMessageOut, TaskCreate, TaskOut, TaskStudentCreate, TaskStudentFlat, TaskStudentStatus, TaskStudentStatusExtended, TaskStudentUpdate, TaskUpdate
 from app.api.institution.models import Semester, Session
@@ -12,19 +18,21 @@ from app.exceptions import DataNotFound, DuplicateData
 
 
 class CourseRepo(BaseRepo[Course, CourseCreate, CourseUpdate]):
-    pass
+    filter_fields = ("code", "level", "name")
 
 
 class CourseOfferingRepo(
         BaseRepo[CourseOffering, CourseOfferingCreate, CourseOfferingUpdate]
 ):
+    load_profiles = {"detail": ("course_lecturers",)}
+
     async def get_current_sesion_course_offerings(
         self, conn: AsyncSession,
-        skip: int | None = None,
+        cursor: str | None = None,
         limit: int | None = None
-    ) -> list[CourseOfferingOutDetailed]:
+    ) -> CursorPage[CourseOfferingOutDetailed]:
         return await self.get_session_course_offerings(
-            conn, session_id=None, skip=skip, limit=limit
+            conn, session_id=None, cursor=cursor, limit=limit
         )
 
     async def get_session_course_offerings(
@@ -32,9 +40,10 @@ class CourseOfferingRepo(
         semester_id: UUID4 | None = None,
         session_id: UUID4 | None = None,
         is_active: bool | None = None,
-        skip: int | None = None,
+        cursor: str | None = None,
         limit: int | None = None
-    ) -> list[CourseOfferingOutDetailed]:
+    ) -> CursorPage[CourseOfferingOutDetailed]:
+        limit = clamp_limit(limit)
         query = (
             select(
                 CourseOffering.id.label("id"),
@@ -85,30 +94,28 @@ class CourseOfferingRepo(
             query = query.where(
                 CourseOffering.semester_id == semester_id
             )
-        if skip is not None:
-            query = query.offset(skip)
-        if limit is not None:
-            query = query.limit(limit)
+        query = keyset_paginate(query, [CourseOffering.id], cursor, limit)
         data = await conn.execute(query)
-        return [
-            CourseOfferingOutDetailed(**row) for row in data.mappings().all()
-        ]
+        return to_cursor_page(
+            validate_rows(CourseOfferingOutDetailed, data.mappings().all()),
+            ["id"], limit
+        )
 
-    async def get_courses(
-        self, conn: AsyncSession,
+    def _get_courses(
+        self,
         session_id: UUID4,
         semester_id: UUID4 | None = None,
         department_id: UUID4 | None = None,
-        skip: int | None = None,
+        cursor: str | None = None,
         limit: int | None = None
-    ) -> list[CourseOfferingOutMain]:
+    ) -> Select:
         course_lecturers_subquery = (
             select(
                 func.coalesce(
                     func.json_agg(
                         func.json_build_object(
                             'id', LecturerProfile.id,
-                            'rank', LecturerProfile.rank,
+                            'rank', json_value(LecturerProfile.rank),
                             'title', LecturerProfile.title,
                             'degree', LecturerProfile.degree,
                             'status', LecturerProfile.status,
@@ -159,15 +166,42 @@ class CourseOfferingRepo(
         if department_id:
             query = query.where(Course.department_id == department_id)
 
-        if skip is not None:
-            query = query.offset(skip)
-        if limit is not None:
-            query = query.limit(limit)
+        return keyset_paginate(
+            query, [CourseOffering.id], cursor, clamp_limit(limit)
+        )
 
+    async def get_courses(
+        self, conn: AsyncSession,
+        session_id: UUID4,
+        semester_id: UUID4 | None = None,
+        department_id: UUID4 | None = None,
+        cursor: str | None = None,
+        limit: int | None = None
+    ) -> CursorPage[CourseOfferingOutMain]:
+        query = self._get_courses(
+            session_id, semester_id, department_id, cursor, limit
+        )
         data = await conn.execute(query)
-        return [
-            CourseOfferingOutMain(**row) for row in data.mappings().all()
-        ]
+        return to_cursor_page(
+            validate_rows(CourseOfferingOutMain, data.mappings().all()),
+            ["course_offering_id"], clamp_limit(limit)
+        )
+
+    async def get_courses_json(
+        self, conn: AsyncSession,
+        session_id: UUID4,
+        semester_id: UUID4 | None = None,
+        department_id: UUID4 | None = None,
+        cursor: str | None = None,
+        limit: int | None = None
+    ) -> str:
+        """`get_courses` as a JSON page built by Postgres"""
+        query = self._get_courses(
+            session_id, semester_id, department_id, cursor, limit
+        )
+        return await fetch_json_page(
+            conn, query, "course_offering_id", clamp_limit(limit)
+        )
 
 
 class CourseStudentRepo(
@@ -179,10 +213,9 @@ class CourseStudentRepo(
     ) -> CourseStudent:
         return await self.create_one(conn, create_obj)
 
-    async def get_course_students_with_details(
-        self, conn: AsyncSession,
-        student_id: UUID4
-    ) -> list[CourseOfferingOutStudent]:
+    def _get_course_students_with_details(
+        self, student_id: UUID4
+    ) -> Select:
         uncompleted_tasks_subquery = (
             select(
                 func.coalesce(
@@ -191,11 +224,9 @@ class CourseStudentRepo(
                             'id', Task.id,
                             'title', Task.title,
                             'task_type', Task.task_type,
-                            'deadline', Task.deadline,
-                            'created_at', Task.created_at,
-                            'status', Task.status,
+                            'deadline', json_value(Task.deadline),
+                            'created_at', json_value(Task.created_at),
                             'details', Task.details,
-                            'updated_at', Task.updated_at,
                             "lecturer_id", Task.lecturer_id,
                             "course_offering_id", Task.course_offering_id,
                         )
@@ -228,7 +259,7 @@ class CourseStudentRepo(
                     func.json_agg(
                         func.json_build_object(
                             'id', LecturerProfile.id,
-                            'rank', LecturerProfile.rank,
+                            'rank', json_value(LecturerProfile.rank),
                             'title', LecturerProfile.title,
                             'degree', LecturerProfile.degree,
                             'status', LecturerProfile.status,
@@ -296,10 +327,23 @@ class CourseStudentRepo(
                 CourseStudent.student_id == student_id
             )
         )
+        return query
+
+    async def get_course_students_with_details(
+        self, conn: AsyncSession,
+        student_id: UUID4
+    ) -> list[CourseOfferingOutStudent]:
+        query = self._get_course_students_with_details(student_id)
         data = await conn.execute(query)
-        return [
-            CourseOfferingOutStudent(**row) for row in data.mappings().all()
-        ]
+        return validate_rows(CourseOfferingOutStudent, data.mappings().all())
+
+    async def get_course_students_json(
+        self, conn: AsyncSession,
+        student_id: UUID4
+    ) -> str:
+        """`get_course_students_with_details` as a JSON array built by Postgres"""
+        query = self._get_course_students_with_details(student_id)
+        return await fetch_json(conn, query)
 
     async def get_student_class_history(
         self, conn: AsyncSession,
@@ -350,7 +394,7 @@ class CourseStudentRepo(
         if limit is not None:
             query = query.limit(limit)
         data = await conn.execute(query)
-        return [StudentClassSessionStat(**row) for row in data.scalars().all()]
+        return validate_rows(StudentClassSessionStat, data.mappings().all())
 
 
 
@@ -381,17 +425,16 @@ class CourseLecturerRepo(
         )
         return await conn.scalar(query)
 
-    async def get_course_lecturers_with_details(
-        self, conn: AsyncSession,
-        lecturer_id: UUID4
-    ) -> list[CourseOfferingOutLecturer]:
+    def _get_course_lecturers_with_details(
+        self, lecturer_id: UUID4
+    ) -> Select:
         course_lecturers_subquery=(
             select(
                 func.coalesce(
                     func.json_agg(
                         func.json_build_object(
                             'id', LecturerProfile.id,
-                            'rank', LecturerProfile.rank,
+                            'rank', json_value(LecturerProfile.rank),
                             'title', LecturerProfile.title,
                             'degree', LecturerProfile.degree,
                             'status', LecturerProfile.status,
@@ -427,10 +470,9 @@ class CourseLecturerRepo(
                     Course.code.label("course_code"),
                     Semester.name.label("semester"),
                     Session.name.label("session"),
-                    Course.code.label("course_coode"),
                     Semester.id.label("semester_id"),
                     Session.id.label("session_id"),
-                    CourseLecturer.assigned_at.label("assigned_at"),
+                    json_value(CourseLecturer.assigned_at).label("assigned_at"),
                     CourseOffering.class_completed.label("total_class_session"),
                     course_lecturers_subquery.label("course_lecturers"),
 
@@ -456,27 +498,44 @@ class CourseLecturerRepo(
                     CourseLecturer.lecturer_id == lecturer_id
                 )
         )
+        return query
+
+    async def get_course_lecturers_with_details(
+        self, conn: AsyncSession,
+        lecturer_id: UUID4
+    ) -> list[CourseOfferingOutLecturer]:
+        query = self._get_course_lecturers_with_details(lecturer_id)
         data = await conn.execute(query)
-        return [
-            CourseOfferingOutLecturer(**row) for row in data.mappings().all()
-        ]
+        return validate_rows(CourseOfferingOutLecturer, data.mappings().all())
+
+    async def get_course_lecturers_json(
+        self, conn: AsyncSession,
+        lecturer_id: UUID4
+    ) -> str:
+        """`get_course_lecturers_with_details` as a JSON array built by Postgres"""
+        query = self._get_course_lecturers_with_details(lecturer_id)
+        return await fetch_json(conn, query)
 
 
 class MessageRepo(
     BaseRepo[Message, MessageCreate, MessageUpdate]
 ):
+    filter_fields = ("created_at",)
+
     async def get_teacher_messages(
         self, con: AsyncSession,
         teacher_id: UUID4,
         course_offering_id: UUID4 | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[Message]:
+        cursor: str | None = None, limit: int | None = None,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> CursorPage[Message]:
         filter = {self.model.lecturer_id: teacher_id}
         if course_offering_id is not None:
             filter[self.model.course_offering_id] = course_offering_id
-        return await self.get_all(
+        return await self.get_page(
             con, filter=filter,
-            skip=skip, limit=limit
+            cursor=cursor, limit=limit, fields=fields, spec=spec
         )
 
     async def get_student_messages(
@@ -484,8 +543,10 @@ class MessageRepo(
         student_id: UUID4,
         read: bool | None = None,
         course_offering_id: UUID4 | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[StudentMessageOut]:
+        cursor: str | None = None, limit: int | None = None,
+        estimate_total: bool = False
+    ) -> CursorPage[StudentMessageOut]:
+        limit = clamp_limit(limit)
         query = (
             select(
                 Message.id.label("id"),
@@ -530,15 +591,17 @@ class MessageRepo(
             query = query.where(
                 self.model.course_offering_id == course_offering_id
             )
-        if skip is not None:
-            query = query.offset(skip)
-
-        if limit is not None:
-            query = query.limit(limit)
+        total = await estimate_count(con, query) if estimate_total else None
+        query = keyset_paginate(
+            query, [Message.created_at, Message.id], cursor, limit
+        )
         data = await con.execute(query)
-        return [
-            StudentMessageOut(**row) for row in data.mappings().all()
-        ]
+        page = to_cursor_page(
+            validate_rows(StudentMessageOut, data.mappings().all()),
+            ["created_at", "id"], limit
+        )
+        page.total_items = total
+        return page
 
     async def student_mark_message(
         self, con: AsyncSession,
@@ -567,6 +630,8 @@ class MessageRepo(
 class TaskRepo(
     BaseRepo[Task, TaskCreate, TaskUpdate]
 ):
+    filter_fields = ("status", "task_type", "deadline", "created_at")
+
     async def grade_task(
         self, con: AsyncSession,
         task_id: UUID4,
@@ -642,14 +707,14 @@ class TaskRepo(
         self, con: AsyncSession,
         lecturer_id: UUID4,
         course_offering_id: UUID4 | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[TaskOut]:
+        cursor: str | None = None, limit: int | None = None
+    ) -> CursorPage[Task]:
         filter = {self.model.lecturer_id: lecturer_id}
         if course_offering_id is not None:
             filter[self.model.course_offering_id] = course_offering_id
-        return await self.get_all(
+        return await self.get_page(
             con, filter=filter,
-            skip=skip, limit=limit
+            cursor=cursor, limit=limit
         )
 
     async def get_student_tasks(
@@ -657,8 +722,9 @@ class TaskRepo(
         student_id: UUID4,
         course_offering_id: UUID4 | None = None,
         status: TaskStudentStatusExtended | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[TaskStudentFlat]:
+        cursor: str | None = None, limit: int | None = None
+    ) -> CursorPage[TaskStudentFlat]:
+        limit = clamp_limit(limit)
         query = (
             select(
                 Task.id.label("task_id"),
@@ -695,8 +761,6 @@ class TaskRepo(
             query = query.where(
                 self.model.course_offering_id == course_offering_id
             )
-        if skip is not None:
-            query = query.offset(skip)
 
         if status is not None:
             if status == TaskStudentStatusExtended.GRADED:
@@ -715,12 +779,14 @@ class TaskRepo(
                     TaskStudent.status == status
                 )
 
-        if limit is not None:
-            query = query.limit(limit)
+        query = keyset_paginate(
+            query, [Task.created_at, Task.id], cursor, limit
+        )
         data = await con.execute(query)
-        return [
-            TaskStudentFlat(**row) for row in data.mappings().all()
-        ]
+        return to_cursor_page(
+            validate_rows(TaskStudentFlat, data.mappings().all()),
+            ["created_at", "task_id"], limit
+        )
 
 
 
@@ -733,9 +799,9 @@ class TaskStudentRepo(
 class ClassSessionRepo(
     BaseRepo[ClassSession, ClassSessionCreate, ClassSessionUpdate]
 ):
-    pass
+    load_profiles = {"detail": ("attendance",)}
 
 class AttendanceRepo(
     BaseRepo[Attendance, AttendanceCreate, AttendanceUpdate]
 ):
-    pass
+    filter_fields = ("status", "marked_at")
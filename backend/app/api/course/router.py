@@ -1,10 +1,18 @@
 import logging
-
+from typing import Annotated
+
+from app.api.common.etag import conditional_get
+from app.api.common.fields import parse_fields, sparse_page, sparse_schema
+from app.api.common.filters import FilterParam, parse_filter
+from app.api.common.pagination import CursorPage
+from app.api.common.streaming import ndjson_response
+from app.api.common.validation import trusted_response
 from app.api.course.dependencies import CourseServiceDep
 from app.api.course.models import CourseStudent
 from app.api.course.schema import AttendanceCreate, AttendanceOut, ClassSessionCreate, ClassSessionDetailed, ClassSessionOut, CourseCreate, CourseLecturerCreate, CourseLecturerOut, CourseOfferingCreate, CourseOfferingCreateReq, CourseOfferingLecturerOut, CourseOfferingOut, CourseOfferingOutDetailed, CourseOfferingOutLecturer, CourseOfferingOutMain, CourseOfferingOutStudent, CourseOut, CourseStudentCreate, CourseStudentOut, EventStatus, MessageCreate, MessageOut, StudentMessageOut, TaskCreate, TaskOut, TaskStudentFlat, TaskStudentOut, TaskStudentStatus, TaskStudentStatusExtended
+from app.core.budget import budget
 from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import UUID4
 
 
@@ -27,12 +35,21 @@ async def create_course(
     return res
 
 
-@course_router.get("/")
+@course_router.get("/", dependencies=[budget(3000)])
 async def get_courses(
-    course_service: CourseServiceDep
-) -> list[CourseOut]:
-    courses = await course_service.get_courses()
-    return courses
+    course_service: CourseServiceDep,
+    cache_headers: Annotated[dict[str, str], conditional_get("course")],
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filter: FilterParam = None,
+    order_by: str | None = None,
+) -> CursorPage[CourseOut]:
+    field_names = parse_fields(fields, CourseOut)
+    courses = await course_service.get_courses(
+        cursor, limit, field_names, parse_filter(filter, order_by)
+    )
+    return sparse_page(courses, CourseOut, field_names, cache_headers)
 
 @course_router.post(
     "/offering",
@@ -47,19 +64,22 @@ async def create_course_offering_for_a_session(
     return res
 
 
-@course_router.get("/offerings")
+@course_router.get("/offerings", dependencies=[budget(3000)])
 async def get_available_course_for_a_session(
     course_service: CourseServiceDep,
+    cache_headers: Annotated[dict[str, str], conditional_get(
+        "course_offering", "course", "semester", "session"
+    )],
     session_id: UUID4,
     semester_id: UUID4 | None = None,
     is_active: bool | None = None,
     limit: int | None = None,
-    skip: int | None = None,
-) -> list[CourseOfferingOutDetailed]:
+    cursor: str | None = None,
+) -> CursorPage[CourseOfferingOutDetailed]:
     offerings = await course_service.get_sesion_course_offerings(
-        semester_id, session_id, is_active, skip=skip, limit=limit
+        semester_id, session_id, is_active, cursor=cursor, limit=limit
     )
-    return offerings
+    return trusted_response(offerings, headers=cache_headers)
 
 
 @course_router.get("/{course_id}")
@@ -80,10 +100,10 @@ async def get_course(
 async def get_available_course_for_the_current_semester(
     course_service: CourseServiceDep,
     limit: int | None = None,
-    skip: int | None = None,
-) -> list[CourseOfferingOutDetailed]:
+    cursor: str | None = None,
+) -> CursorPage[CourseOfferingOutDetailed]:
     offerings = await course_service.get_sesion_course_offerings(
-        skip=skip, limit=limit
+        cursor=cursor, limit=limit
     )
     return offerings
 
@@ -128,6 +148,7 @@ async def register_for_a_course(
 
 @course_router.get(
     "/student/tasks",
+    dependencies=[budget(3000)],
     tags=["Student"],
 )
 async def get_students_tasks(
@@ -135,11 +156,11 @@ async def get_students_tasks(
     student_id: UUID4,
     course_offering_id: UUID4 | None = None,
     status: TaskStudentStatusExtended | None = None,
-    skip: int | None = None, limit: int | None = None
-) -> list[TaskStudentFlat]:
-    return await course_service.get_student_tasks(
-        student_id, course_offering_id, status, skip, limit
-    )
+    cursor: str | None = None, limit: int | None = None
+) -> CursorPage[TaskStudentFlat]:
+    return trusted_response(await course_service.get_student_tasks(
+        student_id, course_offering_id, status, cursor, limit
+    ))
 
 
 
@@ -158,28 +179,40 @@ async def assign_course_to_lecturer(
 
 
 # get lecturer assigned courses
-@course_router.get("/lecturer/courses")
+# The JSON of these lists is built by Postgres and sent as is, the
+# response_model only documents it
+@course_router.get(
+    "/lecturer/courses",
+    dependencies=[budget(3000)],
+    response_model=list[CourseOfferingOutLecturer]
+)
 async def get_lecturer_assigned_courses(
     course_service: CourseServiceDep,
     lecturer_id: UUID4,
-) -> list[CourseOfferingOutLecturer]:
-    return await course_service.get_lecturer_courses(
-        lecturer_id
-    )
+) -> Response:
+    courses = await course_service.get_lecturer_courses_json(lecturer_id)
+    return Response(courses, media_type="application/json")
 
 
 @course_router.get(
     "/offering/tasks",
+    dependencies=[budget(3000)],
 )
 async def get_course_offering_tasks(
     course_service: CourseServiceDep,
     course_offering_id: UUID4,
     status: EventStatus | None = None,
-    skip: int | None = None, limit: int | None = None
-) -> list[TaskOut]:
-    return await course_service.get_course_offering_tasks(
-        course_offering_id, status, skip, limit
+    cursor: str | None = None, limit: int | None = None,
+    fields: str | None = None,
+    filter: FilterParam = None,
+    order_by: str | None = None,
+) -> CursorPage[TaskOut]:
+    field_names = parse_fields(fields, TaskOut)
+    tasks = await course_service.get_course_offering_tasks(
+        course_offering_id, status, cursor, limit, field_names,
+        parse_filter(filter, order_by)
     )
+    return sparse_page(tasks, TaskOut, field_names)
 
 
 @course_router.post(
@@ -214,34 +247,40 @@ async def grade_student_completed_task(
 
 @course_router.get(
     "/student/offerings",
+    dependencies=[budget(3000)],
+    response_model=list[CourseOfferingOutStudent],
     tags=["Student"]
 )
 async def get_student_registered_courses(
     course_service: CourseServiceDep,
     student_id: UUID4,
-) -> list[CourseOfferingOutStudent]:
-    return await course_service.get_student_courses(student_id)
+) -> Response:
+    courses = await course_service.get_student_courses_json(student_id)
+    return Response(courses, media_type="application/json")
 
 
 
 # get all department courses and their lecturer
 @course_router.get(
     "/offerings/department",
+    dependencies=[budget(3000)],
+    response_model=CursorPage[CourseOfferingOutMain],
     tags=["HOD"]
 )
 async def get_department_courses(
     course_service: CourseServiceDep,
     department_id: UUID4,
     session_id: UUID4 | None = None,
-    skip: int | None = None,
+    cursor: str | None = None,
     limit: int | None = None,
-) -> list[CourseOfferingOutMain]:
-    return await course_service.get_course_general(
+) -> Response:
+    courses = await course_service.get_course_general_json(
         session_id=session_id,
         department_id=department_id,
-        skip=skip,
+        cursor=cursor,
         limit=limit
     )
+    return Response(courses, media_type="application/json")
 
 
 # student complete task
@@ -275,17 +314,36 @@ async def mark_attendance(
 
 @course_router.get(
     "/class_sessions/attendance",
+    dependencies=[budget(3000)],
     tags=["Student", "Lecturer", "HOD"]
 )
 async def get_attendance(
     course_service: CourseServiceDep,
     class_session_id: UUID4,
-    skip: int | None = None,
+    cursor: str | None = None,
     limit: int | None = None,
-) -> list[AttendanceOut]:
-    return await course_service.get_attendance(
-        class_session_id, skip, limit
+    estimate_total: bool = False,
+    fields: str | None = None,
+    stream: bool = False,
+    filter: FilterParam = None,
+    order_by: str | None = None,
+) -> CursorPage[AttendanceOut]:
+    field_names = parse_fields(fields, AttendanceOut)
+    spec = parse_filter(filter, order_by)
+    if stream:
+        schema = AttendanceOut
+        if field_names is not None:
+            schema = sparse_schema(AttendanceOut, field_names)
+        return ndjson_response(
+            course_service.stream_attendance(
+                class_session_id, field_names, spec
+            ),
+            schema
+        )
+    attendance = await course_service.get_attendance(
+        class_session_id, cursor, limit, estimate_total, field_names, spec
     )
+    return sparse_page(attendance, AttendanceOut, field_names)
 
 @course_router.post(
     "/class_session",
@@ -316,11 +374,11 @@ async def get_class_sessions(
     course_service: CourseServiceDep,
     course_offering_id: UUID4,
     detailed: bool = False,
-    skip: int | None = None,
+    cursor: str | None = None,
     limit: int | None = None,
-) -> list[ClassSessionOut] | list[ClassSessionDetailed]:
+) -> CursorPage[ClassSessionOut] | CursorPage[ClassSessionDetailed]:
     return await course_service.get_class_sessions(
-        course_offering_id, detailed, skip, limit
+        course_offering_id, detailed, cursor, limit
     )
 
 
@@ -338,22 +396,30 @@ async def create_announcement(
 
 @course_router.get(
     "/lecturer/announcement",
+    dependencies=[budget(3000)],
     tags=["Lecturer"]
 )
 async def get_announcement(
     course_service: CourseServiceDep,
     lecturer_id: UUID4,
     course_offering_id: UUID4 | None = None,
-    skip: int | None = None,
+    cursor: str | None = None,
     limit: int | None = None,
-) -> list[MessageOut]:
-    return await course_service.get_lecturer_announcement(
-        lecturer_id, course_offering_id, skip, limit
+    fields: str | None = None,
+    filter: FilterParam = None,
+    order_by: str | None = None,
+) -> CursorPage[MessageOut]:
+    field_names = parse_fields(fields, MessageOut)
+    messages = await course_service.get_lecturer_announcement(
+        lecturer_id, course_offering_id, cursor, limit, field_names,
+        parse_filter(filter, order_by)
     )
+    return sparse_page(messages, MessageOut, field_names)
 
 
 @course_router.get(
     "/announcement/student",
+    dependencies=[budget(3000)],
     tags=["Student"]
 )
 async def get_announcement(
@@ -361,12 +427,13 @@ async def get_announcement(
     student_id: UUID4,
     read: bool | None = None,
     course_offering_id: UUID4 | None = None,
-    skip: int | None = None,
+    cursor: str | None = None,
     limit: int | None = None,
-) -> list[StudentMessageOut]:
-    return await course_service.get_announcement_student(
-        student_id, read, course_offering_id, skip, limit
-    )
+    estimate_total: bool = False,
+) -> CursorPage[StudentMessageOut]:
+    return trusted_response(await course_service.get_announcement_student(
+        student_id, read, course_offering_id, cursor, limit, estimate_total
+    ))
 
 @course_router.post(
     "/announcement/student/mark",
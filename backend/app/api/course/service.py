@@ -1,4 +1,5 @@
-from typing import Annotated
+from contextlib import aclosing
+from typing import Annotated, AsyncIterator, Sequence
 
 from pydantic import UUID4
 from app.api.user.dependencies import get_lecturer_profile_repo
@@ -18,11 +19,14 @@ from app.api.course.dependencies import (
     get_attendance_repo, get_class_session_repo, get_course_lecturer_repo, get_course_offering_repo, get_course_repo, get_course_student_repo, get_message_repo, get_task_repo
 )
 from app.api.common.dependencies import DbCon
-from app.api.course.models import Attendance, ClassSession, Course, CourseOffering, CourseStudent, Message, TaskStudent
+from app.api.common.filters import FilterSpec
+from app.api.common.pagination import CursorPage
+from app.core.db_con import SessionLocal, read_only
+from app.api.course.models import Attendance, ClassSession, Course, CourseOffering, CourseStudent, Message, Task, TaskStudent
 from app.api.course.repository import (
     AttendanceRepo, ClassSessionRepo, CourseLecturerRepo, CourseOfferingRepo, CourseRepo, CourseStudentRepo, MessageRepo, TaskRepo
 )
-from app.api.course.schema import AttendanceCreate, ClassSessionCreate, ClassSessionDetailed, ClassSessionOut, CourseCreate, CourseLecturerCreate, CourseLecturerOut, CourseOfferingCreate, CourseOfferingCreateReq, CourseOfferingOutDetailed, CourseOfferingOutLecturer, CourseOfferingOutMain, CourseOfferingOutStudent, CourseStudentCreate, EventStatus, MessageCreate, TaskCreate, TaskOut, TaskStudentFlat, TaskStudentStatus, TaskStudentStatusExtended
+from app.api.course.schema import AttendanceCreate, ClassSessionCreate, ClassSessionDetailed, ClassSessionOut, CourseCreate, CourseLecturerCreate, CourseLecturerOut, CourseOfferingCreate, CourseOfferingCreateReq, CourseOfferingOutDetailed, CourseOfferingOutLecturer, CourseOfferingOutMain, CourseOfferingOutStudent, CourseStudentCreate, EventStatus, MessageCreate, StudentMessageOut, TaskCreate, TaskOut, TaskStudentFlat, TaskStudentStatus, TaskStudentStatusExtended
 
 
 
@@ -79,18 +83,21 @@ class CourseService:
             return course
 
     async def get_courses(
-        self, skip: int | None = None, limit: int | None = None
-    ) -> list[Course]:
-        async with self.session.begin():
-            users = await self.course_repo.get_all(
-                self.session, skip=skip, limit=limit
+        self, cursor: str | None = None, limit: int | None = None,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> CursorPage[Course]:
+        async with read_only(self.session):
+            courses = await self.course_repo.get_page(
+                self.session, cursor=cursor, limit=limit, fields=fields,
+                spec=spec
             )
-            return users
+            return courses
 
     async def get_course(
         self, id: UUID
     ) -> Course | None:
-        async with self.session.begin():
+        async with read_only(self.session):
             course = await self.course_repo.get_one_by_id(self.session, id)
             return course
 
@@ -98,9 +105,10 @@ class CourseService:
         self, course_offering_data: CourseOfferingCreateReq
     ) -> CourseOffering:
         async with self.session.begin():
-            session_id = await self.session_repo.get_session_id_by_semester(
+            semester = await self.semester_repo.load(
                 self.session, course_offering_data.semester_id
             )
+            session_id = semester.session_id if semester else None
             if not session_id:
                 raise DataNotFound(
                     code=400,
@@ -126,17 +134,17 @@ class CourseService:
         self, semester_id: UUID | None = None,
         session_id: UUID | None = None,
         is_active: bool | None = None,
-        skip: int | None = None,
+        cursor: str | None = None,
         limit: int | None = None
-    ) -> list[CourseOfferingOutDetailed]:
-        async with self.session.begin():
+    ) -> CursorPage[CourseOfferingOutDetailed]:
+        async with read_only(self.session):
             if session_id or semester_id or is_active:
                 course_offerings = await self.course_offering_repo.get_session_course_offerings(
-                    self.session, semester_id, session_id, is_active, skip=skip, limit=limit
+                    self.session, semester_id, session_id, is_active, cursor=cursor, limit=limit
                 )
             else:
                 course_offerings = await self.course_offering_repo.get_current_sesion_course_offerings(
-                    self.session, skip=skip, limit=limit
+                    self.session, cursor=cursor, limit=limit
                 )
             return course_offerings
 
@@ -144,9 +152,9 @@ class CourseService:
     async def get_course_offering(
         self, id: UUID
     ) -> CourseOffering | None:
-        async with self.session.begin():
+        async with read_only(self.session):
             course_offering = await self.course_offering_repo.get_one_by_id(
-                self.session, id, depth=1
+                self.session, id, profile="detail"
             )
             return course_offering
 
@@ -202,7 +210,7 @@ class CourseService:
     async def get_lecturer_dashboard_summary(
         self, lecturer_id: UUID
     ) -> LecturerDashboardSummary:
-        async with self.session.begin():
+        async with read_only(self.session):
             courses =  await self.course_lecturer_repo.get_course_lecturers_with_details(
                 self.session, lecturer_id
             )
@@ -219,7 +227,7 @@ class CourseService:
     async def get_student_courses(
         self, student_id: UUID
     ) -> list[CourseOfferingOutStudent]:
-        async with self.session.begin():
+        async with read_only(self.session):
             courses = await self.course_student_repo.get_course_students_with_details(
                 self.session, student_id
             )
@@ -228,26 +236,52 @@ class CourseService:
     async def get_lecturer_courses(
         self, lecturer_id: UUID
     ) -> list[CourseOfferingOutLecturer]:
-        async with self.session.begin():
+        async with read_only(self.session):
             courses = await self.course_lecturer_repo.get_course_lecturers_with_details(
                 self.session, lecturer_id
             )
             return courses
 
+    async def get_student_courses_json(self, student_id: UUID) -> str:
+        async with read_only(self.session):
+            return await self.course_student_repo.get_course_students_json(
+                self.session, student_id
+            )
+
+    async def get_lecturer_courses_json(self, lecturer_id: UUID) -> str:
+        async with read_only(self.session):
+            return await self.course_lecturer_repo.get_course_lecturers_json(
+                self.session, lecturer_id
+            )
+
     async def get_course_general(
         self,
         session_id: UUID,
         semester_id: UUID | None = None,
         department_id: UUID | None = None,
-        skip: int | None = None,
+        cursor: str | None = None,
         limit: int | None = None
-    ) -> list[CourseOfferingOutMain]:
-        async with self.session.begin():
+    ) -> CursorPage[CourseOfferingOutMain]:
+        async with read_only(self.session):
             courses = await self.course_offering_repo.get_courses(
-                self.session, session_id, semester_id, department_id, skip=skip, limit=limit
+                self.session, session_id, semester_id, department_id, cursor=cursor, limit=limit
             )
             return courses
 
+    async def get_course_general_json(
+        self,
+        session_id: UUID,
+        semester_id: UUID | None = None,
+        department_id: UUID | None = None,
+        cursor: str | None = None,
+        limit: int | None = None
+    ) -> str:
+        async with read_only(self.session):
+            return await self.course_offering_repo.get_courses_json(
+                self.session, session_id, semester_id, department_id,
+                cursor=cursor, limit=limit
+            )
+
     # ==========================================================================
     # Message
     # ==========================================================================
@@ -263,12 +297,15 @@ class CourseService:
     async def get_lecturer_announcement(
         self, lecturer_id: UUID,
         course_offering_id: UUID | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[Message]:
-        async with self.session.begin():
+        cursor: str | None = None, limit: int | None = None,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> CursorPage[Message]:
+        async with read_only(self.session):
             messages = await self.message_repo.get_teacher_messages(
                 self.session, lecturer_id,
-                course_offering_id, skip=skip, limit=limit
+                course_offering_id, cursor=cursor, limit=limit,
+                fields=fields, spec=spec
             )
             return messages
 
@@ -276,12 +313,14 @@ class CourseService:
         self, student_id: UUID,
         read: bool | None = None,
         course_offering_id: UUID | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[Message]:
-        async with self.session.begin():
+        cursor: str | None = None, limit: int | None = None,
+        estimate_total: bool = False
+    ) -> CursorPage[StudentMessageOut]:
+        async with read_only(self.session):
             messages = await self.message_repo.get_student_messages(
                 self.session, student_id, read,
-                course_offering_id, skip=skip, limit=limit
+                course_offering_id, cursor=cursor, limit=limit,
+                estimate_total=estimate_total
             )
             return messages
 
@@ -303,13 +342,13 @@ class CourseService:
         self, student_id: UUID,
         course_offering_id: UUID | None = None,
         status: TaskStudentStatusExtended | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[TaskStudentFlat]:
-        async with self.session.begin():
+        cursor: str | None = None, limit: int | None = None
+    ) -> CursorPage[TaskStudentFlat]:
+        async with read_only(self.session):
             tasks = await self.task_repo.get_student_tasks(
                 self.session, student_id,
                 course_offering_id, status,
-                skip=skip, limit=limit
+                cursor=cursor, limit=limit
             )
             return tasks
 
@@ -335,17 +374,19 @@ class CourseService:
     async def get_course_offering_tasks(
         self, course_offering_id: UUID,
         status: EventStatus | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[TaskOut]:
-        async with self.session.begin():
+        cursor: str | None = None, limit: int | None = None,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> CursorPage[Task]:
+        async with read_only(self.session):
             filter = {}
             if course_offering_id is not None:
                 filter.update({self.task_repo.model.course_offering_id: course_offering_id})
             if status is not None:
                 filter.update({self.task_repo.model.status: status})
-            tasks = await self.task_repo.get_all(
+            tasks = await self.task_repo.get_page(
                 self.session, filter=filter or None,
-                skip=skip, limit=limit
+                cursor=cursor, limit=limit, fields=fields, spec=spec
             )
             return tasks
 
@@ -387,19 +428,46 @@ class CourseService:
 
     async def get_attendance(
         self, class_session_id: UUID,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[Attendance]:
-        async with self.session.begin():
+        cursor: str | None = None, limit: int | None = None,
+        estimate_total: bool = False,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> CursorPage[Attendance]:
+        async with read_only(self.session):
             filter = {}
             if class_session_id is not None:
                 filter.update(
                     {self.attendance_repo.model.class_session_id: class_session_id}
                 )
-            return await self.attendance_repo.get_all(
+            return await self.attendance_repo.get_page(
                 self.session, filter=filter,
-                skip=skip, limit=limit
+                cursor=cursor, limit=limit, estimate_total=estimate_total,
+                fields=fields, spec=spec
             )
 
+    async def stream_attendance(
+        self, class_session_id: UUID,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> AsyncIterator[Attendance]:
+        # The request session is closed before a streamed body is sent,
+        # so the cursor lives on a session of its own
+        async with SessionLocal() as session, read_only(
+            session, snapshot=True
+        ):
+            attendances = self.attendance_repo.stream_all(
+                session,
+                filter={
+                    self.attendance_repo.model.class_session_id:
+                        class_session_id
+                },
+                fields=fields, spec=spec
+            )
+            # Closed before the session when the response stops early
+            async with aclosing(attendances):
+                async for attendance in attendances:
+                    yield attendance
+
     async def create_class_session(
         self, class_session_data: ClassSessionCreate
     ) -> ClassSession:
@@ -413,34 +481,33 @@ class CourseService:
     async def get_class_sessions(
         self, course_offering_id: UUID,
         detail: bool = False,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[ClassSessionOut] | list[ClassSessionDetailed]:
-        async with self.session.begin():
+        cursor: str | None = None, limit: int | None = None
+    ) -> CursorPage[ClassSessionOut] | CursorPage[ClassSessionDetailed]:
+        async with read_only(self.session):
             filter = {}
             if course_offering_id is not None:
                 filter.update(
                     {self.class_session_repo.model.course_offering_id: course_offering_id}
                 )
-            class_sessions = await self.class_session_repo.get_all(
-                self.session, filter=filter, depth=1 if detail else 0,
-                skip=skip, limit=limit,
-            )
-            if detail:
-                return [
-                    ClassSessionDetailed.model_validate(class_session)
-                    for class_session in class_sessions
-                ]
-            else:
-                return [
-                    ClassSessionOut.model_validate(class_session)
-                    for class_session in class_sessions
-                ]
+            class_sessions = await self.class_session_repo.get_page(
+                self.session, filter=filter,
+                profile="detail" if detail else None,
+                cursor=cursor, limit=limit,
+            )
+            schema = ClassSessionDetailed if detail else ClassSessionOut
+            return CursorPage[schema](
+                items=[
+                    schema.model_validate(class_session)
+                    for class_session in class_sessions.items
+                ],
+                next_cursor=class_sessions.next_cursor,
+            )
 
     async def get_class_session(
         self, id: UUID
     ) -> ClassSession | None:
-        async with self.session.begin():
+        async with read_only(self.session):
             class_session = await self.class_session_repo.get_one_by_id(
-                self.session, id, depth=1
+                self.session, id, profile="detail"
             )
             return class_session
@@ -1,7 +1,7 @@
 from datetime import date
 from uuid import UUID as _UUID, uuid4
 
-from sqlalchemy import Date, String, ForeignKey, Enum
+from sqlalchemy import Date, String, ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
@@ -9,7 +9,7 @@ from sqlalchemy.dialects.postgresql import UUID
 
 from app.api.institution.schema import SemesterEnum
 
-from ..common.models import Base
+from ..common.models import LAZY_STRATEGY, Base
 
 
 class School(Base):
@@ -17,7 +17,7 @@ class School(Base):
     name: Mapped[str] = mapped_column(String(255), unique=True)
 
     # Relationships
-    faculties: Mapped[list["Faculty"]] = relationship("Faculty", back_populates="school", lazy="noload")
+    faculties: Mapped[list["Faculty"]] = relationship("Faculty", back_populates="school", lazy=LAZY_STRATEGY)
 
     model_config = {"from_attributes": True}
 
@@ -27,10 +27,10 @@ class Faculty(Base):
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String(255), unique=True)
 
-    school_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("school.id"))
+    school_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("school.id"), index=True)
 
-    school: Mapped["School"] = relationship("School", back_populates="faculties", lazy="noload")
-    departments: Mapped[list["Department"]] = relationship("Department", back_populates="faculty", lazy="noload")
+    school: Mapped["School"] = relationship("School", back_populates="faculties", lazy=LAZY_STRATEGY)
+    departments: Mapped[list["Department"]] = relationship("Department", back_populates="faculty", lazy=LAZY_STRATEGY)
 
     model_config = {"from_attributes": True}
 
@@ -39,11 +39,11 @@ class Department(Base):
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String(255))
 
-    faculty_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("faculty.id"))
+    faculty_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("faculty.id"), index=True)
 
-    faculty: Mapped["Faculty"] = relationship("Faculty", back_populates="departments", lazy="noload")
-    users: Mapped[list["User"]] = relationship("User", back_populates="department", lazy="noload")
-    courses: Mapped[list["Course"]] = relationship("Course", back_populates="department", lazy="noload")
+    faculty: Mapped["Faculty"] = relationship("Faculty", back_populates="departments", lazy=LAZY_STRATEGY)
+    users: Mapped[list["User"]] = relationship("User", back_populates="department", lazy=LAZY_STRATEGY)
+    courses: Mapped[list["Course"]] = relationship("Course", back_populates="department", lazy=LAZY_STRATEGY)
 
     model_config = {"from_attributes": True}
 
@@ -52,20 +52,28 @@ class Session(Base):
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
     name: Mapped[str] = mapped_column(String(20), unique=True)
 
-    school_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("school.id"))
+    school_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("school.id"), index=True)
 
     start_date: Mapped[date] = mapped_column(Date)
     end_date: Mapped[date] = mapped_column(Date, nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
 
     course_offerings: Mapped[list["CourseOffering"]] = relationship(
-        "CourseOffering", back_populates="session", lazy="noload"
+        "CourseOffering", back_populates="session", lazy=LAZY_STRATEGY
+    )
+    semesters: Mapped[list["Semester"]] = relationship("Semester", back_populates="session", lazy=LAZY_STRATEGY)
+
+    __table_args__ = (
+        # For the prefix filter, see User
+        Index(
+            "ix_session_name_pattern", "name",
+            postgresql_ops={"name": "text_pattern_ops"}
+        ),
     )
-    semesters: Mapped[list["Semester"]] = relationship("Semester", back_populates="session", lazy="noload")
 
 class Semester(Base):
     id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
-    session_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("session.id"))
+    session_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("session.id"), index=True)
     name: Mapped[SemesterEnum] = mapped_column(
         Enum(SemesterEnum, name="semester_enum", create_type=True))
     start_date: Mapped[date] = mapped_column(Date)
@@ -73,7 +81,7 @@ class Semester(Base):
     is_active: Mapped[bool] = mapped_column(default=True)
 
     course_offerings: Mapped[list["CourseOffering"]] = relationship(
-        "CourseOffering", back_populates="semester", lazy="noload"
+        "CourseOffering", back_populates="semester", lazy=LAZY_STRATEGY
     )
 
-    session: Mapped["Session"] = relationship("Session", back_populates="semesters", lazy="noload")
+    session: Mapped["Session"] = relationship("Session", back_populates="semesters", lazy=LAZY_STRATEGY)
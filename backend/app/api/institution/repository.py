@@ -1,57 +1,47 @@
 from pydantic import UUID4
-from sqlalchemy import func, select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.common.pagination import clamp_limit, paginate_query
 from app.api.common.repo import PAGE_SIZE, BaseRepo, PaginatedResult
 from app.api.institution.models import Department, Faculty, School, Semester, Session
 from app.api.institution.schema import DepartmentCreate, DepartmentUpdate, FacultyCreate, FacultyUpdate, SchoolCreate, SchoolUpdate, SemesterCreate, SemesterUpdate, SessionCreate, SessionUpdate
 
 
 class SchoolRepo(BaseRepo[School, SchoolCreate, SchoolUpdate]):
-    pass
+    load_profiles = {"detail": ("faculties.departments",)}
 
 
 class SessionRepo(BaseRepo[Session, SessionCreate, SessionUpdate]):
-    async def get_session_id_by_semester(
-        self, con: AsyncSession, semester_id: UUID4
-    ) -> UUID4 | None:
-        query = (
-            select(self.model.id)
-            .select_from(Semester)
-            .join(
-                Session,
-                Semester.session_id == Session.id
-            )
-            .where(
-                Semester.id == semester_id
-            )
-        )
-        result = await con.execute(query)
-        return result.scalar_one_or_none()
+    load_profiles = {"detail": ("course_offerings", "semesters")}
+    filter_fields = ("is_active", "start_date")
 
 
 class SemesterRepo(BaseRepo[Semester, SemesterCreate, SemesterUpdate]):
     pass
 
 class FacultyRepo(BaseRepo[Faculty, FacultyCreate, FacultyUpdate]):
+    load_profiles = {"detail": ("departments",)}
+
     async def get_faculties(
             self, con: AsyncSession, school_id: UUID4 | None = None
     ) -> list[Faculty]:
+        # FacultyOut lists the departments, load them instead of leaving
+        # them to an implicit lazy load
         if school_id is None:
-            faculties = await self.get_all(con)
+            faculties = await self.get_all(con, profile="detail")
         else:
             faculties = await self.get_all(
-                con, filter={self.model.school_id: school_id}
+                con, filter={self.model.school_id: school_id},
+                profile="detail"
             )
         return faculties
 
 
 class DepartmentRepo(BaseRepo[Department, DepartmentCreate, DepartmentUpdate]):
-    async def _get_departments(
-        self, con: AsyncSession, faculty_id: UUID4 | None = None,
+    def _get_departments(
+        self, faculty_id: UUID4 | None = None,
         school_id: UUID4 | None = None,
-        skip: int | None = None,
-        limit: int | None = None
-    ) -> list[Department]:
+    ) -> Select:
         query = (
             select(self.model)
             .select_from(Department)
@@ -67,14 +57,9 @@ class DepartmentRepo(BaseRepo[Department, DepartmentCreate, DepartmentUpdate]):
             )
         if school_id is not None:
             query = query.where(
-                School.id == school_id
+                Faculty.school_id == school_id
             )
-        if skip is not None:
-            query = query.offset(skip)
-        if limit is not None:
-            query = query.limit(limit)
-
-        return query
+        return query.order_by(Department.id)
 
     async def get_departments(
         self, con: AsyncSession,
@@ -82,7 +67,8 @@ class DepartmentRepo(BaseRepo[Department, DepartmentCreate, DepartmentUpdate]):
         school_id: UUID4 | None = None,
         skip: int | None = None, limit: int | None = None
     ) -> list[Department]:
-        query = self._get_departments(con, faculty_id, school_id, skip, limit)
+        query = self._get_departments(faculty_id, school_id)
+        query = query.offset(skip).limit(clamp_limit(limit))
         departments = await con.execute(query)
         return departments.scalars().all()
 
@@ -90,19 +76,16 @@ class DepartmentRepo(BaseRepo[Department, DepartmentCreate, DepartmentUpdate]):
         self, con: AsyncSession,
         faculty_id: UUID4 | None = None,
         school_id: UUID4 | None = None,
-        skip: int | None = None, limit: int = PAGE_SIZE
+        skip: int | None = None, limit: int = PAGE_SIZE,
+        estimate_total: bool = False
     ) -> PaginatedResult[Department]:
-        query = self._get_departments(con, faculty_id, school_id, skip, limit)
-        count_query = query.with_only_columns(func.count()).order_by(None).limit(None).offset(None)
-        total = await con.scalar(count_query)
-        items = await self.get_departments(con, faculty_id, school_id, skip, limit)
-
-        return PaginatedResult[Department](
-            page_number=(skip // limit + 1 if skip is not None else 1) if total is not None else 0,
-            page_size=limit if limit is not None else 0,
-            total_items=total if total is not None else 0,
-            items=items,
-            total_pages=total // limit + 1 if total is not None else 0,
+        limit = clamp_limit(limit)
+        query = self._get_departments(faculty_id, school_id)
+        rows, total = await paginate_query(
+            con, query, skip, limit, estimate_total
+        )
+        return PaginatedResult[Department].build(
+            [row[0] for row in rows], total, skip, limit, estimate_total
         )
 
 
@@ -1,5 +1,10 @@
 import logging
+from typing import Annotated
 
+from app.api.common.etag import conditional_get
+from app.api.common.fields import parse_fields, sparse_page
+from app.api.common.filters import FilterParam, parse_filter
+from app.api.common.pagination import CursorPage, PaginatedResult
 from app.api.institution.dependencies import InstitutionServiceDep
 from app.api.institution.schema import DepartmentCreate, DepartmentOut, FacultyCreate, FacultyOut, FacultyOutDetailed, SchoolCreate, SchoolOut, SchoolOutDetailed, SemesterAndSessionCreate, SessionOut, SessionOutDetailed
 from fastapi import APIRouter, Depends, HTTPException, Request, status
@@ -36,7 +41,7 @@ async def create_school(
     return res
 
 
-@institution_router.get("/schools")
+@institution_router.get("/schools", dependencies=[conditional_get("school")])
 async def get_schools(
         institution_service: InstitutionServiceDep
 ) -> list[SchoolOut]:
@@ -78,7 +83,9 @@ async def create_faculty(
     return res
 
 
-@institution_router.get("/faculties")
+@institution_router.get(
+    "/faculties", dependencies=[conditional_get("faculty", "department")]
+)
 async def get_faculties_(
     institution_service: InstitutionServiceDep,
 ) -> list[FacultyOut]:
@@ -128,16 +135,20 @@ async def create_department(
     return res
 
 
-@institution_router.get("/departments")
+@institution_router.get(
+    "/departments", dependencies=[conditional_get("department", "faculty")]
+)
 async def get_departments_(
     institution_service: InstitutionServiceDep,
     school_id: UUID4 | None = None,
     faculty_id: UUID4 | None = None,
     skip: int | None = None,
-    limit: int | None = None
-) -> list[DepartmentOut]:
+    limit: int | None = None,
+    estimate_total: bool = False,
+) -> PaginatedResult[DepartmentOut]:
     return await institution_service.get_departments(
-        faculty_id, school_id, skip=skip, limit=limit
+        faculty_id, school_id, skip=skip, limit=limit,
+        estimate_total=estimate_total
     )
 
 
@@ -177,12 +188,17 @@ async def create_session(
 @institution_router.get("/session")
 async def get_sessions(
     institution_service: InstitutionServiceDep,
-    limit: int | None = None, skip: int | None = None
-) -> list[SessionOut]:
+    cache_headers: Annotated[dict[str, str], conditional_get("session")],
+    limit: int | None = None, cursor: str | None = None,
+    fields: str | None = None,
+    filter: FilterParam = None, order_by: str | None = None
+) -> CursorPage[SessionOut]:
+    field_names = parse_fields(fields, SessionOut)
     sessions = await institution_service.get_sessions(
-        limit=limit, skip=skip
+        limit=limit, cursor=cursor, fields=field_names,
+        spec=parse_filter(filter, order_by)
     )
-    return sessions
+    return sparse_page(sessions, SessionOut, field_names, cache_headers)
 
 
 @institution_router.get("/session/{session_id}")
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Annotated, Type, TypeVar
+from typing import Annotated, Sequence, Type, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -17,7 +17,10 @@ from app.api.institution.repository import (
 from app.api.institution.schema import (
     DepartmentCreate, FacultyCreate, SchoolCreate, SchoolOut, SemesterAndSessionCreate, SemesterCreate, SemesterEnum, SessionCreate
 )
+from app.api.common.filters import FilterSpec
+from app.core.db_con import read_only
 from app.api.common.dependencies import DbCon
+from app.api.common.pagination import CursorPage, PaginatedResult
 
 
 T = TypeVar("T", bound=BaseModel)
@@ -53,16 +56,16 @@ class InstitutionService:
     async def get_school(
         self, id: UUID, schema: Type[T] = SchoolOut,
     ) -> T | None:
-        async with self.session.begin():
+        async with read_only(self.session):
             school = await self.school_repo.get_one_by_id(
-                self.session, id, depth=2
+                self.session, id, profile="detail"
             )
             if not school:
                 return None
             return school
 
     async def get_schools(self) -> list[School]:
-        async with self.session.begin():
+        async with read_only(self.session):
             schools = await self.school_repo.get_all(self.session)
             return schools
 
@@ -75,15 +78,16 @@ class InstitutionService:
             return faculty
 
     async def get_faculty(self, id: UUID) -> Faculty | None:
-        faculty = await self.faculty_repo.get_one_by_id(
-            self.session, id, depth=2
-        )
-        return faculty
+        async with read_only(self.session):
+            faculty = await self.faculty_repo.get_one_by_id(
+                self.session, id, profile="detail"
+            )
+            return faculty
 
     async def get_faculties(
             self, school_id: UUID | None = None
     ) -> list[Faculty]:
-        async with self.session.begin():
+        async with read_only(self.session):
             faculties = await self.faculty_repo.get_faculties(
                 self.session, school_id=school_id
             )
@@ -100,9 +104,9 @@ class InstitutionService:
             return department
 
     async def get_department(self, id: UUID) -> Department | None:
-        async with self.session.begin():
+        async with read_only(self.session):
             department = await self.department_repo.get_one_by_id(
-                self.session, id, depth=2
+                self.session, id
             )
             return department
 
@@ -110,12 +114,13 @@ class InstitutionService:
             self, faculty_id: UUID | None = None,
             school_id: UUID | None = None,
             skip: int | None = None,
-            limit: int | None = None
-    ) -> list[Department]:
-        async with self.session.begin():
-            departments = await self.department_repo.get_departments(
+            limit: int | None = None,
+            estimate_total: bool = False
+    ) -> PaginatedResult[Department]:
+        async with read_only(self.session):
+            departments = await self.department_repo.get_departments_paginated(
                 self.session, faculty_id=faculty_id, school_id=school_id,
-                skip=skip, limit=limit
+                skip=skip, limit=limit, estimate_total=estimate_total
             )
             return departments
 
@@ -128,7 +133,6 @@ class InstitutionService:
                 end_date=session_data.second_semester_end_date,
                 is_active=True if session_data.first_semester_start_date >= date.today() and session_data.second_semester_end_date <= date.today() else False,
             )
-            print(session_only, "bug")
             session = await self.session_repo.create_one(
                 self.session, session_only
             )
@@ -152,17 +156,21 @@ class InstitutionService:
             return session
 
     async def get_session(self, id: UUID) -> Session | None:
-        session = await self.session_repo.get_one_by_id(
-            self.session, id, depth=1
-        )
-        return session
+        async with read_only(self.session):
+            session = await self.session_repo.get_one_by_id(
+                self.session, id, profile="detail"
+            )
+            return session
 
     async def get_sessions(
         self,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[Session]:
-        sessions = await self.session_repo.get_all(
-            self.session,
-            skip=skip, limit=limit
-        )
-        return sessions
+        cursor: str | None = None, limit: int | None = None,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> CursorPage[Session]:
+        async with read_only(self.session):
+            sessions = await self.session_repo.get_page(
+                self.session,
+                cursor=cursor, limit=limit, fields=fields, spec=spec
+            )
+            return sessions
@@ -1,11 +1,10 @@
 import asyncio
-from time import time
 import logging
 from contextlib import asynccontextmanager
 
 from app.api.common.schema import rebuild_schema
 from fastapi import FastAPI, HTTPException, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
 from starlette.middleware.base import BaseHTTPMiddleware
 from fastapi.openapi.utils import get_openapi
@@ -15,14 +14,16 @@ from asgi_correlation_id import CorrelationIdMiddleware
 from app.api.common.models import Base
 from app.exceptions import CustomError
 from app.api.common.utils import use_redis
-from app.core.db_con import check_db_health, init_db
+from app.core.db_con import ReadYourWritesMiddleware, check_db_health, check_schema_version, pools_status
 
 from .user.router import user_router
 from .institution.router import institution_router
 from .course.router import course_router
 from ..core.redis_con import RedisConnectionError, close_redis_pool, connect_redis_pool
 from ..core.logger import setup_logging
+from ..core.compression import CompressionMiddleware
 from ..core.config import settings
+from ..core.timing import ServerTimingMiddleware, TimedORJSONResponse
 
 # Configure logging right at the start
 setup_logging()
@@ -45,10 +46,9 @@ async def lifespan_event_handler(app: FastAPI):
     logger.info("Service startup sequence initiated.")
 
     try:
-        # Create DB scehams
-
-        await init_db()
-
+        # Schema changes are applied by migrations before the workers
+        # start, only make sure they were
+        await check_schema_version()
 
         # --- CONNECT TO REDIS ON STARTUP ---
         if use_redis():
@@ -72,9 +72,12 @@ async def lifespan_event_handler(app: FastAPI):
         logger.info("Shutdown sequence complete.")
 
 
+# Routes without a ready response are rendered by orjson, which encodes
+# UUIDs, datetimes and enums itself
 app = FastAPI(
     version="1.0",
-    lifespan=lifespan_event_handler
+    lifespan=lifespan_event_handler,
+    default_response_class=TimedORJSONResponse,
 )
 
 # security_scheme = HTTPBearer()
@@ -115,17 +118,10 @@ def custom_openapi():
 app.openapi = custom_openapi
 
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        start_time = time()
-        response = await call_next(request)
-        process_time = time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
-
-
+app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(CorrelationIdMiddleware)
-app.add_middleware(TimingMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 
 
@@ -134,7 +130,7 @@ async def custom_global_exception_handler(_: Request, exc: CustomError):
     error =  exc.name if exc.name else "Internal Server Error"
     logger.error(f"Custon exception {error}", exc_info=exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.code if exc.code else 500,
         content={
             "status_code": exc.code or 500,
@@ -149,7 +145,7 @@ async def custom_global_exception_handler(_: Request, exc: CustomError):
 async def global_exception_handler(_: Request, exc: Exception):
     logger.error("Unhandled exception", exc_info=exc)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={
             "status_code": 500,
@@ -161,21 +157,28 @@ async def global_exception_handler(_: Request, exc: Exception):
 
 @app.get("/")
 async def read_root():
-    return JSONResponse(content={"value": "hello world!"})
+    return ORJSONResponse(content={"value": "hello world!"})
 
 
 @app.get("/db")
 async def db_check():
     if await check_db_health():
-        return JSONResponse(content={"status": "ok"})
+        return ORJSONResponse(content={"status": "ok"})
     raise HTTPException(
         status_code=503, detail="Unnable to connect to database"
     )
 
 
+# Pool internals are for tuning, not for anyone who can reach production
+if settings.APP_ENV != "prod":
+    @app.get("/db/pool")
+    async def db_pool_status():
+        return ORJSONResponse(content=pools_status())
+
+
 @app.get("/api")
 async def health_check():
-    return JSONResponse(content={"status": "ok"})
+    return ORJSONResponse(content={"status": "ok"})
 
 
 app.include_router(user_router)
@@ -1,12 +1,12 @@
 from uuid import UUID as _UUID, uuid4
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, String, Integer, ForeignKey, Enum
+from sqlalchemy import DateTime, String, Integer, ForeignKey, Enum, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.api.user.schema import LecturerDegree, LecturerRank, LecturerTitle, Status, UserType
-from ..common.models import Base
+from ..common.models import LAZY_STRATEGY, Base
 
 
 class User(Base):
@@ -23,7 +23,8 @@ class User(Base):
     )
 
     department_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("department.id"), nullable=True
+        UUID(as_uuid=True), ForeignKey("department.id"), nullable=True,
+        index=True
     )
 
     created_at: Mapped[datetime] = mapped_column(
@@ -34,9 +35,24 @@ class User(Base):
         onupdate=datetime.now(timezone.utc)
     )
 
-    department: Mapped["Department"] = relationship("Department", back_populates="users", lazy="noload")
-    student_profile: Mapped["StudentProfile"] = relationship("StudentProfile", back_populates="user", uselist=False, lazy="noload")
-    lecturer_profile: Mapped["LecturerProfile"] = relationship("LecturerProfile", back_populates="user", uselist=False, lazy="noload")
+    department: Mapped["Department"] = relationship("Department", back_populates="users", lazy=LAZY_STRATEGY)
+    student_profile: Mapped["StudentProfile"] = relationship("StudentProfile", back_populates="user", uselist=False, lazy=LAZY_STRATEGY)
+    lecturer_profile: Mapped["LecturerProfile"] = relationship("LecturerProfile", back_populates="user", uselist=False, lazy=LAZY_STRATEGY)
+
+    __table_args__ = (
+        # Cursor pages walk (created_at, id)
+        Index("ix_user_created_at_id", "created_at", "id"),
+        # The prefix filter's LIKE 'x%' can only use a pattern_ops index
+        # unless the database collation is C
+        Index(
+            "ix_user_email_pattern", "email",
+            postgresql_ops={"email": "text_pattern_ops"}
+        ),
+        Index(
+            "ix_user_last_name_pattern", "last_name",
+            postgresql_ops={"last_name": "text_pattern_ops"}
+        ),
+    )
 
 
 class StudentProfile(Base):
@@ -51,22 +67,23 @@ class StudentProfile(Base):
     matric_number: Mapped[str] = mapped_column(String(50), unique=True)
     admission_session_id: Mapped[UUID] = mapped_column(
         UUID(as_uuid=True),
-        ForeignKey("session.id")
+        ForeignKey("session.id"),
+        index=True
     )
     status: Mapped[Status] = mapped_column(
         Enum(Status, name="status", create_type=True)
     )
 
-    user: Mapped["User"] = relationship("User", back_populates="student_profile", lazy="noload")
+    user: Mapped["User"] = relationship("User", back_populates="student_profile", lazy=LAZY_STRATEGY)
     course_students: Mapped[list["CourseStudent"]] = relationship(
-        "CourseStudent", back_populates="student", lazy="noload"
+        "CourseStudent", back_populates="student", lazy=LAZY_STRATEGY
     )
 
     task_students: Mapped[list["TaskStudent"]] = relationship(
-        "TaskStudent", back_populates="student"
+        "TaskStudent", back_populates="student", lazy=LAZY_STRATEGY
     )
     message_students: Mapped[list["MessageStudent"]] = relationship(
-        "MessageStudent", back_populates="student"
+        "MessageStudent", back_populates="student", lazy=LAZY_STRATEGY
     )
 
 
@@ -93,8 +110,8 @@ class LecturerProfile(Base):
     )
 
     user: Mapped["User"] = relationship(
-        "User", back_populates="lecturer_profile", lazy="noload"
+        "User", back_populates="lecturer_profile", lazy=LAZY_STRATEGY
     )
     course_lecturers: Mapped[list["CourseLecturer"]] = relationship(
-        "CourseLecturer", back_populates="lecturer", lazy="noload"
+        "CourseLecturer", back_populates="lecturer", lazy=LAZY_STRATEGY
     )
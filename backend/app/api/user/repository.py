@@ -1,8 +1,14 @@
-from typing import Tuple, Union, cast, overload
+from typing import AsyncIterator, Sequence, Tuple, Union, cast, overload
 from pydantic import UUID4
-from sqlalchemy import JSON, Select, exists, func, select, cast as sa_cast
+from sqlalchemy import JSON, RowMapping, Select, exists, func, select, cast as sa_cast
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.common.repo import BaseRepo, PaginatedResult, PAGE_SIZE
+from app.api.common.explain import estimate_count
+from app.api.common.filters import FilterSpec
+from app.api.common.pagination import (
+    CursorPage, clamp_limit, keyset_paginate, to_cursor_page
+)
+from app.api.common.repo import STREAM_BATCH_SIZE, BaseRepo
+from app.api.common.validation import validate_rows
 from app.api.course.models import Course, CourseLecturer, CourseOffering, CourseStudent
 from app.api.institution.models import Department, Semester, Session
 from app.api.user.models import LecturerProfile, StudentProfile, User
@@ -10,6 +16,9 @@ from app.api.user.schema import LecturerCreate, LecturerDetailsOut, LecturerUpda
 
 
 class UserRepo(BaseRepo[User, UserCreate, UserUpdate]):
+    load_profiles = {"detail": ("student_profile", "lecturer_profile")}
+    filter_fields = ("user_type", "last_name", "created_at")
+
     async def create_user(
         self, con: AsyncSession,
         user_obj: UserCreate | StudentCreate | LecturerCreate
@@ -55,9 +64,13 @@ class UserRepo(BaseRepo[User, UserCreate, UserUpdate]):
 
     async def get_users(
         self, con: AsyncSession,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[User]:
-        users = await self.get_all(con, skip=skip, limit=limit)
+        cursor: str | None = None, limit: int | None = None,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> CursorPage[User]:
+        users = await self.get_page(
+            con, cursor=cursor, limit=limit, fields=fields, spec=spec
+        )
         return users
 
     async def get_user(
@@ -75,13 +88,12 @@ class LecturerProfileRepo(BaseRepo[LecturerProfile, LecturerCreate, LecturerUpda
 
         return await con.scalar(query)
 
-    async def _get_lecturers_with_details(
-        self, con: AsyncSession,
+    def _get_lecturers_with_details(
+        self,
         department_id: UUID4 | None = None,
         session_id: UUID4 | None = None,
         course_offering_id: UUID4 | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[LecturerDetailsOut]:
+    ) -> Select:
         course_offerings_subquery = (
             select(
                 func.coalesce(
@@ -142,12 +154,7 @@ class LecturerProfileRepo(BaseRepo[LecturerProfile, LecturerCreate, LecturerUpda
                 CourseLecturer.course_offering_id == course_offering_id
             )
 
-        if skip is not None:
-            query = query.offset(skip)
-        if limit is not None:
-            query = query.limit(limit)
-
-        return query
+        return query.order_by(LecturerProfile.id)
 
 
     async def get_lecturers_with_details(
@@ -157,43 +164,67 @@ class LecturerProfileRepo(BaseRepo[LecturerProfile, LecturerCreate, LecturerUpda
         course_offering_id: UUID4 | None = None,
         skip: int | None = None, limit: int | None = None
     ) -> list[LecturerDetailsOut]:
-        query = self._get_lecturers_with_details(con, department_id, session_id, course_offering_id, skip, limit)
+        query = self._get_lecturers_with_details(department_id, session_id, course_offering_id)
+        query = query.offset(skip).limit(clamp_limit(limit))
         data = await con.execute(query)
-        return [
-            LecturerDetailsOut(**row) for row in data.mappings().all()
-        ]
+        return validate_rows(LecturerDetailsOut, data.mappings().all())
 
-    async def get_lecturers_with_details_paginated(
+    async def get_lecturers_with_details_page(
         self, con: AsyncSession,
         department_id: UUID4 | None = None,
         session_id: UUID4 | None = None,
         course_offering_id: UUID4 | None = None,
-        skip: int | None = None, limit: int = PAGE_SIZE
-    ) -> PaginatedResult[LecturerDetailsOut]:
-        query = self._get_lecturers_with_details(con, department_id, session_id, course_offering_id, skip, limit)
-        count_query = query.with_only_columns(func.count()).order_by(None)
-        total = await con.scalar(count_query)
-        items = await self.get_lecturers_with_details(con, department_id, session_id, course_offering_id, skip, limit)
-        return PaginatedResult[LecturerDetailsOut](
-            page_number=(skip // limit + 1 if skip is not None else 1) if total is not None else 0,
-            page_size=limit if limit is not None else 0,
-            total_items=total if total is not None else 0,
-            items=items,
-            total_pages=total // limit + 1 if total is not None else 0,
+        cursor: str | None = None, limit: int | None = None,
+        estimate_total: bool = False
+    ) -> CursorPage[LecturerDetailsOut]:
+        """
+        Keyset page of `_get_lecturers_with_details`, a row per lecturer
+        and course offering they teach, walked on (lecturer, offering)
+        """
+        limit = clamp_limit(limit)
+        query = self._get_lecturers_with_details(
+            department_id, session_id, course_offering_id
+        ).add_columns(CourseOffering.id.label("course_offering_id"))
+        total = await estimate_count(con, query) if estimate_total else None
+        query = keyset_paginate(
+            query.order_by(None), [LecturerProfile.id, CourseOffering.id],
+            cursor, limit
+        )
+        rows = (await con.execute(query)).all()
+        page = to_cursor_page(rows, ["id", "course_offering_id"], limit)
+        return CursorPage[LecturerDetailsOut](
+            items=validate_rows(
+                LecturerDetailsOut, [row._mapping for row in page.items]
+            ),
+            next_cursor=page.next_cursor, total_items=total
         )
 
+    async def stream_lecturers_with_details(
+        self, con: AsyncSession,
+        department_id: UUID4 | None = None,
+        session_id: UUID4 | None = None,
+        course_offering_id: UUID4 | None = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[RowMapping]:
+        """Every matching lecturer row, read through a server side cursor"""
+        query = self._get_lecturers_with_details(department_id, session_id, course_offering_id)
+        result = await con.stream(
+            query.execution_options(yield_per=batch_size)
+        )
+        async for row in result.mappings():
+            yield row
+
 
 class StudentProfileRepo(
     BaseRepo[StudentProfile, StudentCreate, StudentUpdate]
 ):
-    async def _get_students_with_details(
-        self, con: AsyncSession,
+    def _get_students_with_details(
+        self,
         department_id: UUID4 | None = None,
         session_id: UUID4 | None = None,
         admission_session_id: UUID4 | None = None,
         course_offering_id: UUID4 | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> Select[Tuple[StudentProfile]]:
+    ) -> Select:
         course_offerings_subquery = (
             select(
                 func.coalesce(
@@ -258,12 +289,7 @@ class StudentProfileRepo(
                 CourseStudent.course_offering_id == course_offering_id
             )
 
-        if skip is not None:
-            query = query.offset(skip)
-        if limit is not None:
-            query = query.limit(limit)
-
-        return query
+        return query.order_by(StudentProfile.id)
 
     async def get_students_with_details(
         self, con: AsyncSession,
@@ -273,28 +299,55 @@ class StudentProfileRepo(
         course_offering_id: UUID4 | None = None,
         skip: int | None = None, limit: int | None = None
     ) -> list[StudentDetailsOut]:
-        query = await self._get_students_with_details(con, department_id, session_id, admission_session_id, course_offering_id, skip, limit)
+        query = self._get_students_with_details(department_id, session_id, admission_session_id, course_offering_id)
+        query = query.offset(skip).limit(clamp_limit(limit))
         data = await con.execute(query)
-        return [
-            StudentDetailsOut(**row) for row in data.mappings().all()
-        ]
-    async def get_students_with_details_paginated(
+        return validate_rows(StudentDetailsOut, data.mappings().all())
+
+    async def get_students_with_details_page(
         self, con: AsyncSession,
         department_id: UUID4 | None = None,
         session_id: UUID4 | None = None,
         admission_session_id: UUID4 | None = None,
         course_offering_id: UUID4 | None = None,
-        skip: int | None = None, limit: int = PAGE_SIZE
-    ) -> PaginatedResult[StudentDetailsOut]:
-        query = await self._get_students_with_details(con, department_id, session_id, admission_session_id, course_offering_id, skip, limit)
+        cursor: str | None = None, limit: int | None = None,
+        estimate_total: bool = False
+    ) -> CursorPage[StudentDetailsOut]:
+        """
+        Keyset page of `_get_students_with_details`, a row per student and
+        course offering they registered for, walked on (student, offering)
+        """
+        limit = clamp_limit(limit)
+        query = self._get_students_with_details(
+            department_id, session_id, admission_session_id,
+            course_offering_id
+        ).add_columns(CourseOffering.id.label("course_offering_id"))
+        total = await estimate_count(con, query) if estimate_total else None
+        query = keyset_paginate(
+            query.order_by(None), [StudentProfile.id, CourseOffering.id],
+            cursor, limit
+        )
+        rows = (await con.execute(query)).all()
+        page = to_cursor_page(rows, ["id", "course_offering_id"], limit)
+        return CursorPage[StudentDetailsOut](
+            items=validate_rows(
+                StudentDetailsOut, [row._mapping for row in page.items]
+            ),
+            next_cursor=page.next_cursor, total_items=total
+        )
 
-        count_query = query.with_only_columns(func.count()).order_by(None).limit(None).offset(None)
-        total = await con.scalar(count_query)
-        items = await self.get_students_with_details(con, department_id, session_id, admission_session_id, course_offering_id, skip, limit)
-        return PaginatedResult[StudentDetailsOut](
-            page_number=(skip // limit + 1 if skip is not None else 1) if total is not None else 0,
-            page_size=limit if limit is not None else 0,
-            total_items=total if total is not None else 0,
-            items=items,
-            total_pages=total // limit + 1 if total is not None else 0,
+    async def stream_students_with_details(
+        self, con: AsyncSession,
+        department_id: UUID4 | None = None,
+        session_id: UUID4 | None = None,
+        admission_session_id: UUID4 | None = None,
+        course_offering_id: UUID4 | None = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[RowMapping]:
+        """Every matching student row, read through a server side cursor"""
+        query = self._get_students_with_details(department_id, session_id, admission_session_id, course_offering_id)
+        result = await con.stream(
+            query.execution_options(yield_per=batch_size)
         )
+        async for row in result.mappings():
+            yield row
@@ -1,6 +1,12 @@
 import logging
 
+from app.api.common.fields import parse_fields, sparse_page
+from app.api.common.filters import FilterParam, parse_filter
+from app.api.common.pagination import CursorPage
+from app.api.common.streaming import ndjson_response
+from app.api.common.validation import trusted_response
 from app.api.course.schema import TaskStudentFlat
+from app.core.budget import budget
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.responses import ORJSONResponse
 from pydantic import UUID4
@@ -44,6 +50,7 @@ async def create_student(
 
 @user_router.get(
     "/students",
+    dependencies=[budget(5000)],
     tags=["Lecturer", "HOD"]
 )
 async def get_students(
@@ -52,13 +59,23 @@ async def get_students(
     session_id: UUID4 | None = None,
     admission_session_id: UUID4 | None = None,
     course_offering_id: UUID4 | None = None,
-    skip: int | None = None,
+    cursor: str | None = None,
     limit: int | None = None,
-) -> list[StudentDetailsOut]:
-    return await user_service.get_students(
+    estimate_total: bool = False,
+    stream: bool = False,
+) -> CursorPage[StudentDetailsOut]:
+    if stream:
+        return ndjson_response(
+            user_service.stream_students(
+                department_id, session_id, admission_session_id,
+                course_offering_id
+            ),
+            StudentDetailsOut
+        )
+    return trusted_response(await user_service.get_students(
         department_id, session_id, admission_session_id,
-        course_offering_id, skip, limit
-    )
+        course_offering_id, cursor, limit, estimate_total
+    ))
 
 # ==============================================================================
 # Lecturer
@@ -78,6 +95,7 @@ async def create_lecturer(
 
 @user_router.get(
     "/lecturer",
+    dependencies=[budget(5000)],
     tags=["HOD"]
 )
 async def get_lecturers(
@@ -85,41 +103,65 @@ async def get_lecturers(
     department_id: UUID4 | None = None,
     session_id: UUID4 | None = None,
     course_offering_id: UUID4 | None = None,
-    skip: int | None = None,
+    cursor: str | None = None,
     limit: int | None = None,
-) -> list[LecturerDetailsOut]:
-    return await user_service.get_lecturers(
-        department_id, session_id, course_offering_id, skip, limit
-    )
+    estimate_total: bool = False,
+    stream: bool = False,
+) -> CursorPage[LecturerDetailsOut]:
+    if stream:
+        return ndjson_response(
+            user_service.stream_lecturers(
+                department_id, session_id, course_offering_id
+            ),
+            LecturerDetailsOut
+        )
+    return trusted_response(await user_service.get_lecturers(
+        department_id, session_id, course_offering_id, cursor, limit,
+        estimate_total
+    ))
 
 @user_router.get(
     "/lecturer/dashboard/summary",
+    dependencies=[budget(3000)],
     tags=["Lecturer"]
 )
 async def get_lecturer_dashboard_summary(
     user_service: UserServiceDep,
     lecturer_id: UUID4,
 ) -> LecturerDashboardSummary:
-    return await user_service.get_lecturer_dashboard_summary(lecturer_id)
+    return trusted_response(
+        await user_service.get_lecturer_dashboard_summary(lecturer_id)
+    )
 
 
 @user_router.get(
     "/student/dashboard/summary",
+    dependencies=[budget(3000)],
     tags=["Student"]
 )
 async def get_lecturer_dashboard_summary(
     user_service: UserServiceDep,
     student_id: UUID4,
 ) -> StudentDashboardSummary:
-    return await user_service.get_student_dashboard_summary(student_id)
+    return trusted_response(
+        await user_service.get_student_dashboard_summary(student_id)
+    )
 
 
-@user_router.get("/users")
+@user_router.get("/users", dependencies=[budget(3000)])
 async def get_users(
-        user_service: UserServiceDep
-) -> list[UserOut]:
-    users = await user_service.get_users()
-    return users
+    user_service: UserServiceDep,
+    cursor: str | None = None,
+    limit: int | None = None,
+    fields: str | None = None,
+    filter: FilterParam = None,
+    order_by: str | None = None,
+) -> CursorPage[UserOut]:
+    field_names = parse_fields(fields, UserOut)
+    users = await user_service.get_users(
+        cursor, limit, field_names, parse_filter(filter, order_by)
+    )
+    return sparse_page(users, UserOut, field_names)
 
 
 @user_router.get("/users/{user_id}")
@@ -1,4 +1,5 @@
-from typing import Annotated
+from contextlib import aclosing
+from typing import Annotated, AsyncIterator, Sequence
 from uuid import UUID
 
 from app.api.course.dependencies import CourseServiceDep
@@ -6,8 +7,12 @@ from app.api.course.models import Message
 from app.api.course.schema import TaskStudentFlat, TaskStudentStatus, TaskType
 from app.api.user.dependencies import get_lecturer_profile_repo, get_student_profile_repo, get_user_repo
 from fastapi import Depends
+from sqlalchemy import RowMapping
 
 from app.api.common.dependencies import DbCon
+from app.api.common.filters import FilterSpec
+from app.api.common.pagination import CursorPage
+from app.core.db_con import SessionLocal, read_only
 from app.api.user.models import User
 from app.api.user.repository import LecturerProfileRepo, StudentProfileRepo, UserRepo
 from app.api.user.schema import LecturerCreate, LecturerDashboardSummary, LecturerDetailsOut, StudentCreate, StudentDashboardSummary, StudentDetailsOut, UserCreate
@@ -61,18 +66,22 @@ class UserService:
     #         return user
 
     async def get_users(
-        self, skip: int | None = None, limit: int | None = None
-    ) -> list[User]:
-        async with self.session.begin():
-            users = await self.user_repo.get_users(self.session, skip, limit)
+        self, cursor: str | None = None, limit: int | None = None,
+        fields: Sequence[str] | None = None,
+        spec: FilterSpec | None = None
+    ) -> CursorPage[User]:
+        async with read_only(self.session):
+            users = await self.user_repo.get_users(
+                self.session, cursor, limit, fields, spec
+            )
             return users
 
     async def get_user(
         self, id: UUID
     ) -> User | None:
-        async with self.session.begin():
+        async with read_only(self.session):
             user = await self.user_repo.get_one_by_id(
-                self.session, id, depth=1
+                self.session, id, profile="detail"
             )
             return user
 
@@ -104,20 +113,60 @@ class UserService:
         session_id: UUID | None = None,
         admission_session_id: UUID | None = None,
         course_offering_id: UUID | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[StudentDetailsOut]:
-        return await self.student_repo.get_students_with_details(
-            self.session, department_id, session_id,
-            admission_session_id, course_offering_id, skip, limit
-        )
+        cursor: str | None = None, limit: int | None = None,
+        estimate_total: bool = False
+    ) -> CursorPage[StudentDetailsOut]:
+        async with read_only(self.session):
+            return await self.student_repo.get_students_with_details_page(
+                self.session, department_id, session_id,
+                admission_session_id, course_offering_id, cursor, limit,
+                estimate_total
+            )
+
+    async def stream_students(
+        self, department_id: UUID | None = None,
+        session_id: UUID | None = None,
+        admission_session_id: UUID | None = None,
+        course_offering_id: UUID | None = None,
+    ) -> AsyncIterator[RowMapping]:
+        # The request session is closed before a streamed body is sent,
+        # so the cursor lives on a session of its own
+        async with SessionLocal() as session, read_only(
+            session, snapshot=True
+        ):
+            rows = self.student_repo.stream_students_with_details(
+                session, department_id, session_id,
+                admission_session_id, course_offering_id
+            )
+            # Closed before the session when the response stops early
+            async with aclosing(rows):
+                async for row in rows:
+                    yield row
 
     async def get_lecturers(
         self, department_id: UUID | None = None,
         session_id: UUID | None = None,
         course_offering_id: UUID | None = None,
-        skip: int | None = None, limit: int | None = None
-    ) -> list[LecturerDetailsOut]:
-        return await self.lecturer_repo.get_lecturers_with_details(
-            self.session, department_id, session_id,
-            course_offering_id, skip, limit
-        )
+        cursor: str | None = None, limit: int | None = None,
+        estimate_total: bool = False
+    ) -> CursorPage[LecturerDetailsOut]:
+        async with read_only(self.session):
+            return await self.lecturer_repo.get_lecturers_with_details_page(
+                self.session, department_id, session_id,
+                course_offering_id, cursor, limit, estimate_total
+            )
+
+    async def stream_lecturers(
+        self, department_id: UUID | None = None,
+        session_id: UUID | None = None,
+        course_offering_id: UUID | None = None,
+    ) -> AsyncIterator[RowMapping]:
+        async with SessionLocal() as session, read_only(
+            session, snapshot=True
+        ):
+            rows = self.lecturer_repo.stream_lecturers_with_details(
+                session, department_id, session_id, course_offering_id
+            )
+            async with aclosing(rows):
+                async for row in rows:
+                    yield row
@@ -0,0 +1,41 @@
+from contextvars import ContextVar
+from time import monotonic
+
+from fastapi import Depends
+
+
+# Monotonic time by which the current request has to be done with the
+# database, None when its route declares no budget
+request_deadline: ContextVar[float | None] = ContextVar(
+    "request_deadline", default=None
+)
+
+
+def remaining() -> float | None:
+    """Seconds left in the current request's budget, if it has one"""
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - monotonic()
+
+
+def budget(ms: int):
+    """
+    Route dependency bounding how long the request may spend waiting for a
+    pooled connection and running queries, e.g.
+    `@router.get("/", dependencies=[budget(2000)])`. The deadline caps the
+    pool checkout timeout and each transaction's statement_timeout. When
+    budgets nest the tighter one wins.
+    """
+    async def start_budget():
+        deadline = monotonic() + ms / 1000
+        current = request_deadline.get()
+        token = request_deadline.set(
+            deadline if current is None else min(current, deadline)
+        )
+        try:
+            yield
+        finally:
+            request_deadline.reset(token)
+
+    return Depends(start_budget)
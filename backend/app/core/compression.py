@@ -0,0 +1,112 @@
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # optional, gzip only without it
+    brotli = None
+
+
+# Already compressed or meant to reach the client as it is produced
+SKIP_MEDIA_TYPES = (
+    "image/", "video/", "audio/", "application/zip", "application/gzip",
+    "application/x-ndjson", "text/event-stream",
+)
+
+
+def _accepted(accept_encoding: str) -> dict[str, float]:
+    codings = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            codings[coding.lower()] = quality
+    return codings
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Best coding the client accepts, brotli over gzip when installed"""
+    codings = _accepted(accept_encoding)
+    offered = ("br", "gzip") if brotli is not None else ("gzip",)
+    best = None
+    for coding in offered:
+        quality = codings.get(coding, codings.get("*", 0.0))
+        if quality > 0 and (best is None or quality > best[1]):
+            best = (coding, quality)
+    return best[0] if best else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """
+    Compresses complete responses of at least COMPRESSION_MIN_SIZE bytes,
+    negotiated from Accept-Encoding. Streamed responses, whose body comes
+    in more than one message, go out untouched so they are not buffered.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", "")
+        )
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                # held until the first body message shows whether it streams
+                start = message
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            held, start = start, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=held.setdefault("headers", []))
+            if (
+                message.get("more_body", False)
+                or len(body) < settings.COMPRESSION_MIN_SIZE
+                or "content-encoding" in headers
+                or headers.get("content-type", "").startswith(SKIP_MEDIA_TYPES)
+            ):
+                await send(held)
+                await send(message)
+                return
+
+            # large enough to be compressed for clients that accept it
+            headers.add_vary_header("Accept-Encoding")
+            if encoding is not None:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                # each encoding is its own representation, etag.matching_tag
+                # strips the suffix again
+                etag = headers.get("etag")
+                if etag is not None and etag.endswith('"'):
+                    headers["ETag"] = f'{etag[:-1]}-{encoding}"'
+                message = {**message, "body": body}
+            await send(held)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
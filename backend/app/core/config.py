@@ -32,16 +32,71 @@ class BasicConfig(Init, BaseSettings):
     def ASYNC_POSTGRES_URL(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    # Hosts of streaming replicas serving the same database with the same
+    # credentials as POSTGRES_SERVER, as a JSON list. Empty keeps every
+    # query on the primary.
+    POSTGRES_REPLICA_SERVERS: list[str] = []
+    # How long a client keeps reading from the primary after a write,
+    # should cover the usual replication lag
+    REPLICA_PIN_SECONDS: float = 5.0
+
+    @property
+    def ASYNC_REPLICA_URLS(self) -> list[str]:
+        return [
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{server}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+            for server in self.POSTGRES_REPLICA_SERVERS
+        ]
+
+    # Connection pool of each worker process, see db_pool.engine_options
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Prepared statements asyncpg keeps per connection
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # Compiled SQL SQLAlchemy keeps per engine, saves rebuilding the SQL
+    # string of repeated statements
+    DB_QUERY_CACHE_SIZE: int = 1200
+    # POSTGRES_SERVER is a transaction-mode pooler such as PgBouncer. The
+    # pooler owns the connections, so the app keeps none open and does not
+    # rely on server side prepared statements surviving between statements.
+    DB_EXTERNAL_POOLER: bool = False
+    # Log every statement, separate from DEBUG as it is very noisy
+    DB_ECHO: bool = False
+    # A request running the same statement this many times is logged as
+    # a likely N+1, a lazy load or a query in a loop
+    DB_N_PLUS_ONE_THRESHOLD: int = 3
+    # Refuse to start when the database is not at the Alembic head,
+    # instead of only logging it
+    DB_SCHEMA_STRICT: bool = True
+
+    # Responses smaller than this go out uncompressed, the savings would
+    # not pay for the CPU. Brotli is used when the `brotli` package is
+    # installed, gzip otherwise.
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
     USE_REDIS: bool = False
     REDIS_URL: str | None = None
 
 
 class Dev(BasicConfig):
     DEBUG: bool = True
+    # Server-Timing header with the database, validation and serialization
+    # split of each request, and X-DB-* headers with its query counts
+    SERVER_TIMING: bool = True
+    # Relationships nothing eager loaded raise instead of lazy loading,
+    # see common.models.LAZY_STRATEGY
+    STRICT_LOADING: bool = True
+    DB_SCHEMA_STRICT: bool = False
 
 
 class Prod(BasicConfig):
     DEBUG: bool = False
+    SERVER_TIMING: bool = False
+    STRICT_LOADING: bool = False
 
 
 if Init().APP_ENV == "dev":
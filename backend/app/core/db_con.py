@@ -1,29 +1,324 @@
+import hmac
+import random
+from contextvars import ContextVar
+from functools import lru_cache
+from hashlib import sha256
+from http.cookies import SimpleCookie
+from math import isfinite
+from pathlib import Path
+from time import time
+
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError, InvalidRequestError
+from sqlalchemy.exc import TimeoutError as PoolTimeout
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.log import logging
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session as SyncSession
+from sqlalchemy.sql.dml import UpdateBase
 
 from app.api.common.models import Base
 from ..api.user.models import *
 from ..api.institution.models import *
 from ..api.course.models import *
 
+from app.exceptions import DeadlineExceeded, is_query_canceled
 from ..core.config import settings
+from .budget import remaining
+from .db_pool import engine_options, pool_status
 
 logger = logging.getLogger(__name__)
 
+ALEMBIC_DIR = Path(__file__).resolve().parent.parent / "alembic"
+
 engine = create_async_engine(
-    url=settings.ASYNC_POSTGRES_URL, echo=settings.DEBUG
+    url=settings.ASYNC_POSTGRES_URL, **engine_options()
 )
 
+replica_engines = [
+    create_async_engine(url=url, **engine_options())
+    for url in settings.ASYNC_REPLICA_URLS
+]
+
+# Cookie holding the time until which a client that just wrote keeps
+# reading from the primary
+PRIMARY_PIN_COOKIE = "db_primary_until"
+
+
+class PrimaryPin:
+    """Read-your-writes state of the current request"""
+    def __init__(self, until: float = 0.0):
+        self.until = until
+        self.extended = False
+
+    def active(self) -> bool:
+        return self.until > time()
+
+    def extend(self):
+        self.until = time() + settings.REPLICA_PIN_SECONDS
+        self.extended = True
+
+
+primary_pin: ContextVar[PrimaryPin | None] = ContextVar(
+    "primary_pin", default=None
+)
+
+
+class RoutingSession(SyncSession):
+    """
+    Sends the reads of a `read_only` unit of work to a replica picked at
+    random once per transaction, so all of its statements share one
+    connection and one snapshot. Writes, flushes, anything after this session wrote and every
+    read of a client pinned after a recent write go to the primary.
+    """
+    def get_bind(self, mapper=None, clause=None, **kw):
+        pin = primary_pin.get()
+        if (
+            replica_engines
+            and self.info.get("read_only")
+            and not self.info.get("wrote")
+            and not self._flushing
+            and not isinstance(clause, UpdateBase)
+            and not (pin is not None and pin.active())
+        ):
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = random.choice(replica_engines)
+            return replica.sync_engine
+        return engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_replica(session: SyncSession, transaction):
+    # The next transaction may pick another replica
+    if transaction.parent is None:
+        session.info.pop("replica", None)
+
+
+@event.listens_for(RoutingSession, "before_flush")
+def _forbid_read_only_flush(session: SyncSession, *_):
+    if session.info.get("read_only"):
+        raise InvalidRequestError("Flush inside a read_only unit of work")
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_write(session: SyncSession, _):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if (
+        orm_execute_state.is_insert or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        if orm_execute_state.session.info.get("read_only"):
+            raise InvalidRequestError(
+                "Write statement inside a read_only unit of work"
+            )
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _apply_statement_timeout(session: SyncSession, transaction, connection):
+    # Postgres cancels whatever runs past the request's deadline and frees
+    # the connection, instead of the query outliving the client
+    left = remaining()
+    if left is None:
+        return
+    if left <= 0:
+        raise DeadlineExceeded()
+    options = connection.get_execution_options()
+    if options.get("isolation_level") == "AUTOCOMMIT":
+        return
+    connection.exec_driver_sql(
+        f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}"
+    )
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _pin_after_write(session: SyncSession):
+    pin = primary_pin.get()
+    if session.info.get("wrote") and pin is not None:
+        pin.extend()
+
+
+# Each statement commits on its own, no BEGIN and COMMIT round trips
+_AUTOCOMMIT_READS = {"isolation_level": "AUTOCOMMIT"}
+# One consistent snapshot for every statement. REPEATABLE READ, not
+# SERIALIZABLE DEFERRABLE, as a hot standby refuses serializable
+# transactions and these reads may be routed to a replica.
+_SNAPSHOT_READS = {
+    "isolation_level": "REPEATABLE READ",
+    "postgresql_readonly": True,
+}
+# Reads of a request with a budget, a plain READ ONLY transaction so the
+# statement_timeout set when it begins applies to them
+_BUDGETED_READS = {"postgresql_readonly": True}
+
+
+class _ReadOnlyWork:
+    def __init__(self, session: AsyncSession, snapshot: bool):
+        self.session = session
+        self.options = _SNAPSHOT_READS if snapshot else _AUTOCOMMIT_READS
+
+    async def __aenter__(self) -> AsyncSession:
+        sync_session = self.session.sync_session
+        self._autoflush = sync_session.autoflush
+        sync_session.autoflush = False
+        sync_session.info["read_only"] = True
+        options = self.options
+        if options is _AUTOCOMMIT_READS and remaining() is not None:
+            # statement_timeout can only be set per transaction
+            options = _BUDGETED_READS
+        self._transaction = self.session.begin()
+        try:
+            await self._transaction.__aenter__()
+            await self.session.connection(execution_options=options)
+        except BaseException:
+            self._restore()
+            raise
+        return self.session
+
+    async def __aexit__(self, *exc_info):
+        try:
+            return await self._transaction.__aexit__(*exc_info)
+        finally:
+            self._restore()
+
+    def _restore(self):
+        sync_session = self.session.sync_session
+        sync_session.autoflush = self._autoflush
+        sync_session.info.pop("read_only", None)
+
+
+def read_only(
+    session: AsyncSession, snapshot: bool = False
+) -> _ReadOnlyWork:
+    """
+    Unit of work for pure reads, used in place of `session.begin()`.
+    Statements run in autocommit, saving the BEGIN and COMMIT round trips,
+    or with `snapshot` in one READ ONLY REPEATABLE READ transaction when
+    they must agree with each other. Autoflush is off, any flush or write
+    statement raises, and the reads may be routed to a replica.
+    """
+    return _ReadOnlyWork(session, snapshot)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Keeps clients that just wrote reading from the primary until the
+    replicas have caught up, tracked through a short lived cookie.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replica_engines:
+            await self.app(scope, receive, send)
+            return
+
+        pin = PrimaryPin(_read_pin(scope))
+        token = primary_pin.set(pin)
+
+        async def send_with_pin(message):
+            if message["type"] == "http.response.start" and pin.extended:
+                cookie = (
+                    f"{PRIMARY_PIN_COOKIE}={_sign_pin(pin.until)}; "
+                    f"Max-Age={int(settings.REPLICA_PIN_SECONDS) + 1}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"set-cookie", cookie.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            primary_pin.reset(token)
+
+
+def _pin_signature(value: str) -> str:
+    return hmac.new(
+        settings.SECRET_KEY.encode(), f"{PRIMARY_PIN_COOKIE}:{value}".encode(),
+        sha256
+    ).hexdigest()[:32]
+
+
+def _sign_pin(until: float) -> str:
+    value = f"{until:.3f}"
+    return f"{value}.{_pin_signature(value)}"
+
+
+def _read_pin(scope) -> float:
+    """
+    Pin time of the request's cookie. Only a value this app signed counts,
+    and never further out than REPLICA_PIN_SECONDS from now, so a client
+    cannot keep its reads on the primary for longer than a write would.
+    """
+    for name, value in scope["headers"]:
+        if name != b"cookie":
+            continue
+        morsel = SimpleCookie(value.decode("latin-1")).get(PRIMARY_PIN_COOKIE)
+        if morsel is None:
+            continue
+        until, _, signature = morsel.value.rpartition(".")
+        if not hmac.compare_digest(signature, _pin_signature(until)):
+            return 0.0
+        try:
+            until = float(until)
+        except ValueError:
+            return 0.0
+        if not isfinite(until):
+            return 0.0
+        return min(until, time() + settings.REPLICA_PIN_SECONDS)
+    return 0.0
+
+
 SessionLocal = async_sessionmaker(
-    bind=engine, autocommit=False, expire_on_commit=False
+    bind=engine, sync_session_class=RoutingSession,
+    autocommit=False, expire_on_commit=False
 )
 
 
 async def get_session() -> AsyncSession:
-    """Get database connection"""
-    async with SessionLocal() as session:
+    """
+    Request scoped session. It holds no connection until its first
+    statement and hands it back to the pool as soon as that unit of work,
+    a `session.begin()` block, ends. A request only occupies a pooled
+    connection while it is talking to the database, not while its body is
+    read or its response is serialized and sent.
+    """
+    session = SessionLocal()
+    try:
         yield session
+    except PoolTimeout as e:
+        # No pooled connection freed up within the budget
+        raise DeadlineExceeded() from e
+    except DBAPIError as e:
+        if is_query_canceled(e):
+            raise DeadlineExceeded() from e
+        raise
+    finally:
+        if session.in_transaction():
+            logger.warning(
+                "Request finished with a transaction still open, its "
+                "connection was held for the whole request. Run the work "
+                "inside session.begin()"
+            )
+        await session.close()
+
+
+def pools_status() -> dict:
+    """Pool metrics of the primary and every replica"""
+    return {
+        "primary": pool_status(engine),
+        "replicas": [pool_status(replica) for replica in replica_engines],
+    }
 
 
 async def check_db_health() -> bool:
@@ -40,8 +335,57 @@ async def check_db_health() -> bool:
     return True
 
 
-async def init_db():
-    """Initialize database tables"""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+@lru_cache(maxsize=1)
+def schema_heads() -> frozenset[str]:
+    """Head revisions of the migration scripts shipped with this build"""
+    return frozenset(ScriptDirectory(str(ALEMBIC_DIR)).get_heads())
+
+
+@lru_cache(maxsize=1)
+def schema_revisions() -> frozenset[str]:
+    """Every revision of the migration scripts shipped with this build"""
+    return frozenset(
+        script.revision
+        for script in ScriptDirectory(str(ALEMBIC_DIR)).walk_revisions()
+    )
+
+
+async def check_schema_version():
+    """
+    Compare the revision stamped in the database with the migration heads.
+    Migrations themselves run once per deploy (scripts/prestart.sh), so a
+    worker boot costs a single query rather than introspecting the whole
+    catalog like metadata.create_all does. Only a database behind this
+    build stops it with DB_SCHEMA_STRICT; one at a revision this build does
+    not know was migrated by a newer build, as in a rolling deploy, and is
+    only logged.
+    """
+    async with engine.connect() as conn:
+        current = await conn.run_sync(
+            lambda sync_conn: frozenset(
+                MigrationContext.configure(sync_conn).get_current_heads()
+            )
+        )
+
+    expected = schema_heads()
+    if current == expected:
+        logger.info(f"Database schema at revision {', '.join(current)}")
+        return
+    if current - schema_revisions():
+        logger.warning(
+            f"Database schema at revision {', '.join(current)}, ahead of "
+            f"this build's {', '.join(expected)}"
+        )
+        return
+    message = (
+        f"Database schema at revision {', '.join(current) or 'none'}, "
+        f"expected {', '.join(expected)}; run `alembic upgrade head`"
+    )
+    if settings.DB_SCHEMA_STRICT:
+        raise SchemaOutOfDate(message)
+    logger.warning(message)
 
@@ -0,0 +1,136 @@
+from time import perf_counter
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+
+from .budget import remaining
+from .config import settings
+
+
+class PoolStats:
+    """Running checkout statistics of one pool"""
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        self.checkouts += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        if timed_out:
+            self.timeouts += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                self.total_wait / self.checkouts * 1000
+                if self.checkouts else 0.0
+            ),
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+class MeteredPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that also records how long each checkout took, including
+    waiting for a free connection and pre-ping, and how many timed out.
+    """
+    def __init__(self, *args, **kw):
+        super().__init__(*args, **kw)
+        self.stats = PoolStats()
+
+    # QueuePool waits `_timeout` for a free connection. Read per checkout,
+    # so a request with a budget never waits past its deadline.
+    @property
+    def _timeout(self) -> float:
+        left = remaining()
+        if left is None:
+            return self._configured_timeout
+        return max(0.0, min(self._configured_timeout, left))
+
+    @_timeout.setter
+    def _timeout(self, value: float):
+        self._configured_timeout = value
+
+    def recreate(self):
+        pool = super().recreate()
+        pool._timeout = self._configured_timeout
+        return pool
+
+    def connect(self):
+        start = perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record(perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(perf_counter() - start)
+        return connection
+
+
+def _statement_name() -> str:
+    # A pooler hands consecutive transactions to different backends, a
+    # fixed name could collide with a statement another client prepared
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options() -> dict[str, Any]:
+    """
+    create_async_engine arguments shared by the primary and the replicas.
+    Every worker process gets its own pool, so the most connections one
+    deployment opens is workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) per
+    database node.
+
+    With DB_EXTERNAL_POOLER the pooler bounds the backends instead: no
+    connection is kept between checkouts and prepared statements are
+    neither cached nor reused. SQLAlchemy's compiled cache still spares
+    rebuilding the SQL of repeated statements.
+    """
+    if settings.DB_EXTERNAL_POOLER:
+        return {
+            "echo": settings.DB_ECHO,
+            "poolclass": NullPool,
+            "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _statement_name,
+            },
+        }
+    return {
+        "echo": settings.DB_ECHO,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "poolclass": MeteredPool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {
+            "prepared_statement_cache_size":
+                settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    }
+
+
+def pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    """Current occupancy and checkout statistics of `engine`'s pool"""
+    pool = engine.pool
+    if isinstance(pool, NullPool):
+        return {"external_pooler": True}
+    status = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    if isinstance(pool, MeteredPool):
+        status.update(pool.stats.as_dict())
+    return status
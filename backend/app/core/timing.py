@@ -0,0 +1,184 @@
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Iterator, Literal
+
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+Phase = Literal["validate", "serialize"]
+
+
+class RequestTimings:
+    """Where the current request spent its time, in seconds"""
+    def __init__(self):
+        self.start = perf_counter()
+        self.db = 0.0
+        self.queries = 0
+        self.validate = 0.0
+        self.serialize = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def elapsed(self) -> float:
+        return perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """`Server-Timing` header value, durations in milliseconds"""
+        total = self.elapsed()
+        other = total - self.db - self.validate - self.serialize
+        return ", ".join([
+            f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"',
+            f"validate;dur={self.validate * 1000:.1f}",
+            f"serialize;dur={self.serialize * 1000:.1f}",
+            f"app;dur={max(other, 0.0) * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ])
+
+    def record_query(self, statement: str, duration: float):
+        self.db += duration
+        self.queries += 1
+        self.statements[statement] += 1
+
+
+def repeated_statements(
+    statements: Counter[str], threshold: int | None = None
+) -> dict[str, int]:
+    """
+    Statements run at least `threshold` times with only their parameters
+    changing, the usual shape of an N+1: a lazy load or a query per item
+    of a loop.
+    """
+    if threshold is None:
+        threshold = settings.DB_N_PLUS_ONE_THRESHOLD
+    return {
+        statement: count for statement, count in statements.most_common()
+        if count >= threshold
+    }
+
+
+# Set by ServerTimingMiddleware for the request being handled. SQLAlchemy
+# runs the sync event hooks in a greenlet sharing the task's context, so
+# they see it too.
+request_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def timed(phase: Phase) -> Iterator[None]:
+    """Add the time spent in the block to `phase` of the current request"""
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        setattr(timings, phase, getattr(timings, phase) + perf_counter() - start)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    if request_timings.get() is not None:
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    timings = request_timings.get()
+    if timings is None or not conn.info.get("query_start"):
+        return
+    timings.record_query(
+        statement, perf_counter() - conn.info["query_start"].pop()
+    )
+
+
+@event.listens_for(Engine, "handle_error")
+def _failed_query(context):
+    timings = request_timings.get()
+    conn = context.connection
+    if timings is None or conn is None or not conn.info.get("query_start"):
+        return
+    timings.record_query(
+        context.statement or "", perf_counter() - conn.info["query_start"].pop()
+    )
+
+
+class TimedORJSONResponse(ORJSONResponse):
+    """ORJSONResponse counting its rendering as serialization time"""
+    def render(self, content) -> bytes:
+        with timed("serialize"):
+            return super().render(content)
+
+
+def _log_queries(scope, timings: RequestTimings):
+    repeated = repeated_statements(timings.statements)
+    message = (
+        f"{scope['method']} {scope['path']} queries={timings.queries} "
+        f"db_ms={timings.db * 1000:.1f} repeated={len(repeated)}"
+    )
+    extra = {
+        "db_queries": timings.queries,
+        "db_ms": round(timings.db * 1000, 1),
+        "db_repeated": repeated,
+    }
+    if repeated:
+        logger.warning(
+            message + "".join(
+                f"\n  {count}x {statement[:200]}"
+                for statement, count in repeated.items()
+            ),
+            extra=extra
+        )
+    else:
+        logger.debug(message, extra=extra)
+
+
+class ServerTimingMiddleware:
+    """
+    Reports how long each request took in `X-Process-Time` and, with
+    SERVER_TIMING, how that splits into database, validation and
+    serialization time in `Server-Timing`, with the query counts in X-DB-*
+    headers. Measured up to the start of the response, a streamed body is
+    not held back. The queries of every request are logged, as a warning
+    when some statement repeats like an N+1.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message.setdefault("headers", []))
+                headers.append("X-Process-Time", str(timings.elapsed()))
+                if settings.SERVER_TIMING:
+                    headers.append("Server-Timing", timings.server_timing())
+                    headers.append("X-DB-Queries", str(timings.queries))
+                    headers.append("X-DB-Time", f"{timings.db * 1000:.1f}")
+                    headers.append(
+                        "X-DB-Repeated",
+                        str(len(repeated_statements(timings.statements)))
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_timings.reset(token)
+            _log_queries(scope, timings)
@@ -1,9 +1,10 @@
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import DBAPIError, IntegrityError
 
 
 POSTGRES_UNIQUE_VIOLATION = "23505"
 POSTGRES_FOREIGN_KEY_VIOLATION = "23503"
 POSTGRES_NOT_NULL_VIOLATION = "23502"
+POSTGRES_QUERY_CANCELED = "57014"
 
 
 # NOTE: POSTGRESS_SPECIFIC
@@ -23,6 +24,10 @@ def is_foreign_key_violation(e: IntegrityError) -> bool:
         return True
     return False
 
+def is_query_canceled(e: DBAPIError) -> bool:
+    # Raised when statement_timeout cancels a running statement
+    return getattr(e.orig, 'pgcode', None) == POSTGRES_QUERY_CANCELED
+
 class CustomError(Exception):
     def __init__(
         self, message: str = "Something went wrong",
@@ -50,6 +55,38 @@ class DuplicateData(CustomError):
     ):
         super().__init__(message, name, code)
 
+class InvalidCursor(CustomError):
+    def __init__(
+        self, message: str = "Invalid or expired pagination cursor",
+        name="Invalid Cursor",
+        code: int = 400
+    ):
+        super().__init__(message, name, code)
+
+class InvalidField(CustomError):
+    def __init__(
+        self, message: str = "Unknown field requested",
+        name="Invalid Field",
+        code: int = 400
+    ):
+        super().__init__(message, name, code)
+
+class InvalidFilter(CustomError):
+    def __init__(
+        self, message: str = "Invalid filter",
+        name="Invalid Filter",
+        code: int = 400
+    ):
+        super().__init__(message, name, code)
+
+class DeadlineExceeded(CustomError):
+    def __init__(
+        self, message: str = "The request ran out of its time budget",
+        name="Deadline Exceeded",
+        code: int = 503
+    ):
+        super().__init__(message, name, code)
+
 class CreationDependencyError(CustomError):
     """
     Raised when creating a record that references a non-existent
@@ -0,0 +1,165 @@
+"""
+Time building and serialising a student dashboard of --rows course rows,
+the way routes used to (a model per row, then FastAPI validating the whole
+response model again and rendering it with the stdlib json or orjson)
+against validate_rows and trusted_response.
+
+Rows are shaped like the repository query results, nested lecturers and
+pending tasks coming out of Postgres JSON aggregates. Nothing connects to
+a database, placeholder POSTGRES_* settings are filled in when the
+environment has none. From the backend directory:
+
+    python scripts/bench_validation.py --rows 1000
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+from uuid import uuid4
+
+# Run as a script, the app package is not on the path and the settings
+# are read when it is imported, as in tests/conftest.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_PORT", "5432")
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+os.environ.setdefault("POSTGRES_DB", "app")
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.api.common.schema import rebuild_schema  # noqa: E402
+from app.api.common.validation import (  # noqa: E402
+    trusted_response, validate_rows
+)
+from app.api.course.schema import CourseOfferingOutStudent  # noqa: E402
+from app.api.user.schema import StudentDashboardSummary  # noqa: E402
+
+
+def course_rows(count: int) -> list[dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    session_id = str(uuid4())
+    semester_id = str(uuid4())
+    rows = []
+    for i in range(count):
+        course_offering_id = str(uuid4())
+        lecturer_id = str(uuid4())
+        rows.append({
+            "course_offering_id": course_offering_id,
+            "semester_id": semester_id,
+            "session_id": session_id,
+            "course_code": f"CSC{i:04d}",
+            "course_name": f"Course {i}",
+            "total_class_session": 24,
+            "session": "2025/2026",
+            "semester": "FIRST",
+            "class_session_attended": i % 24,
+            "course_lecturers": [{
+                "id": str(uuid4()),
+                "user_id": lecturer_id,
+                "rank": "SENIOR_LECTURER",
+                "title": "DR",
+                "degree": "PHD",
+                "status": "ACTIVE",
+                "first_name": "Ada",
+                "last_name": "Lovelace",
+                "email": f"lecturer{i}@example.com",
+            }],
+            "pending_tasks": [
+                {
+                    "id": str(uuid4()),
+                    "course_offering_id": course_offering_id,
+                    "task_type": "ASSIGNMENT",
+                    "lecturer_id": lecturer_id,
+                    "title": f"Task {t}",
+                    "details": "Read chapter one",
+                    "deadline": (now + timedelta(days=t)).isoformat(),
+                    "created_at": now.isoformat(),
+                }
+                for t in range(2)
+            ],
+        })
+    return rows
+
+
+def summary(courses: list[CourseOfferingOutStudent]) -> StudentDashboardSummary:
+    return StudentDashboardSummary(
+        total_course_offering=len(courses),
+        total_lectures_completed=sum(
+            course.class_session_attended for course in courses
+        ),
+        pending_assignments=sum(len(course.pending_tasks) for course in courses),
+        courses=courses,
+    )
+
+
+rebuild_schema()
+RESPONSE_FIELD = create_model_field(
+    "Response_bench", StudentDashboardSummary, mode="serialization"
+)
+
+
+async def _per_row(
+    rows: list[dict[str, Any]], response_class: type[JSONResponse]
+) -> bytes:
+    courses = [CourseOfferingOutStudent(**row) for row in rows]
+    content = await serialize_response(
+        field=RESPONSE_FIELD, response_content=summary(courses)
+    )
+    return response_class(content).body
+
+
+async def per_row(rows: list[dict[str, Any]]) -> bytes:
+    return await _per_row(rows, JSONResponse)
+
+
+async def per_row_orjson(rows: list[dict[str, Any]]) -> bytes:
+    return await _per_row(rows, ORJSONResponse)
+
+
+async def adapter(rows: list[dict[str, Any]]) -> bytes:
+    courses = validate_rows(CourseOfferingOutStudent, rows)
+    return trusted_response(summary(courses)).body
+
+
+async def timed(
+    run: Callable[[list[dict[str, Any]]], Awaitable[bytes]],
+    rows: list[dict[str, Any]], repeat: int
+) -> float:
+    await run(rows)
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        await run(rows)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+async def main(count: int, repeat: int):
+    rows = course_rows(count)
+    runs = {
+        "model per row + response model, json": per_row,
+        "model per row + response model, orjson": per_row_orjson,
+        "validate_rows + trusted_response": adapter,
+    }
+    print(f"{count} rows, best of {repeat}")
+    baseline = None
+    for name, run in runs.items():
+        took = await timed(run, rows, repeat)
+        baseline = baseline or took
+        print(f"  {name:<40} {took * 1000:8.2f} ms  {baseline / took:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,10 @@
+#! /usr/bin/env bash
+
+set -e
+set -x
+
+# Bring the schema to the latest revision once, before any worker starts.
+# The workers themselves only check that the database is at that revision.
+# A database created by the old create_all startup already has every
+# table: mark it as migrated with `alembic stamp 0001_initial` first.
+alembic upgrade head
@@ -0,0 +1,63 @@
+import os
+
+# Settings are read when the app is imported, a test run needs no .env.
+# The database is always the test one: the seeded tests commit their rows
+# and empty every table afterwards.
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ.setdefault("POSTGRES_SERVER", "localhost")
+os.environ.setdefault("POSTGRES_PORT", "5432")
+os.environ.setdefault("POSTGRES_USER", "postgres")
+os.environ.setdefault("POSTGRES_PASSWORD", "postgres")
+os.environ["POSTGRES_DB"] = os.environ.get("TEST_POSTGRES_DB", "app_test")
+os.environ["POSTGRES_REPLICA_SERVERS"] = "[]"
+
+import pytest  # noqa: E402
+from alembic.migration import MigrationContext  # noqa: E402
+from sqlalchemy.exc import DBAPIError  # noqa: E402
+
+import app.api.main  # noqa: E402, F401, registers every model and schema
+from app.core.db_con import engine, schema_heads  # noqa: E402
+
+from .seed import seed, truncate  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def pg_engine():
+    """
+    The app's engine, on the test database migrated to head. Tests using
+    it are skipped when there is no such database.
+    """
+    try:
+        async with engine.connect() as conn:
+            current = await conn.run_sync(
+                lambda sync_conn: frozenset(
+                    MigrationContext.configure(sync_conn).get_current_heads()
+                )
+            )
+    except (OSError, DBAPIError) as e:
+        await engine.dispose()
+        pytest.skip(f"no test database: {e}")
+    if current != schema_heads():
+        await engine.dispose()
+        pytest.skip(
+            f"test database {os.environ['POSTGRES_DB']} is not at the "
+            "migration head, run `alembic upgrade head` on it"
+        )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def seeded(pg_engine):
+    """tests.seed dataset, committed so requests see it too"""
+    async with pg_engine.connect() as conn:
+        await truncate(conn)
+        await seed(conn)
+    yield pg_engine
+    async with pg_engine.connect() as conn:
+        await truncate(conn)
@@ -0,0 +1,203 @@
+"""
+Scaled synthetic dataset for the tests that need a populated database,
+large enough at the default scale for the planner to prefer indexes
+"""
+from hashlib import md5
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.api.common.models import Base, TableVersion
+
+
+# Row counts per unit of scale
+COURSES = 200
+LECTURERS = 300
+STUDENTS = 5000
+OFFERINGS = 1000
+
+# Ids are md5(<table><n>)::uuid so every row can reference its parents
+# without a lookup, and tests can name them the same way
+SEED = [
+    """
+    INSERT INTO school (id, name)
+    VALUES (md5('school1')::uuid, 'Scaled School')
+    """,
+    """
+    INSERT INTO faculty (id, name, school_id)
+    SELECT md5('faculty' || i)::uuid, 'Scaled Faculty ' || i,
+           md5('school1')::uuid
+    FROM generate_series(1, 10) AS i
+    """,
+    """
+    INSERT INTO department (id, name, faculty_id)
+    SELECT md5('department' || i)::uuid, 'Department ' || i,
+           md5('faculty' || (i % 10 + 1))::uuid
+    FROM generate_series(1, 100) AS i
+    """,
+    """
+    INSERT INTO session (id, name, school_id, start_date, end_date, is_active)
+    SELECT md5('session' || i)::uuid, 'Scaled ' || i, md5('school1')::uuid,
+           date '2015-09-01' + i * 365, NULL, i = 10
+    FROM generate_series(1, 10) AS i
+    """,
+    """
+    INSERT INTO semester (id, session_id, name, start_date, end_date,
+                          is_active)
+    SELECT md5('semester' || i)::uuid,
+           md5('session' || ((i - 1) / 2 + 1))::uuid,
+           (CASE WHEN i % 2 = 1 THEN 'FIRST' ELSE 'SECOND' END)::semester_enum,
+           date '2015-09-01' + i * 180, NULL, false
+    FROM generate_series(1, 20) AS i
+    """,
+    """
+    INSERT INTO course (id, name, code, overview, level, department_id)
+    SELECT md5('course' || i)::uuid, 'Course ' || i, 'C' || i, NULL,
+           (i % 5 + 1) * 100, md5('department' || (i % 100 + 1))::uuid
+    FROM generate_series(1, {courses}) AS i
+    """,
+    """
+    INSERT INTO "user" (id, first_name, last_name, email, phone_number,
+                        password, user_type, department_id, created_at,
+                        updated_at)
+    SELECT md5('user' || i)::uuid, 'First' || i, 'Last' || i,
+           'scaled' || i || '@example.com', NULL, 'x',
+           (CASE WHEN i <= {lecturers} THEN 'LECTURER' ELSE 'STUDENT' END)
+               ::user_type,
+           md5('department' || (i % 100 + 1))::uuid,
+           now() - i * interval '1 minute', now() - i * interval '1 minute'
+    FROM generate_series(1, {lecturers} + {students}) AS i
+    """,
+    """
+    INSERT INTO lecturer_profile (id, user_id, rank, title, degree, status)
+    SELECT md5('lecturer' || i)::uuid, md5('user' || i)::uuid,
+           (enum_range(NULL::rank))[i % 7 + 1], 'DR', 'PHD', 'ACTIVE'
+    FROM generate_series(1, {lecturers}) AS i
+    """,
+    """
+    INSERT INTO student_profile (id, user_id, matric_number,
+                                 admission_session_id, status)
+    SELECT md5('student' || i)::uuid, md5('user' || ({lecturers} + i))::uuid,
+           'SCALED' || i, md5('session' || (i % 10 + 1))::uuid, 'ACTIVE'
+    FROM generate_series(1, {students}) AS i
+    """,
+    """
+    INSERT INTO course_offering (id, course_id, semester_id, session_id,
+                                 is_active, class_completed)
+    SELECT md5('offering' || i)::uuid,
+           md5('course' || ((i - 1) / 20 % {courses} + 1))::uuid,
+           md5('semester' || ((i - 1) % 20 + 1))::uuid,
+           md5('session' || ((i - 1) % 20 / 2 + 1))::uuid,
+           true, 0
+    FROM generate_series(1, {offerings}) AS i
+    """,
+    """
+    INSERT INTO course_lecturer (id, lecturer_id, course_offering_id,
+                                 class_completed, status, assigned_at)
+    SELECT md5('course_lecturer' || i)::uuid,
+           md5('lecturer' || (i * 7 % {lecturers} + 1))::uuid,
+           md5('offering' || ((i - 1) % {offerings} + 1))::uuid,
+           0, NULL, now()
+    FROM generate_series(1, 2 * {offerings}) AS i
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO course_student (id, student_id, course_offering_id,
+                                class_completed, registered_at)
+    SELECT md5('course_student' || s || '-' || k)::uuid,
+           md5('student' || s)::uuid,
+           md5('offering' || ((s * 20 + k * 37) % {offerings} + 1))::uuid,
+           0, now()
+    FROM generate_series(1, {students}) AS s, generate_series(1, 20) AS k
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO class_session (id, course_offering_id, lecturer_id, status,
+                               start, "end")
+    SELECT md5('class_session' || i)::uuid,
+           md5('offering' || ((i - 1) % {offerings} + 1))::uuid,
+           md5('lecturer' || ((i - 1) % {lecturers} + 1))::uuid,
+           'COMPLETED', now() - i * interval '1 hour', NULL
+    FROM generate_series(1, 10 * {offerings}) AS i
+    """,
+    """
+    INSERT INTO attendance (id, class_session_id, marked_at, student_id,
+                            status)
+    SELECT md5('attendance' || s || '-' || k)::uuid,
+           md5('class_session'
+               || ((s * 20 + k * 37) % (10 * {offerings}) + 1))::uuid,
+           now(), md5('student' || s)::uuid, 'PRESENT'
+    FROM generate_series(1, {students}) AS s, generate_series(1, 20) AS k
+    """,
+    """
+    INSERT INTO message (id, course_offering_id, lecturer_id, title, details,
+                         created_at, updated_at)
+    SELECT md5('message' || i)::uuid,
+           md5('offering' || ((i - 1) % {offerings} + 1))::uuid,
+           md5('lecturer' || ((i - 1) % {lecturers} + 1))::uuid,
+           'Title ' || i, 'Details', now() - i * interval '1 minute',
+           now() - i * interval '1 minute'
+    FROM generate_series(1, 5 * {offerings}) AS i
+    """,
+    """
+    INSERT INTO message_student (id, student_id, message_id, read,
+                                 created_at, updated_at)
+    SELECT md5('message_student' || s || '-' || k)::uuid,
+           md5('student' || s)::uuid,
+           md5('message' || ((s * 10 + k * 37) % (5 * {offerings}) + 1))::uuid,
+           true, now(), now()
+    FROM generate_series(1, {students}) AS s, generate_series(1, 10) AS k
+    ON CONFLICT DO NOTHING
+    """,
+    """
+    INSERT INTO task (id, course_offering_id, task_type, lecturer_id, title,
+                      details, status, deadline, created_at, updated_at)
+    SELECT md5('task' || i)::uuid,
+           md5('offering' || ((i - 1) % {offerings} + 1))::uuid,
+           'ASSIGNMENT', md5('lecturer' || ((i - 1) % {lecturers} + 1))::uuid,
+           'Title ' || i, 'Details', 'UPCOMING',
+           CASE WHEN i % 5 = 0 THEN NULL
+                ELSE date_trunc('second', now()) + i * interval '1 hour' END,
+           now() - i * interval '1 minute', now() - i * interval '1 minute'
+    FROM generate_series(1, 5 * {offerings}) AS i
+    """,
+    """
+    INSERT INTO task_student (id, task_id, student_id, status, grade)
+    SELECT md5('task_student' || s || '-' || k)::uuid,
+           md5('task' || ((s * 10 + k * 37) % (5 * {offerings}) + 1))::uuid,
+           md5('student' || s)::uuid, 'COMPLETED', NULL
+    FROM generate_series(1, {students}) AS s, generate_series(1, 10) AS k
+    ON CONFLICT DO NOTHING
+    """,
+]
+
+
+def seeded_id(name: str) -> UUID:
+    """Id of a seeded row, e.g. seeded_id("student1")"""
+    return UUID(md5(name.encode()).hexdigest())
+
+
+async def seed(conn: AsyncConnection, scale: int = 2):
+    """Insert the dataset at `scale` and refresh the planner statistics"""
+    counts = {
+        "courses": COURSES * scale,
+        "lecturers": LECTURERS * scale,
+        "students": STUDENTS * scale,
+        "offerings": OFFERINGS * scale,
+    }
+    for statement in SEED:
+        await conn.execute(text(statement.format(**counts)))
+    await conn.commit()
+    await conn.execute(text("ANALYZE"))
+    await conn.commit()
+
+
+async def truncate(conn: AsyncConnection):
+    """Empty every application table"""
+    tables = ", ".join(
+        f'"{table.name}"' for table in Base.metadata.sorted_tables
+        if table is not TableVersion.__table__
+    )
+    await conn.execute(text(f"TRUNCATE {tables} CASCADE"))
+    await conn.commit()
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.common.filters import (
+    Condition, FilterOp, FilterSpec, indexed_fields, parse_filter
+)
+from app.api.course.models import Task
+from app.api.course.schema import EventStatus
+from app.exceptions import InvalidFilter
+
+
+FIELDS = frozenset({"status", "title", "deadline", "created_at", "id"})
+
+
+def sql(clause) -> str:
+    return str(clause.compile(dialect=postgresql.dialect()))
+
+
+def test_no_parameters():
+    assert parse_filter() is None
+    assert parse_filter([], "") is None
+
+
+def test_parse_filter():
+    spec = parse_filter(
+        ["status:in:UPCOMING,ONGOING", "deadline:isnull:true", "title:eq:a:b"],
+        "-created_at, id"
+    )
+    assert spec.conditions == (
+        Condition(field="status", op=FilterOp.IN,
+                  value=("UPCOMING", "ONGOING")),
+        Condition(field="deadline", op=FilterOp.IS_NULL, value="true"),
+        # only the first two colons split, values may hold more
+        Condition(field="title", op=FilterOp.EQ, value="a:b"),
+    )
+    assert spec.order_by == ("-created_at", "id")
+
+
+@pytest.mark.parametrize("item", ["status", "status:eq", "status:like:x"])
+def test_malformed_filter(item):
+    with pytest.raises(InvalidFilter):
+        parse_filter([item])
+
+
+def test_where_is_sorted_and_bound():
+    spec = parse_filter(["title:eq:x", "created_at:gte:2025-01-01T00:00:00Z"])
+    clauses = spec.where(Task, FIELDS)
+    assert [sql(clause) for clause in clauses] == [
+        "task.created_at >= %(created_at_1)s",
+        "task.title = %(title_1)s",
+    ]
+    assert clauses[0].right.value == datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def test_values_are_coerced():
+    spec = parse_filter(["status:in:UPCOMING,ONGOING"])
+    [clause] = spec.where(Task, FIELDS)
+    assert clause.right.value == [EventStatus.UPCOMING, EventStatus.ONGOING]
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("true", "task.deadline IS NULL"),
+    ("false", "task.deadline IS NOT NULL"),
+])
+def test_isnull(value, expected):
+    [clause] = parse_filter([f"deadline:isnull:{value}"]).where(Task, FIELDS)
+    assert sql(clause) == expected
+
+
+def test_prefix_escapes_wildcards():
+    [clause] = parse_filter(["title:prefix:50%_"]).where(Task, FIELDS)
+    compiled = clause.compile(dialect=postgresql.dialect())
+    assert str(compiled) == "task.title LIKE %(title_1)s || '%%' ESCAPE '/'"
+    assert compiled.params == {"title_1": "50/%/_"}
+
+
+@pytest.mark.parametrize("item", [
+    "details:eq:x",             # not a filterable field
+    "created_at:gt:yesterday",  # not a timestamp
+    "status:eq:DONE",           # not an EventStatus
+    "deadline:isnull:maybe",
+    "created_at:prefix:2025",   # not a text field
+])
+def test_invalid_condition(item):
+    with pytest.raises(InvalidFilter):
+        parse_filter([item]).where(Task, FIELDS)
+
+
+def test_ordering():
+    spec = FilterSpec(order_by=("-created_at", "id"))
+    assert spec.ordering(Task, FIELDS) == [
+        (Task.created_at, True), (Task.id, False)
+    ]
+
+
+@pytest.mark.parametrize("name", ["deadline", "details"])
+def test_invalid_ordering(name):
+    # deadline is nullable, details is not a field
+    with pytest.raises(InvalidFilter):
+        FilterSpec(order_by=(name,)).ordering(Task, FIELDS)
+
+
+def test_indexed_fields():
+    fields = indexed_fields(Task)
+    assert {"id", "course_offering_id", "lecturer_id"} <= fields
+    assert "details" not in fields
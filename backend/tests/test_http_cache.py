@@ -0,0 +1,93 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+
+from app.api.common.etag import matching_tag
+from app.core import compression
+from app.core.compression import CompressionMiddleware, choose_encoding
+from app.core.config import settings
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("GZIP", "gzip"),
+    ("gzip;q=0", None),
+    ("br;q=0.5, gzip", "gzip"),
+    ("gzip;q=0.5, br", "br"),
+    ("*", "br"),
+    ("*;q=0.1, gzip;q=0", "br"),
+    ("gzip;q=oops", None),
+])
+def test_choose_encoding(monkeypatch, accept_encoding, expected):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert choose_encoding(accept_encoding) == expected
+
+
+def test_choose_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert choose_encoding("br, gzip;q=0.5") == "gzip"
+    assert choose_encoding("br") is None
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    ('"abc"', '"abc"'),
+    ('W/"abc"', 'W/"abc"'),
+    ('"abc-gzip"', '"abc-gzip"'),
+    ('"abc-br"', '"abc-br"'),
+    ('"old", "abc-gzip"', '"abc-gzip"'),
+    ("*", '"abc"'),
+    ('"abcd"', None),
+    ('"abc-deflate"', None),
+    ("", None),
+])
+def test_matching_tag(if_none_match, expected):
+    assert matching_tag(if_none_match, '"abc"') == expected
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/large")
+    def large():
+        return Response(
+            b"x" * settings.COMPRESSION_MIN_SIZE, headers={"ETag": '"abc"'},
+            media_type="application/json"
+        )
+
+    @app.get("/small")
+    def small():
+        return Response(
+            b"x", headers={"ETag": '"abc"'}, media_type="application/json"
+        )
+
+    return TestClient(app)
+
+
+def test_compressed_response_etag_suffix(client):
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"abc-gzip"'
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.content == b"x" * settings.COMPRESSION_MIN_SIZE
+    assert matching_tag(response.headers["etag"], '"abc"') is not None
+
+
+def test_identity_response_keeps_etag(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_small_response_untouched(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"abc"'
+    assert "vary" not in response.headers
+
@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.api.common.loader import BatchLoader
+
+pytestmark = pytest.mark.anyio
+
+
+class Fetcher:
+    """Stands in for get_many_by_ids, recording every batch"""
+    def __init__(self, existing=(), error: Exception | None = None):
+        self.rows = {id: SimpleNamespace(id=id) for id in existing}
+        self.error = error
+        self.batches: list[list] = []
+
+    async def __call__(self, ids):
+        self.batches.append(list(ids))
+        if self.error is not None:
+            raise self.error
+        return [self.rows[id] for id in ids if id in self.rows]
+
+
+async def test_pending_lookups_share_a_query():
+    a, b, missing = uuid4(), uuid4(), uuid4()
+    fetch = Fetcher([a, b])
+    loader = BatchLoader(fetch)
+
+    found = await asyncio.gather(
+        loader.load(a), loader.load(b), loader.load(missing), loader.load(a)
+    )
+
+    assert [obj and obj.id for obj in found] == [a, b, None, a]
+    assert fetch.batches == [[a, b, missing]]
+
+
+async def test_load_many_keeps_order():
+    ids = [uuid4() for _ in range(3)]
+    fetch = Fetcher(ids[:2])
+    loader = BatchLoader(fetch)
+
+    found = await loader.load_many(reversed(ids))
+
+    assert [obj and obj.id for obj in found] == [None, ids[1], ids[0]]
+    assert len(fetch.batches) == 1
+
+
+async def test_sequential_lookups_query_each():
+    a, b = uuid4(), uuid4()
+    fetch = Fetcher([a, b])
+    loader = BatchLoader(fetch)
+
+    await loader.load(a)
+    await loader.load(b)
+
+    assert fetch.batches == [[a], [b]]
+
+
+async def test_answers_are_cached_misses_included():
+    a, missing = uuid4(), uuid4()
+    fetch = Fetcher([a])
+    loader = BatchLoader(fetch)
+
+    await loader.load_many([a, missing])
+    assert (await loader.load(a)).id == a
+    assert await loader.load(missing) is None
+    assert len(fetch.batches) == 1
+
+
+async def test_prime_and_clear():
+    a = uuid4()
+    fetch = Fetcher([a])
+    loader = BatchLoader(fetch)
+    primed = SimpleNamespace(id=a)
+
+    loader.prime(a, primed)
+    assert await loader.load(a) is primed
+    assert fetch.batches == []
+
+    loader.clear(a)
+    assert await loader.load(a) is fetch.rows[a]
+    loader.clear()
+    await loader.load(a)
+    assert fetch.batches == [[a], [a]]
+
+
+async def test_failed_batch_is_not_cached():
+    a = uuid4()
+    fetch = Fetcher([a], error=RuntimeError("connection lost"))
+    loader = BatchLoader(fetch)
+
+    with pytest.raises(RuntimeError):
+        await loader.load(a)
+
+    fetch.error = None
+    assert (await loader.load(a)).id == a
+    assert fetch.batches == [[a], [a]]
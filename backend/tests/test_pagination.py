@@ -0,0 +1,78 @@
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from enum import StrEnum
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import Column, Date, DateTime, Enum, Integer, Numeric, String, Time, Uuid
+
+from app.api.common.pagination import (
+    PAGE_SIZE, MAX_PAGE_SIZE, clamp_limit, decode_cursor, encode_cursor,
+    to_cursor_page
+)
+from app.api.institution.models import Session
+from app.exceptions import InvalidCursor
+
+
+class Colour(StrEnum):
+    RED = "RED"
+    BLUE = "BLUE"
+
+
+@pytest.mark.parametrize("value, column_type", [
+    (date(2025, 1, 1), Date()),
+    (datetime(2025, 1, 1, 8, 30, tzinfo=timezone.utc), DateTime(timezone=True)),
+    (datetime(2025, 1, 1, 8, 30), DateTime()),
+    (time(13, 45, 10), Time()),
+    (Decimal("12.50"), Numeric()),
+    (uuid4(), Uuid()),
+    (42, Integer()),
+    ("Smith", String()),
+    (Colour.BLUE, Enum(Colour)),
+])
+def test_cursor_round_trip(value, column_type):
+    id_ = uuid4()
+    columns = [Column("key", column_type), Column("id", Uuid())]
+    assert decode_cursor(encode_cursor([value, id_]), columns) == [value, id_]
+
+
+def test_cursor_round_trip_on_a_date_ordering():
+    start, id_ = date(2025, 1, 1), uuid4()
+    cursor = encode_cursor([start, id_])
+    assert decode_cursor(cursor, [Session.start_date, Session.id]) == [start, id_]
+
+
+def test_cursor_keeps_null():
+    columns = [Column("end_date", Date()), Column("id", Uuid())]
+    id_ = uuid4()
+    assert decode_cursor(encode_cursor([None, id_]), columns) == [None, id_]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!",
+    encode_cursor([1]),
+    encode_cursor(["not a date", str(uuid4())]),
+    encode_cursor({"a": 1}),
+])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, [Session.start_date, Session.id])
+
+
+def test_clamp_limit():
+    assert clamp_limit(None) == PAGE_SIZE
+    assert clamp_limit(0) == PAGE_SIZE
+    assert clamp_limit(10) == 10
+    assert clamp_limit(MAX_PAGE_SIZE + 1) == MAX_PAGE_SIZE
+
+
+def test_to_cursor_page_trims_the_look_ahead_row():
+    class Item:
+        def __init__(self, id_):
+            self.id = id_
+
+    items = [Item(i) for i in range(3)]
+    page = to_cursor_page(items, ["id"], 2)
+    assert page.items == items[:2]
+    assert decode_cursor(page.next_cursor, [Column("id", Integer())]) == [1]
+    assert to_cursor_page(items, ["id"], 3).next_cursor is None
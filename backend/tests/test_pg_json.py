@@ -0,0 +1,81 @@
+"""
+The JSON bodies Postgres builds for the fast paths must equal what the
+response models produce from the same query. Needs the test database, see
+conftest.
+"""
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.common.pg_json import fetch_json
+from app.api.common.validation import list_adapter, validate_rows
+from app.api.course.models import (
+    CourseLecturer, CourseOffering, CourseStudent
+)
+from app.api.course.repository import (
+    CourseLecturerRepo, CourseOfferingRepo, CourseStudentRepo
+)
+from app.api.course.schema import (
+    CourseOfferingOutLecturer, CourseOfferingOutMain, CourseOfferingOutStudent
+)
+
+from .seed import seeded_id
+
+pytestmark = pytest.mark.anyio
+
+
+def fast_paths():
+    """(name, query, schema) for every query served through fetch_json"""
+    return [
+        ("courses", CourseOfferingRepo(CourseOffering)._get_courses(
+            seeded_id("session1"), department_id=seeded_id("department1")
+        ), CourseOfferingOutMain),
+        ("student courses", CourseStudentRepo(
+            CourseStudent
+        )._get_course_students_with_details(
+            seeded_id("student1")
+        ), CourseOfferingOutStudent),
+        ("lecturer courses", CourseLecturerRepo(
+            CourseLecturer
+        )._get_course_lecturers_with_details(
+            seeded_id("lecturer1")
+        ), CourseOfferingOutLecturer),
+    ]
+
+
+FAST_PATHS = fast_paths()
+
+
+@pytest.mark.parametrize(
+    "query, schema", [(query, schema) for _, query, schema in FAST_PATHS],
+    ids=[name for name, _, _ in FAST_PATHS]
+)
+async def test_json_matches_response_model(seeded, query, schema):
+    async with AsyncSession(seeded) as con:
+        raw = await fetch_json(con, query)
+        rows = (await con.execute(query)).mappings().all()
+
+    expected = list_adapter(schema).dump_python(
+        validate_rows(schema, rows), mode="json"
+    )
+    assert expected
+    assert json.loads(raw) == expected
+
+
+async def test_json_page_matches_cursor_page(seeded):
+    repo = CourseOfferingRepo(CourseOffering)
+    args = (seeded_id("session1"), None, seeded_id("department1"))
+    cursor, pages = None, 0
+    async with AsyncSession(seeded) as con:
+        while True:
+            page = await repo.get_courses(con, *args, cursor=cursor, limit=1)
+            raw = await repo.get_courses_json(
+                con, *args, cursor=cursor, limit=1
+            )
+            assert json.loads(raw) == page.model_dump(mode="json")
+            pages += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+    assert pages > 1
@@ -0,0 +1,70 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.api.common.query_budget import query_budget
+from app.api.main import app
+
+from .seed import seeded_id
+
+
+@pytest.fixture
+def sqlite():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_counts_only_the_target(sqlite):
+    other = create_engine("sqlite://")
+    with sqlite.connect() as conn, other.connect() as other_conn:
+        with query_budget(sqlite, 1) as counter:
+            conn.execute(text("SELECT 1"))
+            other_conn.execute(text("SELECT 1"))
+            other_conn.execute(text("SELECT 2"))
+        assert counter.count == 1
+    other.dispose()
+
+
+def test_listener_removed_on_exit(sqlite):
+    with sqlite.connect() as conn:
+        with query_budget(conn, 1) as counter:
+            conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    assert counter.count == 1
+
+
+def test_over_budget(sqlite):
+    with sqlite.connect() as conn:
+        with pytest.raises(AssertionError, match="2 queries, budget is 1"):
+            with query_budget(sqlite, 1):
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+
+
+def test_repeated_statement(sqlite):
+    with sqlite.connect() as conn:
+        with pytest.raises(AssertionError, match="3x SELECT ?"):
+            with query_budget(sqlite, 10):
+                for i in range(3):
+                    conn.execute(text("SELECT :i"), {"i": i})
+        with query_budget(sqlite, 10, allow_repeated=True):
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("path, params, max_queries", [
+    # table versions, faculties, their departments
+    ("/institution/faculties", {}, 3),
+    # table versions, departments
+    ("/institution/departments",
+     {"faculty_id": str(seeded_id("faculty1"))}, 2),
+])
+async def test_list_endpoint_query_ceiling(seeded, path, params, max_queries):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        with query_budget(seeded, max_queries):
+            response = await client.get(path, params=params)
+    assert response.status_code == 200
+    assert response.json()
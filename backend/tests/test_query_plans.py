@@ -0,0 +1,128 @@
+"""
+The queries behind every repository read path must reach large tables
+through an index. Needs the test database, see conftest.
+"""
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.common.filters import parse_filter
+from app.api.common.plan_check import (
+    QueryRecorder, assert_no_seq_scans, find_seq_scans
+)
+from app.api.course.models import (
+    Attendance, ClassSession, CourseLecturer, CourseOffering,
+    CourseStudent, Message, Task
+)
+from app.api.course.repository import (
+    AttendanceRepo, ClassSessionRepo, CourseLecturerRepo, CourseOfferingRepo,
+    CourseStudentRepo, MessageRepo, TaskRepo
+)
+from app.api.institution.models import Department, Faculty
+from app.api.institution.repository import DepartmentRepo, FacultyRepo
+from app.api.user.models import LecturerProfile, StudentProfile, User
+from app.api.user.repository import (
+    LecturerProfileRepo, StudentProfileRepo, UserRepo
+)
+
+from .seed import seeded_id
+
+pytestmark = pytest.mark.anyio
+
+
+def read_paths():
+    """(name, call) for every repository read the API serves"""
+    school = seeded_id("school1")
+    faculty = seeded_id("faculty1")
+    department = seeded_id("department1")
+    session = seeded_id("session1")
+    semester = seeded_id("semester1")
+    offering = seeded_id("offering1")
+    class_session = seeded_id("class_session1")
+    lecturer = seeded_id("lecturer1")
+    student = seeded_id("student1")
+
+    course_offerings = CourseOfferingRepo(CourseOffering)
+    course_students = CourseStudentRepo(CourseStudent)
+    course_lecturers = CourseLecturerRepo(CourseLecturer)
+    messages = MessageRepo(Message)
+    tasks = TaskRepo(Task)
+    class_sessions = ClassSessionRepo(ClassSession)
+    attendance = AttendanceRepo(Attendance)
+    users = UserRepo(User)
+    lecturers = LecturerProfileRepo(LecturerProfile)
+    students = StudentProfileRepo(StudentProfile)
+    departments = DepartmentRepo(Department)
+    faculties = FacultyRepo(Faculty)
+
+    return [
+        ("session course offerings", lambda con: (
+            course_offerings.get_session_course_offerings(
+                con, session_id=session, semester_id=semester
+            )
+        )),
+        ("courses", lambda con: course_offerings.get_courses(
+            con, session_id=session, department_id=department
+        )),
+        ("student courses", lambda con: (
+            course_students.get_course_students_with_details(con, student)
+        )),
+        ("lecturer courses", lambda con: (
+            course_lecturers.get_course_lecturers_with_details(con, lecturer)
+        )),
+        ("lecturer assigned", lambda con: (
+            course_lecturers.check_if_lecturer_is_assigned_to_course(
+                con, lecturer, offering
+            )
+        )),
+        ("lecturer messages", lambda con: (
+            messages.get_teacher_messages(con, lecturer)
+        )),
+        ("student messages", lambda con: messages.get_student_messages(
+            con, student, course_offering_id=offering
+        )),
+        ("lecturer tasks", lambda con: tasks.get_lecturer_tasks(
+            con, lecturer, course_offering_id=offering
+        )),
+        ("student tasks", lambda con: tasks.get_student_tasks(con, student)),
+        ("class sessions", lambda con: class_sessions.get_all(
+            con, filter={ClassSession.course_offering_id: offering}
+        )),
+        ("attendance", lambda con: attendance.get_page(
+            con, filter={Attendance.class_session_id: class_session}
+        )),
+        ("users", lambda con: users.get_users(con)),
+        ("users by last name prefix", lambda con: users.get_users(
+            con, spec=parse_filter(["last_name:prefix:Last10"])
+        )),
+        ("offering lecturers", lambda con: (
+            lecturers.get_lecturers_with_details_page(
+                con, course_offering_id=offering
+            )
+        )),
+        ("offering students", lambda con: (
+            students.get_students_with_details_page(
+                con, course_offering_id=offering
+            )
+        )),
+        ("departments", lambda con: departments.get_departments(
+            con, faculty_id=faculty
+        )),
+        ("faculties", lambda con: faculties.get_faculties(con, school)),
+    ]
+
+
+READ_PATHS = read_paths()
+
+
+@pytest.mark.parametrize(
+    "call", [call for _, call in READ_PATHS],
+    ids=[name for name, _ in READ_PATHS]
+)
+async def test_no_seq_scans_on_large_tables(seeded, call):
+    async with seeded.connect() as conn:
+        con = AsyncSession(bind=conn)
+        with QueryRecorder(conn) as recorder:
+            await call(con)
+        await con.close()
+        assert recorder.statements
+        assert_no_seq_scans(await find_seq_scans(conn, recorder.statements))
@@ -0,0 +1,44 @@
+from time import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.db_con import (
+    PRIMARY_PIN_COOKIE, _pin_signature, _read_pin, _sign_pin
+)
+
+
+def scope(cookie: str) -> dict:
+    return {"headers": [(b"cookie", cookie.encode())]}
+
+
+def test_signed_pin():
+    until = round(time() + 2, 3)
+    cookie = f"{PRIMARY_PIN_COOKIE}={_sign_pin(until)}"
+    assert _read_pin(scope(cookie)) == pytest.approx(until)
+
+
+def test_far_future_pin_is_clamped():
+    cookie = f"{PRIMARY_PIN_COOKIE}={_sign_pin(time() + 10 ** 9)}"
+    assert _read_pin(scope(cookie)) <= time() + settings.REPLICA_PIN_SECONDS
+
+
+@pytest.mark.parametrize("value", [
+    "9999999999.000",                    # unsigned
+    "9999999999.000.0123456789abcdef",   # bad signature
+    "inf",
+    "",
+])
+def test_forged_pin_is_ignored(value):
+    assert _read_pin(scope(f"{PRIMARY_PIN_COOKIE}={value}")) == 0.0
+
+
+@pytest.mark.parametrize("until", ["nan", "inf"])
+def test_non_finite_pin_is_ignored(until):
+    cookie = f"{PRIMARY_PIN_COOKIE}={until}.{_pin_signature(until)}"
+    assert _read_pin(scope(cookie)) == 0.0
+
+
+def test_no_cookie():
+    assert _read_pin({"headers": []}) == 0.0
+    assert _read_pin(scope("other=1")) == 0.0
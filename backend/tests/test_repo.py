@@ -0,0 +1,63 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.course.models import TaskStudent
+from app.api.course.repository import TaskStudentRepo
+from app.api.course.schema import TaskStudentCreate, TaskStudentStatus
+
+from .seed import seeded_id
+
+pytestmark = pytest.mark.anyio
+
+
+class Recorder:
+    """Stands in for the session, recording the statements upsert_many runs"""
+    def __init__(self):
+        self.info = {}
+        self.statements = []
+
+    async def scalars(self, statement, execution_options=None):
+        self.statements.append(statement)
+        return self
+
+    def all(self):
+        return []
+
+
+async def test_upsert_collapses_repeated_keys():
+    task_id, student_id, other = uuid4(), uuid4(), uuid4()
+    con = Recorder()
+
+    await TaskStudentRepo(TaskStudent).upsert_many(con, [
+        TaskStudentCreate(task_id=task_id, student_id=student_id,
+                          status=TaskStudentStatus.PENDING),
+        TaskStudentCreate(task_id=task_id, student_id=other,
+                          status=TaskStudentStatus.PENDING),
+        TaskStudentCreate(task_id=task_id, student_id=student_id,
+                          status=TaskStudentStatus.COMPLETED),
+    ])
+
+    [statement] = con.statements
+    params = statement.compile(dialect=postgresql.dialect()).params
+    rows = sorted(
+        (params[f"student_id_m{i}"], params[f"status_m{i}"]) for i in range(2)
+    )
+    assert rows == sorted([
+        (student_id, TaskStudentStatus.COMPLETED),
+        (other, TaskStudentStatus.PENDING),
+    ])
+    assert "student_id_m2" not in params
+
+
+async def test_upsert_repeated_key_on_postgres(seeded):
+    key = {"task_id": seeded_id("task1"), "student_id": seeded_id("student1")}
+    async with AsyncSession(seeded) as con:
+        [row] = await TaskStudentRepo(TaskStudent).upsert_many(con, [
+            TaskStudentCreate(**key, status=TaskStudentStatus.PENDING),
+            TaskStudentCreate(**key, status=TaskStudentStatus.COMPLETED),
+        ])
+        assert row.status == TaskStudentStatus.COMPLETED
+        await con.rollback()
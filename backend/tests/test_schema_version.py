@@ -0,0 +1,52 @@
+import pytest
+
+from app.core import db_con
+from app.core.config import settings
+from app.core.db_con import SchemaOutOfDate, check_schema_version
+
+pytestmark = pytest.mark.anyio
+
+
+class Stamped:
+    """Stands in for the engine, with `revisions` stamped in the database"""
+    def __init__(self, *revisions):
+        self.revisions = frozenset(revisions)
+
+    def connect(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def run_sync(self, fn):
+        return self.revisions
+
+
+@pytest.fixture
+def strict(monkeypatch):
+    monkeypatch.setattr(settings, "DB_SCHEMA_STRICT", True)
+
+
+def stamp(monkeypatch, *revisions):
+    monkeypatch.setattr(db_con, "engine", Stamped(*revisions))
+
+
+async def test_at_head(monkeypatch, strict):
+    stamp(monkeypatch, *db_con.schema_heads())
+    await check_schema_version()
+
+
+@pytest.mark.parametrize("revisions", [(), ("0001_initial",)])
+async def test_behind_refuses_to_start(monkeypatch, strict, revisions):
+    stamp(monkeypatch, *revisions)
+    with pytest.raises(SchemaOutOfDate):
+        await check_schema_version()
+
+
+async def test_ahead_only_warns(monkeypatch, strict, caplog):
+    stamp(monkeypatch, "0099_from_a_newer_build")
+    await check_schema_version()
+    assert "ahead of this build" in caplog.text
@@ -0,0 +1,54 @@
+import pytest
+from pydantic import BaseModel
+
+from app.api.common.streaming import ndjson_response
+
+pytestmark = pytest.mark.anyio
+
+
+class Item(BaseModel):
+    n: int
+
+
+class Source:
+    """Stands in for a streaming repository read on its own session"""
+    def __init__(self):
+        self.closed = False
+
+    async def rows(self):
+        try:
+            for n in range(10):
+                yield {"n": n}
+        finally:
+            self.closed = True
+
+
+async def test_items_closed_on_disconnect():
+    source = Source()
+    response = ndjson_response(source.rows(), Item)
+    sent = []
+
+    async def send(message):
+        if len(sent) == 2:
+            raise OSError("client went away")
+        sent.append(message)
+
+    with pytest.raises(OSError):
+        await response.stream_response(send)
+
+    assert sent[1]["body"] == b'{"n":0}\n'
+    assert source.closed
+
+
+async def test_items_closed_when_done():
+    source = Source()
+    response = ndjson_response(source.rows(), Item)
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await response.stream_response(send)
+
+    assert len(sent) == 12
+    assert source.closed